@@ -0,0 +1,334 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Rendering a lot of reports at once, like the whole archive over again after the templates changed. One at a time
+# that takes hours, and threads don't help (rendering is all Python, so they just take turns), so this spreads them
+# across processes instead. Each report gets to its worker as a snapshot: the capture packed into one zlib'd blob of
+# JSON with every string in it stored once, which pickles as a single bytes object instead of thousands of little
+# ones. Workers render, minify and write the pages, and what happened to each comes back in the order they went in.
+# In a packaged Cura the only "Python" there is to start another process with is Cura itself, so this is for scripts
+# that have Cura's (or at least Uranium's) source on their path, not for the menu.
+
+import json
+import os
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
+
+from UM.Logger import Logger
+
+from .HTMLSettingsExportReborn import (CategorySetting, CompareProfiles,
+                                       ExportContext, ExportMode,
+                                       HTMLSettingsExportReborn, PageFormat,
+                                       ReportDetails, SettingProfile,
+                                       SourceText, get_source_text)
+
+# Goes up when the layout changes, so an old snapshot gets a proper error instead of a weird page
+SNAPSHOT_VERSION: int = 1
+SNAPSHOT_COMPRESSION_LEVEL: int = 6
+# Chunks of snapshots in the pool at once for each worker, counting the one it's rendering. Enough that nobody sits around
+# waiting for the next one, few enough that a batch of the whole archive never has more than a handful of snapshots in memory.
+CHUNKS_PER_WORKER: int = 4
+
+
+def _raw_value_default(other: Any) -> str:
+    # Same as fingerprint_json() does, so pages made from snapshots keep their settings fingerprints
+    return type(other).__name__
+
+class _SnapshotWriter:
+    """Packs a capture into lists of numbers. Strings and source texts go in tables, each one once."""
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self._string_positions: dict[str, int] = {}
+        self.sources: list[list[int]] = []
+        self._source_positions: dict[SourceText, int] = {}
+
+    def string(self, text: str) -> int:
+        position = self._string_positions.get(text)
+        if position is None:
+            position = self._string_positions[text] = len(self.strings)
+            self.strings.append(text)
+        return position
+
+    def string_list(self, texts: Iterable[str]) -> list[int]:
+        return [self.string(text) for text in texts]
+
+    def source(self, source: Optional[SourceText]) -> Optional[int]:
+        if source is None:
+            return None
+        position = self._source_positions.get(source)
+        if position is None:
+            position = self._source_positions[source] = len(self.sources)
+            self.sources.append(self.string_list((source.catalog_name, source.context, source.text, source.suffix)))
+        return position
+
+    def setting(self, setting: Optional[CategorySetting]) -> Optional[list[Any]]:
+        if setting is None:
+            return None
+        return [self.string(setting.key), self.string(setting.label), self.string(setting.setting_type), setting.child_level, setting.skip, setting.extruders,
+                self.string_list(setting.value), setting.raw_value, self.string_list(setting.css_class), self.string_list(setting.error_class),
+                self.source(setting.label_source), [self.source(source) for source in setting.value_source] if setting.value_source is not None else None,
+                [[self.string(key), self.setting(child)] for key, child in setting.children.items()]]
+
+    def profile(self, profile: SettingProfile) -> list[Any]:
+        return [self.string(profile.profile_name), self.string(profile.preset_name), self.string(profile.printer_name), profile.extruder_count, profile.changed_only,
+                [[self.string(category), [self.setting(setting) for setting in category_settings]] for category, category_settings in profile.settings.items()],
+                [[self.string(key), self.string(label)] for key, label in profile.settings_labels.items()],
+                [[self.string(key), self.source(source)] for key, source in profile.settings_labels_source.items()],
+                self.string_list(profile.global_changed_settings), [self.string_list(keys) for keys in profile.extruder_changed_settings],
+                self.string_list(profile.visible_settings)]
+
+class _SnapshotReader:
+    """Unpacks what _SnapshotWriter packed"""
+
+    def __init__(self, strings: list[str], sources: list[list[int]]):
+        self.strings = strings
+        # Through get_source_text() so they're shared with everything else, same as a capture's are
+        self.sources = [get_source_text(*(strings[position] for position in source)) for source in sources]
+
+    def string_list(self, positions: list[int]) -> list[str]:
+        strings = self.strings
+        return [strings[position] for position in positions]
+
+    def source(self, position: Optional[int]) -> Optional[SourceText]:
+        return self.sources[position] if position is not None else None
+
+    def setting(self, packed: Optional[list[Any]]) -> Optional[CategorySetting]:
+        if packed is None:
+            return None
+        (key, label, setting_type, child_level, skip, extruders, value, raw_value, css_class, error_class,
+         label_source, value_source, children) = packed
+        setting = CategorySetting(key = self.strings[key], label = self.strings[label], setting_type = self.strings[setting_type],
+                                  child_level = child_level, skip = skip, extruder_count = extruders)
+        setting.value = self.string_list(value)
+        setting.raw_value = raw_value
+        setting.css_class = self.string_list(css_class)
+        setting.error_class = self.string_list(error_class)
+        setting.label_source = self.source(label_source)
+        if value_source is not None:
+            setting.value_source = [self.source(source) for source in value_source]
+        setting.children = {self.strings[child_key]: self.setting(child) for child_key, child in children}
+        return setting
+
+    def profile(self, packed: list[Any]) -> SettingProfile:
+        (profile_name, preset_name, printer_name, extruder_count, changed_only, categories, labels, label_sources,
+         global_changed_settings, extruder_changed_settings, visible_settings) = packed
+        profile = SettingProfile(profile_name = self.strings[profile_name], preset_name = self.strings[preset_name], printer_name = self.strings[printer_name],
+                                 extruder_count = extruder_count, changed_only = changed_only,
+                                 global_changed_settings = self.string_list(global_changed_settings),
+                                 extruder_changed_settings = [self.string_list(keys) for keys in extruder_changed_settings],
+                                 visible_settings = self.string_list(visible_settings))
+        # Exactly the categories (and the order) it was captured with, not the default ones
+        profile.settings = {self.strings[category]: [self.setting(setting) for setting in category_settings] for category, category_settings in categories}
+        profile.settings_labels = {self.strings[key]: self.strings[label] for key, label in labels}
+        profile.settings_labels_source = {self.strings[key]: self.source(source) for key, source in label_sources}
+        return profile
+
+def encode_snapshot(export_context: ExportContext) -> bytes:
+    """Packs everything a page gets made from into bytes that can be sent to another process (or kept for later).
+    Labels and values keep what they were before they were translated, so the page can still be made in other languages.
+    Raw values that aren't JSON (like a SettingFunction) come back as the name of their type, same as fingerprints see them."""
+    writer = _SnapshotWriter()
+    if export_context.export_mode == ExportMode.COMPARE:
+        profile_compare = export_context.profile_compare
+        profiles = [writer.profile(profile_compare.profile_a), writer.profile(profile_compare.profile_b)]
+        root_causes = profile_compare.root_causes
+        packed_root_causes = None if root_causes is None else [
+            [[writer.string(root), writer.string_list(effects)] for root, effects in root_causes.roots.items()],
+            [[writer.string(effect), writer.string_list(roots)] for effect, roots in root_causes.causes.items()],
+            [[writer.string(key), writer.string(label)] for key, label in root_causes.labels.items()],
+        ]
+    else:
+        profiles = [writer.profile(export_context.setting_profile)]
+        packed_root_causes = None
+    report_details = export_context.report_details
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "context": [export_context.export_mode.name, export_context.page_format.name, export_context.minify, export_context.plugin_version,
+                    export_context.collapse_extruders, export_context.compact_markup, export_context.language],
+        # The thumbnail's the biggest thing in here but there's only one of it, so it doesn't go in the table
+        "details": None if report_details is None else [getattr(report_details, details_field.name) for details_field in fields(ReportDetails)],
+        "profiles": profiles,
+        "root_causes": packed_root_causes,
+        "strings": writer.strings,
+        "sources": writer.sources,
+    }
+    return zlib.compress(json.dumps(snapshot, ensure_ascii = False, separators = (",", ":"), default = _raw_value_default).encode("utf-8"), SNAPSHOT_COMPRESSION_LEVEL)
+
+def decode_snapshot(snapshot: bytes) -> ExportContext:
+    """Turns encode_snapshot()'s bytes back into an ExportContext (with a new timer). Raises ValueError if they aren't a snapshot it knows."""
+    try:
+        unpacked = json.loads(zlib.decompress(snapshot).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Not a settings snapshot: {e}") from None
+    if not isinstance(unpacked, dict) or unpacked.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Settings snapshot is version {unpacked.get('version') if isinstance(unpacked, dict) else None}, this can only read version {SNAPSHOT_VERSION}")
+    reader = _SnapshotReader(unpacked["strings"], unpacked["sources"])
+    export_mode, page_format, minify, plugin_version, collapse_extruders, compact_markup, language = unpacked["context"]
+    report_details = None
+    if unpacked["details"] is not None:
+        # Everything that's a list in JSON is a tuple in ReportDetails
+        report_details = ReportDetails(*(tuple(value) if isinstance(value, list) else value for value in unpacked["details"]))
+    profiles = [reader.profile(profile) for profile in unpacked["profiles"]]
+    profile_compare = None
+    if ExportMode[export_mode] == ExportMode.COMPARE:
+        profile_compare = CompareProfiles(*profiles)
+        if unpacked["root_causes"] is not None:
+            from .SettingDependencies import RootCauses
+            roots, causes, labels = unpacked["root_causes"]
+            profile_compare.root_causes = RootCauses(roots = {reader.strings[root]: tuple(reader.string_list(effects)) for root, effects in roots},
+                                                     causes = {reader.strings[effect]: tuple(reader.string_list(root_keys)) for effect, root_keys in causes},
+                                                     labels = {reader.strings[key]: reader.strings[label] for key, label in labels})
+    return ExportContext(export_mode = ExportMode[export_mode], page_format = PageFormat[page_format], minify = minify, plugin_version = plugin_version,
+                         setting_profile = profiles[-1], profile_compare = profile_compare, report_details = report_details,
+                         collapse_extruders = collapse_extruders, compact_markup = compact_markup, language = language)
+
+def archive_snapshots(settings_archive, job_ids: Iterable[int], plugin_version: str, page_format: PageFormat = PageFormat.STATIC, minify: bool = True,
+                      collapse_extruders: bool = False, compact_markup: bool = False) -> Iterator[bytes]:
+    """A report snapshot for each of a SettingsArchive's jobs, in order, made as they're asked for. render_batch(zip(archive_snapshots(...), output_filenames))
+    only asks for a few per worker more than have been rendered, so the whole archive is never in memory at once.
+    They get the same details at the top that the report server gives archived jobs."""
+    for job_id in job_ids:
+        archived_job = settings_archive.get_job(job_id)
+        report_details = HTMLSettingsExportReborn._make_served_report_details(archived_job.job_name, archived_job.captured_at.replace("T", " "), archived_job.extruder_count)
+        yield encode_snapshot(ExportContext(export_mode = ExportMode.REPORT, page_format = page_format, minify = minify, plugin_version = plugin_version,
+                                            setting_profile = settings_archive.load_profile(job_id), report_details = report_details,
+                                            collapse_extruders = collapse_extruders, compact_markup = compact_markup))
+
+
+@dataclass(frozen = True)
+class BatchReport:
+    """How one snapshot went"""
+    output_filename: str
+    size: int = 0  # Bytes written
+    seconds: float = 0.0  # Unpacking, rendering, minifying and writing it, in its worker
+    error: str = ""  # Why it didn't get written, if it didn't
+
+@dataclass(frozen = True)
+class BatchResult:
+    # One for each snapshot, in the same order
+    reports: list[BatchReport] = field(default_factory = list)
+    seconds: float = 0.0  # From starting the workers to the last one finishing
+    workers: int = 0
+
+    @property
+    def failed(self) -> list[BatchReport]:
+        return [report for report in self.reports if report.error]
+
+    @property
+    def reports_per_second(self) -> float:
+        """Only counting the ones that actually got written"""
+        return (len(self.reports) - len(self.failed)) / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        written = len(self.reports) - len(self.failed)
+        summary = f"Batch render: {written} reports in {self.seconds:.2f} s on {self.workers} processes ({self.reports_per_second:.1f} reports/s)"
+        if self.failed:
+            summary += f", {len(self.failed)} failed"
+        return summary
+
+
+# The render-only extension in each worker process. It (and its fragment cache) stays around for the next snapshot.
+_page_renderer: Optional[HTMLSettingsExportReborn] = None
+
+def _render_snapshot(snapshot: bytes, output_filename: str) -> tuple[int, float, str]:
+    """Makes and writes one report, in a worker. Returns (bytes written, seconds, error) so there's hardly anything to send back."""
+    global _page_renderer
+    start = time.perf_counter()
+    try:
+        if _page_renderer is None:
+            _page_renderer = HTMLSettingsExportReborn._make_page_renderer()
+        output_page = _page_renderer._assemble_html(decode_snapshot(snapshot))
+        with open(output_filename, "w", encoding = "utf-8") as page:
+            page.write(output_page)
+        return os.path.getsize(output_filename), time.perf_counter() - start, ""
+    except Exception as e:
+        return 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+@contextmanager
+def _importable_in_new_processes() -> Iterator[None]:
+    """Workers that get started from scratch (instead of forked) import this module by name, and Cura loads plugins without
+    putting their folder on sys.path. Workers get a copy of sys.path when they start, so it only needs to be there until then."""
+    plugin_dir = os.path.dirname(os.path.abspath(__file__))
+    plugins_folder = os.path.dirname(plugin_dir)
+    # Only any use if the folder's called what the package is (which it always is in Cura)
+    added = os.path.basename(plugin_dir) == __package__ and plugins_folder not in sys.path
+    if added:
+        sys.path.append(plugins_folder)
+    try:
+        yield
+    finally:
+        if added and plugins_folder in sys.path:
+            sys.path.remove(plugins_folder)
+
+def _render_chunk(chunk: list[tuple[bytes, str]]) -> list[tuple[int, float, str]]:
+    """_render_snapshot() for each of a few snapshots, in a worker"""
+    return [_render_snapshot(snapshot, output_filename) for snapshot, output_filename in chunk]
+
+def render_batch(batch: Iterable[tuple[bytes, str]], workers: Optional[int] = None, chunk_size: int = 1) -> BatchResult:
+    """Renders (snapshot from encode_snapshot(), output file name) pairs to HTML files across a pool of processes, one per CPU unless you say otherwise.
+    They're read as the workers get through them, so batch can be a generator that makes each snapshot when it's asked for.
+    Every page comes out exactly the same as _assemble_html() would make it, and the result has them in the same order they came in.
+    One that fails (or would write over one from earlier in the batch) doesn't stop the rest, it just gets an error in its BatchReport."""
+    batch = iter(batch)
+    chunk_size = max(1, chunk_size)
+    chunks = iter(lambda: list(islice(batch, chunk_size)), [])
+    workers = max(1, workers or os.cpu_count() or 1)
+    # No point starting more workers than a small batch has chunks
+    first_chunks = deque(islice(chunks, workers * CHUNKS_PER_WORKER))
+    if not first_chunks:
+        return BatchResult()
+    if len(first_chunks) < workers * CHUNKS_PER_WORKER:
+        workers = min(workers, len(first_chunks))
+
+    reports: list[BatchReport] = []
+    written_filenames: set[str] = set()
+    # Each chunk's file names, whether each one's already been written by an earlier snapshot, and the worker's results for the rest
+    in_flight: deque[tuple[list[str], list[bool], Optional[Future]]] = deque()
+
+    def every_chunk() -> Iterator[list[tuple[bytes, str]]]:
+        # Letting go of the first few as they go too, instead of keeping them until the end
+        while first_chunks:
+            yield first_chunks.popleft()
+        yield from chunks
+
+    def submit(pool: ProcessPoolExecutor, chunk: list[tuple[bytes, str]]) -> None:
+        output_filenames = [output_filename for _, output_filename in chunk]
+        duplicates = []
+        for output_filename in output_filenames:
+            duplicates.append(os.path.abspath(output_filename) in written_filenames)
+            written_filenames.add(os.path.abspath(output_filename))
+        rendering = [pair for pair, duplicate in zip(chunk, duplicates) if not duplicate]
+        in_flight.append((output_filenames, duplicates, pool.submit(_render_chunk, rendering) if rendering else None))
+
+    def collect_oldest() -> None:
+        output_filenames, duplicates, rendering = in_flight.popleft()
+        rendered = iter(rendering.result() if rendering is not None else ())
+        for output_filename, duplicate in zip(output_filenames, duplicates):
+            if duplicate:
+                reports.append(BatchReport(output_filename, error = "Another snapshot in this batch already went to this file"))
+            else:
+                reports.append(BatchReport(output_filename, *next(rendered)))
+
+    start = time.perf_counter()
+    with _importable_in_new_processes(), ProcessPoolExecutor(max_workers = workers) as pool:
+        for chunk in every_chunk():
+            # Results have to go in order anyway, so waiting for the oldest is as good as waiting for any
+            if len(in_flight) >= workers * CHUNKS_PER_WORKER:
+                collect_oldest()
+            submit(pool, chunk)
+        while in_flight:
+            collect_oldest()
+    batch_result = BatchResult(reports = reports, seconds = time.perf_counter() - start, workers = workers)
+
+    for report in batch_result.failed:
+        Logger.log("w", f"Batch render couldn't make {report.output_filename}: {report.error}")
+    Logger.log("i", batch_result.summary())
+    return batch_result
@@ -0,0 +1,199 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Machine readable (JSON/CSV) versions of what goes in the HTML, for people who'd rather not scrape it.
+
+import csv
+import json
+from enum import Enum
+from typing import Any, Iterator, Optional, TextIO
+
+from .HTMLSettingsExportReborn import (BlankSetting, CategorySetting,
+                                       CompareProfiles, CssClasses,
+                                       SettingProfile)
+
+
+class DataFormat(Enum):
+    """Formats settings data can be written in"""
+    def __init__(self, suffix: str):  # Runs for each item in Enum
+        self._suffix = suffix
+
+    JSON = ".json"  # Settings nested under their parents like they are in Cura
+    JSON_FLAT = ".flat.json"  # One list of settings
+    CSV = ".csv"  # One row per setting per extruder
+
+    @property
+    def suffix(self) -> str:
+        """What to stick on the end of a file name for this format"""
+        return self._suffix
+
+# What the CSS classes mean, for people who don't read CSS
+SETTING_STATES: dict[str, str] = {
+    CssClasses.SETTING_LOCAL.full: "local",
+    CssClasses.SETTING_DISABLED.full: "disabled",
+    CssClasses.SETTING_HIDDEN.full: "hidden",
+    CssClasses.SETTING_NORMAL.full: "normal",
+}
+VALUE_STATES: dict[str, str] = {
+    CssClasses.ERROR_WARNING.full: "warning",
+    CssClasses.ERROR_ERROR.full: "error",
+}
+
+PROFILE_CSV_COLUMNS = ["category", "key", "label", "type", "depth", "parent", "extruder", "raw_value", "value", "state", "value_state"]
+COMPARE_CSV_COLUMNS = ["category", "key", "label", "type", "depth", "different", "profile", "extruder", "raw_value", "value", "state", "value_state"]
+
+
+def _to_json(item: Any) -> str:
+    # Some raw values aren't JSON types (they're whatever Cura's stack gave us) so just stringify those
+    return json.dumps(item, ensure_ascii = False, separators = (",", ":"), default = str)
+
+def _profile_info(profile: SettingProfile) -> dict[str, Any]:
+    return {
+        "profile_name": profile.profile_name,
+        "preset_name": profile.preset_name,
+        "printer_name": profile.printer_name,
+        "extruder_count": profile.extruder_count,
+    }
+
+def _extruder_records(setting: CategorySetting) -> list[dict[str, Any]]:
+    """The value of a setting on each extruder"""
+    records = []
+    for i, value in enumerate(setting.value):
+        records.append({
+            "extruder": i + 1,
+            "raw_value": setting.raw_value[i],
+            "value": value.replace("<br>", "\n"),
+            "state": SETTING_STATES.get(setting.css_class[i], "normal"),
+            "value_state": VALUE_STATES.get(setting.error_class[i]),
+        })
+    return records
+
+def _setting_record(setting: CategorySetting, nested: bool) -> dict[str, Any]:
+    record = {
+        "key": setting.key,
+        "label": setting.label,
+        "type": setting.setting_type,
+        "depth": setting.child_level,
+        "extruders": _extruder_records(setting),
+    }
+    if nested:
+        record["children"] = [_setting_record(child, True) for child in _visible_children(setting)]
+    return record
+
+def _visible_children(setting: CategorySetting) -> Iterator[CategorySetting]:
+    # Skipped settings don't make it into the HTML so they don't make it in here either
+    for child in setting.children.values():
+        if child is not None and not child.skip:
+            yield child
+
+def _iter_profile_settings(profile: SettingProfile) -> Iterator[tuple[str, CategorySetting, Optional[str]]]:
+    """(category, setting, parent key) for every setting in a profile, in the same order as the HTML"""
+    def walk(category: str, setting: CategorySetting, parent_key: Optional[str]):
+        yield category, setting, parent_key
+        for child in _visible_children(setting):
+            yield from walk(category, child, setting.key)
+
+    for category, category_settings in profile.settings.items():
+        for setting in category_settings:
+            if setting is not None and not setting.skip:
+                yield from walk(category, setting, None)
+
+def _stream_json(handle: TextIO, header: dict[str, Any], list_key: str, items: Iterator[Any]) -> None:
+    """Writes {**header, list_key: [items]} an item at a time so it never has to all be in memory at once"""
+    handle.write(_to_json(header)[:-1])  # Leave the closing brace off
+    handle.write(("," if header else "") + _to_json(list_key) + ":[")
+    for i, item in enumerate(items):
+        if i:
+            handle.write(",")
+        handle.write(_to_json(item))
+    handle.write("]}")
+
+def _raw_csv_value(raw_value: Any) -> str:
+    if raw_value is None:
+        return ""
+    return raw_value if isinstance(raw_value, str) else _to_json(raw_value)
+
+def write_profile(profile: SettingProfile, handle: TextIO, data_format: DataFormat) -> None:
+    """Writes all the settings in a profile"""
+    match data_format:
+        case DataFormat.JSON:
+            categories = ({
+                "key": category,
+                "label": profile.settings_labels.get(category, category),
+                "settings": [_setting_record(setting, True) for setting in category_settings if setting is not None and not setting.skip],
+            } for category, category_settings in profile.settings.items())
+            _stream_json(handle, {"profile": _profile_info(profile)}, "categories", categories)
+        case DataFormat.JSON_FLAT:
+            settings = (dict(_setting_record(setting, False), category = category, parent = parent_key)
+                        for category, setting, parent_key in _iter_profile_settings(profile))
+            _stream_json(handle, {"profile": _profile_info(profile)}, "settings", settings)
+        case DataFormat.CSV:
+            writer = csv.writer(handle)
+            writer.writerow(PROFILE_CSV_COLUMNS)
+            for category, setting, parent_key in _iter_profile_settings(profile):
+                for extruder in _extruder_records(setting):
+                    writer.writerow([category, setting.key, setting.label, setting.setting_type, setting.child_level, parent_key or "",
+                                     extruder["extruder"], _raw_csv_value(extruder["raw_value"]), extruder["value"], extruder["state"], extruder["value_state"] or ""])
+        case _:
+            raise ValueError(f"Invalid data format: {data_format}")
+
+def _iter_compare_settings(compare: CompareProfiles) -> Iterator[tuple[str, dict[str, Any]]]:
+    """(category, record) for every setting in a comparison, in the same order as the HTML"""
+    for category, category_keys in compare.category_keys.items():
+        for key in category_keys:
+            setting_a = compare.profile_a_settings[category][key]
+            setting_b = compare.profile_b_settings[category][key]
+            if (isinstance(setting_a, BlankSetting) or setting_a.skip) and (isinstance(setting_b, BlankSetting) or setting_b.skip):
+                continue
+            # Same rules as the HTML for which profile gets to describe the setting
+            described_by = setting_a if not isinstance(setting_a, BlankSetting) else setting_b
+            min_extruders = min(len(setting_a.value), len(setting_b.value))
+            yield category, {
+                "key": key,
+                "label": described_by.label,
+                "type": described_by.setting_type,
+                "depth": described_by.child_level,
+                "different": setting_a.value[:min_extruders] != setting_b.value[:min_extruders],
+                "a": None if isinstance(setting_a, BlankSetting) or setting_a.skip else _extruder_records(setting_a),
+                "b": None if isinstance(setting_b, BlankSetting) or setting_b.skip else _extruder_records(setting_b),
+            }
+
+def write_compare(compare: CompareProfiles, handle: TextIO, data_format: DataFormat) -> None:
+    """Writes both sides of a comparison"""
+    header = {"profile_a": _profile_info(compare.profile_a), "profile_b": _profile_info(compare.profile_b)}
+    match data_format:
+        case DataFormat.JSON:
+            def categories():
+                current_category = None
+                category_settings = []
+                for category, record in _iter_compare_settings(compare):
+                    if category != current_category and current_category is not None:
+                        yield {"key": current_category, "label": compare.profile_a.settings_labels.get(current_category, current_category), "settings": category_settings}
+                        category_settings = []
+                    current_category = category
+                    category_settings.append(record)
+                if current_category is not None:
+                    yield {"key": current_category, "label": compare.profile_a.settings_labels.get(current_category, current_category), "settings": category_settings}
+            _stream_json(handle, header, "categories", categories())
+        case DataFormat.JSON_FLAT:
+            _stream_json(handle, header, "settings", (dict(record, category = category) for category, record in _iter_compare_settings(compare)))
+        case DataFormat.CSV:
+            writer = csv.writer(handle)
+            writer.writerow(COMPARE_CSV_COLUMNS)
+            for category, record in _iter_compare_settings(compare):
+                for profile_key in ("a", "b"):
+                    for extruder in record[profile_key] or []:
+                        writer.writerow([category, record["key"], record["label"], record["type"], record["depth"], record["different"],
+                                         profile_key.upper(), extruder["extruder"], _raw_csv_value(extruder["raw_value"]), extruder["value"],
+                                         extruder["state"], extruder["value_state"] or ""])
+        case _:
+            raise ValueError(f"Invalid data format: {data_format}")
+
+def export_settings_data(source: SettingProfile | CompareProfiles, file_path: str, data_format: DataFormat) -> None:
+    """Writes a captured profile or a comparison to a file, as it goes rather than all at the end"""
+    # newline="" because the CSV writer does its own line endings
+    with open(file_path, "w", encoding = "utf-8", newline = "") as handle:
+        if isinstance(source, CompareProfiles):
+            write_compare(source, handle, data_format)
+        else:
+            write_profile(source, handle, data_format)
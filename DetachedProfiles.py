@@ -0,0 +1,232 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Copies of the active stacks with a different profile swapped in, so a profile can be captured without making
+# Cura switch to it (and re-evaluate, re-slice and redraw everything) and then switch back again.
+# Also stacks made from the settings in a job file (see JobFiles.py), so it can be reported on without opening it.
+
+import copy
+from dataclasses import dataclass
+from enum import Enum, auto
+
+from cura.CuraApplication import CuraApplication
+from cura.Machines.ContainerTree import ContainerTree
+from cura.Settings.CuraContainerStack import _ContainerIndexes
+from cura.Settings.ExtruderStack import ExtruderStack
+from cura.Settings.GlobalStack import GlobalStack
+from UM.i18n import i18nCatalog
+from UM.Settings.ContainerRegistry import ContainerRegistry
+from UM.Settings.InstanceContainer import InstanceContainer
+
+from .JobFiles import JobFile, JobFileKind, parse_stack_file
+
+catalog = i18nCatalog("htmlsettingsexport")
+
+
+class ProfileKind(Enum):
+    """The sorts of profile that can be swapped in"""
+    QUALITY_CHANGES = auto()  # Custom profiles
+    QUALITY = auto()  # The built in quality levels
+    INTENT = auto()  # Intents (mostly on UM printers), which sit on top of a quality level
+
+@dataclass(frozen = True)
+class ProfileChoice:
+    """A profile that could be used with the printer's current configuration"""
+    kind: ProfileKind
+    name: str
+    quality_type: str
+    intent_category: str = "default"
+
+    def description(self) -> str:
+        match self.kind:
+            case ProfileKind.QUALITY_CHANGES:
+                return catalog.i18nc("@dialog:profile_custom", "Custom profile: {0}").format(self.name)
+            case ProfileKind.INTENT:
+                return catalog.i18nc("@dialog:profile_intent", "Intent: {0}").format(self.name)
+        return catalog.i18nc("@dialog:profile_quality", "Quality: {0}").format(self.name)
+
+@dataclass
+class DetachedStacks:
+    """Stacks that look just like the active ones to anything reading settings from them,
+    but that Cura doesn't know about. Nothing changes in Cura when they do."""
+    global_stack: GlobalStack
+    extruder_stacks: list[ExtruderStack]
+    profile_name: str  # Used when there's no custom profile to get a name from
+    intent_category: str
+
+
+def available_profiles() -> list[ProfileChoice]:
+    """Every profile that could be swapped in for the printer as it's set up now, same as Cura's own profile menu"""
+    container_tree = ContainerTree.getInstance()
+    quality_groups = container_tree.getCurrentQualityGroups()
+    choices = [ProfileChoice(ProfileKind.QUALITY, quality_group.name, quality_type)
+               for quality_type, quality_group in quality_groups.items() if quality_group.is_available]
+    choices.extend(ProfileChoice(ProfileKind.QUALITY_CHANGES, changes_group.name, changes_group.quality_type)
+                   for changes_group in container_tree.getCurrentQualityChangesGroups() if changes_group.is_available)
+    from cura.Settings.IntentManager import IntentManager
+    for quality_type, intent_category in IntentManager.getInstance().getCurrentAvailableIntents():
+        if intent_category != "default" and quality_type in quality_groups:
+            choices.append(ProfileChoice(ProfileKind.INTENT, f"{intent_category.title()} - {quality_groups[quality_type].name}", quality_type, intent_category))
+    return choices
+
+def make_detached_stacks(choice: ProfileChoice) -> DetachedStacks:
+    """Copies the active stacks with choice's quality, intent and custom profile containers in place of the active ones.
+    User changes are left out since they belong to the active profile, not this one.
+    Raises ValueError if the profile can't be used with the printer's current configuration."""
+    application = CuraApplication.getInstance()
+    global_stack = application.getGlobalContainerStack()
+    container_tree = ContainerTree.getInstance()
+    quality_group = container_tree.getCurrentQualityGroups().get(choice.quality_type)
+    if quality_group is None or quality_group.node_for_global is None:
+        raise ValueError(f"{choice.name} can't be used with the printer's current configuration")
+
+    changes_group = None
+    if choice.kind == ProfileKind.QUALITY_CHANGES:
+        changes_group = next((group for group in container_tree.getCurrentQualityChangesGroups() if group.name == choice.name), None)
+        if changes_group is None:
+            raise ValueError(f"Couldn't find custom profile {choice.name}")
+
+    global_replacements = {
+        _ContainerIndexes.UserChanges: application.empty_container,
+        _ContainerIndexes.QualityChanges: _find_container(changes_group.metadata_for_global if changes_group else None, application.empty_quality_changes_container),
+        _ContainerIndexes.Intent: application.empty_intent_container,
+        _ContainerIndexes.Quality: quality_group.node_for_global.container,
+    }
+    detached_global = _detached_copy(global_stack, GlobalStack(global_stack.getId() + "_detached"), global_replacements)
+
+    detached_extruders: list[ExtruderStack] = []
+    for extruder_stack in global_stack.extruderList:
+        position = int(extruder_stack.getMetaDataEntry("position"))
+        quality_node = quality_group.nodes_for_extruders.get(position)
+        intent_container = application.empty_intent_container
+        if choice.kind == ProfileKind.INTENT and quality_node is not None:
+            intent_container = next((intent_node.container for intent_node in quality_node.intents.values()
+                                     if intent_node.intent_category == choice.intent_category), intent_container)
+        extruder_replacements = {
+            _ContainerIndexes.UserChanges: application.empty_container,
+            _ContainerIndexes.QualityChanges: _find_container(changes_group.metadata_per_extruder.get(position) if changes_group else None, application.empty_quality_changes_container),
+            _ContainerIndexes.Intent: intent_container,
+            _ContainerIndexes.Quality: quality_node.container if quality_node is not None else application.empty_quality_container,
+        }
+        detached_extruder = _detached_copy(extruder_stack, ExtruderStack(extruder_stack.getId() + "_detached"), extruder_replacements)
+        # Formulas on the copy look things up in the copied global stack (and it finds the copied extruders).
+        # extruderValue() and friends still go through ExtruderManager to the active extruders though, so the
+        # odd setting that depends on a different extruder's value gets that from the active profile.
+        detached_extruder.setNextStack(detached_global)
+        detached_extruders.append(detached_extruder)
+
+    return DetachedStacks(global_stack = detached_global, extruder_stacks = detached_extruders,
+                          profile_name = choice.name, intent_category = choice.intent_category)
+
+def make_job_stacks(job_file: JobFile) -> DetachedStacks:
+    """Stacks with the settings from a G-code or project file, for reading just like the active ones.
+    Raises ValueError if Cura doesn't have the printer's definition (or the settings won't load)."""
+    if job_file.kind == JobFileKind.PROJECT:
+        return _make_project_stacks(job_file)
+    return _make_gcode_stacks(job_file)
+
+def _make_project_stacks(job_file: JobFile) -> DetachedStacks:
+    """Projects have the whole stack. Anything that isn't in the file (materials, qualities) comes from Cura by ID,
+    and if Cura doesn't have it either it's left empty."""
+    global_file = parse_stack_file(job_file.global_settings)
+    detached_global = _job_stack(GlobalStack(job_file.job_name + "_job_detached"), global_file, job_file)
+    detached_extruders: list[ExtruderStack] = []
+    for serialised in job_file.extruder_settings:
+        extruder_file = parse_stack_file(serialised)
+        detached_extruder = _job_stack(ExtruderStack(f"{job_file.job_name}_job_extruder_{extruder_file.metadata.get('position', len(detached_extruders))}_detached"), extruder_file, job_file)
+        detached_extruder.setNextStack(detached_global)
+        detached_extruders.append(detached_extruder)
+    intent_category = detached_extruders[0].intent.getMetaDataEntry("intent_category", "default") if detached_extruders else "default"
+    return DetachedStacks(global_stack = detached_global, extruder_stacks = detached_extruders,
+                          profile_name = detached_global.quality.getName(), intent_category = intent_category)
+
+def _make_gcode_stacks(job_file: JobFile) -> DetachedStacks:
+    """G-code only has what's in the custom profile and user changes (flattened together), plus the quality type.
+    The rest comes from the printer's definition and Cura's quality for that type. If the active printer uses the
+    same quality definition it's probably the same printer, so its machine settings stand in for the missing ones."""
+    application = CuraApplication.getInstance()
+    registry = ContainerRegistry.getInstance()
+    global_changes = _job_container(job_file.job_name + "_job_global", job_file.global_settings)
+    quality_definition_id = global_changes.getMetaDataEntry("definition") or "fdmprinter"
+
+    active_global = application.getGlobalContainerStack()
+    active_extruders: dict[int, ExtruderStack] = {}
+    if active_global is not None and ContainerTree.getInstance().machines[active_global.definition.getId()].quality_definition == quality_definition_id:
+        definition = active_global.definition
+        definition_changes = active_global.definitionChanges
+        active_extruders = {int(extruder.getMetaDataEntry("position")): extruder for extruder in active_global.extruderList}
+    else:
+        definition = _find_definition(quality_definition_id)
+        definition_changes = application.empty_container
+    qualities = registry.findInstanceContainers(type = "quality", definition = quality_definition_id,
+                                                quality_type = global_changes.getMetaDataEntry("quality_type"), global_quality = "True")
+
+    detached_global = GlobalStack(job_file.job_name + "_job_detached")
+    detached_global.setContainer(_ContainerIndexes.QualityChanges, global_changes)
+    detached_global.setContainer(_ContainerIndexes.Quality, qualities[0] if qualities else application.empty_container)
+    detached_global.setContainer(_ContainerIndexes.DefinitionChanges, definition_changes)
+    detached_global.setContainer(_ContainerIndexes.Definition, definition)
+
+    detached_extruders: list[ExtruderStack] = []
+    intent_category = "default"
+    for index, serialised in enumerate(job_file.extruder_settings):
+        extruder_changes = _job_container(f"{job_file.job_name}_job_extruder_{index}", serialised)
+        position = int(extruder_changes.getMetaDataEntry("position", index))
+        if index == 0:
+            intent_category = extruder_changes.getMetaDataEntry("intent_category", "default")
+        detached_extruder = ExtruderStack(f"{job_file.job_name}_job_extruder_{position}_detached")
+        detached_extruder.setMetaData({"position": str(position)})
+        active_extruder = active_extruders.get(position)
+        if active_extruder is not None:
+            detached_extruder.setContainer(_ContainerIndexes.DefinitionChanges, active_extruder.definitionChanges)
+            detached_extruder.setContainer(_ContainerIndexes.Definition, active_extruder.definition)
+        else:
+            extruder_definition_id = definition.getMetaDataEntry("machine_extruder_trains", {}).get(str(position), "fdmextruder")
+            detached_extruder.setContainer(_ContainerIndexes.Definition, _find_definition(extruder_definition_id))
+        detached_extruder.setContainer(_ContainerIndexes.QualityChanges, extruder_changes)
+        detached_extruder.setNextStack(detached_global)
+        detached_extruders.append(detached_extruder)
+
+    return DetachedStacks(global_stack = detached_global, extruder_stacks = detached_extruders,
+                          profile_name = global_changes.getName(), intent_category = intent_category)
+
+def _job_stack(stack, stack_file, job_file: JobFile):
+    stack.setMetaData(dict(stack_file.metadata))
+    for index, container_id in enumerate(stack_file.container_ids):
+        if index == _ContainerIndexes.Definition:
+            container = _find_definition(container_id)
+        elif container_id in job_file.containers:
+            container = _job_container(container_id, job_file.containers[container_id])
+        else:
+            container = _find_container({"id": container_id}, CuraApplication.getInstance().empty_container)
+        stack.setContainer(index, container)
+    return stack
+
+def _job_container(container_id: str, serialised: str) -> InstanceContainer:
+    """An instance container from a job file. Never goes in the registry either."""
+    container = InstanceContainer(container_id)
+    try:
+        container.deserialize(serialised)
+    except Exception as e:
+        raise ValueError(f"Couldn't read {container_id} from the job file: {e}") from e
+    return container
+
+def _find_definition(definition_id: str):
+    definitions = ContainerRegistry.getInstance().findDefinitionContainers(id = definition_id)
+    if not definitions:
+        raise ValueError(f"Cura doesn't have a definition for {definition_id} (is that printer installed?)")
+    return definitions[0]
+
+def _find_container(metadata, fallback):
+    if not metadata:
+        return fallback
+    containers = ContainerRegistry.getInstance().findContainers(id = metadata["id"])
+    return containers[0] if containers else fallback
+
+def _detached_copy(stack, detached_stack, replacements: dict):
+    """Fills detached_stack with the same containers as stack, apart from the ones in replacements (by index).
+    It never goes in the container registry, so Cura doesn't know it exists and nothing gets re-sliced."""
+    detached_stack.setMetaData(copy.deepcopy(stack.getMetaData()))
+    for index, container in enumerate(stack.getContainers()):
+        detached_stack.setContainer(index, replacements.get(index, container))
+    return detached_stack
@@ -0,0 +1,141 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# The only bit of the plugin Cura loads at startup: the menu and the preferences. Everything that actually does
+# anything (capturing, comparing, rendering, the archive and the rest) is in HTMLSettingsExportReborn.py, which
+# doesn't get loaded until something needs it. Usually that's somebody clicking on the menu. Sometimes it's never.
+
+from typing import Callable
+
+from cura.CuraApplication import CuraApplication
+from UM.Extension import Extension
+
+from . import i18n_catalog as catalog  # Already loaded by __init__.py for Cura, no point loading it twice
+
+
+class ExportPreferences:
+    """Every preference the plugin has. Here instead of in the main module so they can be registered
+    (and the ones that start things with Cura looked at) without loading it."""
+
+    # "static" writes every table out in full (best for printing).
+    # "lazy" embeds the settings as data and only builds tables when they're opened (best for huge pages).
+    PREFERENCE_PAGE_FORMAT: str = "htmlsettingsexport/page_format"
+    # Comma separated list of "json", "json_flat" and/or "csv" files to write next to every HTML export
+    PREFERENCE_DATA_FORMATS: str = "htmlsettingsexport/data_formats"
+    # Comma separated list of other languages (like "de_DE, fr_FR") to make every HTML export in as well, as <name>.<language>.html next to it.
+    # The settings only get read once whatever language Cura's in, then each language gets made from that.
+    PREFERENCE_LANGUAGES: str = "htmlsettingsexport/languages"
+    # Puts how long each part of the export took in a comment at the end of the page (it always goes in the log)
+    PREFERENCE_TIMING_COMMENT: str = "htmlsettingsexport/timing_comment"
+    # Writes a cProfile dump (.prof) next to every HTML export. For when the timing summary isn't enough.
+    PREFERENCE_PROFILE_EXPORT: str = "htmlsettingsexport/profile_export"
+    # Writes a report in the background every time a slice finishes (if the settings changed since the last one)
+    PREFERENCE_AUTO_EXPORT: str = "htmlsettingsexport/auto_export"
+    # Where automatic reports go. Blank means wherever Cura last saved something.
+    PREFERENCE_AUTO_EXPORT_FOLDER: str = "htmlsettingsexport/auto_export_folder"
+    # Don't write a report again if it's still exactly what the same settings would make
+    PREFERENCE_SKIP_UNCHANGED: str = "htmlsettingsexport/skip_unchanged"
+    # Settings that are the same on every extruder get one cell across all of them instead of one each
+    PREFERENCE_COLLAPSE_EXTRUDERS: str = "htmlsettingsexport/collapse_extruders"
+    # Smaller static pages: setting rows on one line, depth and state tooltips done with CSS
+    PREFERENCE_COMPACT_MARKUP: str = "htmlsettingsexport/compact_markup"
+    # Keeps every capture in a SQLite database so old jobs can be searched and compared
+    PREFERENCE_ARCHIVE: str = "htmlsettingsexport/archive"
+    # Comparisons point out which differences only happened because another setting changed (like everything that follows the layer height)
+    PREFERENCE_ROOT_CAUSES: str = "htmlsettingsexport/root_causes"
+    # Folder to keep an eye on for G-code and 3MF files, and write a report for each one. Blank means don't.
+    PREFERENCE_WATCH_FOLDER: str = "htmlsettingsexport/watch_folder"
+    # Where those reports (and their index page) go. Blank means a "settings reports" folder inside the watched one.
+    PREFERENCE_WATCH_OUTPUT_FOLDER: str = "htmlsettingsexport/watch_output_folder"
+    # Serves reports over HTTP, made when someone asks for them, instead of writing files
+    PREFERENCE_REPORT_SERVER: str = "htmlsettingsexport/report_server"
+    # Where it listens. 127.0.0.1 is just this computer, 0.0.0.0 lets anyone on the network have a look.
+    PREFERENCE_REPORT_SERVER_HOST: str = "htmlsettingsexport/report_server_host"
+    PREFERENCE_REPORT_SERVER_PORT: str = "htmlsettingsexport/report_server_port"
+    DEFAULT_REPORT_SERVER_PORT: int = 8642
+
+    def _add_preferences(self) -> None:
+        """Tells Cura about all of them. Fine to do more than once, the second time doesn't change anything."""
+        self._preferences.addPreference(self.PREFERENCE_PAGE_FORMAT, "static")
+        self._preferences.addPreference(self.PREFERENCE_DATA_FORMATS, "")
+        self._preferences.addPreference(self.PREFERENCE_LANGUAGES, "")
+        self._preferences.addPreference(self.PREFERENCE_TIMING_COMMENT, False)
+        self._preferences.addPreference(self.PREFERENCE_PROFILE_EXPORT, False)
+        self._preferences.addPreference(self.PREFERENCE_AUTO_EXPORT, False)
+        self._preferences.addPreference(self.PREFERENCE_AUTO_EXPORT_FOLDER, "")
+        self._preferences.addPreference(self.PREFERENCE_SKIP_UNCHANGED, True)
+        self._preferences.addPreference(self.PREFERENCE_ARCHIVE, False)
+        self._preferences.addPreference(self.PREFERENCE_ROOT_CAUSES, True)
+        self._preferences.addPreference(self.PREFERENCE_COLLAPSE_EXTRUDERS, False)
+        self._preferences.addPreference(self.PREFERENCE_COMPACT_MARKUP, False)
+        self._preferences.addPreference(self.PREFERENCE_WATCH_FOLDER, "")
+        self._preferences.addPreference(self.PREFERENCE_WATCH_OUTPUT_FOLDER, "")
+        self._preferences.addPreference(self.PREFERENCE_REPORT_SERVER, False)
+        self._preferences.addPreference(self.PREFERENCE_REPORT_SERVER_HOST, "127.0.0.1")
+        self._preferences.addPreference(self.PREFERENCE_REPORT_SERVER_PORT, self.DEFAULT_REPORT_SERVER_PORT)
+
+    def _get_bool_preference(self, key: str) -> bool:
+        # Anything edited by hand in cura.cfg comes back as a string
+        value = self._preferences.getValue(key)
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "yes", "1")
+        return bool(value)
+
+
+class HTMLSettingsExportMenu(ExportPreferences, Extension):
+    """What Cura gets from register(). Puts the menu together and hands every click to the exporter
+    (HTMLSettingsExportReborn.HTMLSettingsExportReborn), which only gets made the first time there's one."""
+
+    def __init__(self):
+        super().__init__()
+
+        self._application = CuraApplication.getInstance()
+        self._preferences = self._application.getPreferences()
+        self._add_preferences()
+
+        self._exporter = None  # Made the first time something needs it
+        self._application.engineCreatedSignal.connect(self._on_engine_created)
+
+        # Set up menu item
+        self.setMenuName("HTML Settings Export")
+        self.addMenuItem(catalog.i18nc("@menu:export", "Export settings"), self._exporter_action("_save_report_html"))
+        self.addMenuItem(catalog.i18nc("@menu:export_changed", "Export changed settings only"), self._exporter_action("_save_changed_report_html"))
+        self.addMenuItem("  ", lambda: None)
+        self.addMenuItem(catalog.i18nc("@menu:compare_first", "Store first profile for comparison"), self._exporter_action("_save_profile_a"))
+        self.addMenuItem(catalog.i18nc("@menu:make_comparison", "Export comparison with first profile"), self._exporter_action("_save_compare_html"))
+        self.addMenuItem(catalog.i18nc("@menu:compare_other_profile", "Compare active profile against..."), self._exporter_action("_save_other_profile_compare_html"))
+        self.addMenuItem(catalog.i18nc("@menu:compare_project", "Compare with project file..."), self._exporter_action("_save_project_compare_html"))
+        self.addMenuItem("   ", lambda: None)
+        self.addMenuItem(catalog.i18nc("@menu:compare_archived", "Compare archived jobs..."), self._exporter_action("_save_archive_compare_html"))
+        self.addMenuItem(catalog.i18nc("@menu:fleet_report", "Fleet report from archived jobs..."), self._exporter_action("_save_fleet_report_html"))
+        self.addMenuItem(catalog.i18nc("@menu:compare_similar", "Compare with the most similar archived job..."), self._exporter_action("_save_similar_compare_html"))
+        self.addMenuItem(catalog.i18nc("@menu:export_data", "Export settings data (JSON/CSV)"), self._exporter_action("_save_settings_data"))
+        self.addMenuItem("    ", lambda: None)
+        self.addMenuItem(catalog.i18nc("@menu:toggle_auto_export", "Toggle automatic export after slicing"), self._exporter_action("_toggle_auto_export"))
+        self.addMenuItem(catalog.i18nc("@menu:toggle_watch_folder", "Toggle watching a folder for jobs..."), self._exporter_action("_toggle_watch_folder"))
+        self.addMenuItem(catalog.i18nc("@menu:toggle_report_server", "Toggle report server"), self._exporter_action("_toggle_report_server"))
+
+    def _get_exporter(self):
+        """The thing that does all the work, loaded (and made) the first time it's needed"""
+        if self._exporter is None:
+            from .HTMLSettingsExportReborn import HTMLSettingsExportReborn
+            self._exporter = HTMLSettingsExportReborn()
+        return self._exporter
+
+    def _exporter_action(self, method_name: str) -> Callable[[], None]:
+        """A menu callback that doesn't load the exporter until somebody actually clicks on it"""
+        return lambda: getattr(self._get_exporter(), method_name)()
+
+    def _on_engine_created(self) -> None:
+        backend = self._application.getBackend()
+        if backend is not None:
+            backend.backendStateChange.connect(self._on_backend_state_change)
+        # Only needed now if something was left running when Cura closed
+        if self._preferences.getValue(self.PREFERENCE_WATCH_FOLDER) or self._get_bool_preference(self.PREFERENCE_REPORT_SERVER):
+            self._get_exporter()._resume_background_work()
+
+    def _on_backend_state_change(self, state) -> None:
+        # The state changes a few times every slice. That's no reason to load the exporter unless it's going to export something.
+        if self._exporter is None and not self._get_bool_preference(self.PREFERENCE_AUTO_EXPORT):
+            return
+        self._get_exporter()._on_backend_state_change(state)
@@ -0,0 +1,152 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Fleet report: what a few hundred archived jobs have in common, and which ones don't go along with it.
+# It's a matrix with a row for each setting (and extruder) and a column for each job, where each cell is the archive's ID
+# for its value instead of the value itself. Rows get built one at a time from the archive and only what's interesting
+# about each one gets kept (its distinct values and the jobs that don't have the usual one), so memory goes with
+# how many different values there are, not settings * extruders * jobs.
+
+import html
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .HTMLSettingsExportReborn import indent
+from .SettingsArchive import ArchivedJob, SettingsArchive
+
+MISSING: int = 0  # What a job that doesn't have this setting (or this extruder) gets instead of a value ID
+NUMERIC_TYPES: tuple[str, ...] = ("int", "float")  # Bools are numbers in the archive, but "min: False" isn't much use
+DISPLAY_LENGTH: int = 60  # Longer values (start G-code, I'm looking at you) get cut short, with the rest in a tooltip
+
+
+@dataclass
+class FleetValue:
+    """One distinct value out of the whole fleet"""
+    display: str
+    number: Optional[float] = None
+
+@dataclass
+class FleetRow:
+    """A setting (on one extruder) that isn't the same on every job"""
+    key: str
+    label: str
+    category: str
+    child_level: int
+    setting_type: str
+    position: int  # Extruder
+    value_counts: dict[int, int]  # Value ID: how many jobs have it
+    common_value: int  # ID of the most common value
+    deviations: dict[int, array] = field(default_factory = dict)  # ID of every other value: columns of the jobs that have it
+    missing: int = 0  # Jobs that don't have this setting at all
+    numeric_range: Optional[tuple[float, float]] = None
+
+@dataclass
+class FleetMatrix:
+    jobs: list[ArchivedJob]  # In column order
+    values: dict[int, FleetValue]  # By value ID, just the ones in rows that are shown
+    rows: list[FleetRow] = field(default_factory = list)
+    category_labels: dict[str, str] = field(default_factory = dict)
+    uniform_rows: int = 0  # Rows left out for being the same on every job
+
+    @property
+    def max_extruders(self) -> int:
+        return max((job.extruder_count for job in self.jobs), default = 1)
+
+
+def build_fleet_matrix(archive: SettingsArchive, jobs: list[ArchivedJob]) -> FleetMatrix:
+    job_ids = [job.job_id for job in jobs]
+    setting_keys = archive.setting_keys(job_ids)
+    matrix = FleetMatrix(jobs = jobs, values = {})
+    matrix.category_labels = {name: label for name, label, _, _, setting_type in setting_keys.values() if setting_type == "category"}
+    # Each row only exists until the next one comes along, so only what's interesting about it gets kept
+    for key_id, position, value_ids in archive.iter_matrix_rows(job_ids):
+        _finish_row(matrix, setting_keys, (key_id, position), value_ids)
+
+    value_ids = {value_id for row in matrix.rows for value_id in row.value_counts}
+    matrix.values = {value_id: FleetValue(display, number) for value_id, (_, display, number) in archive.setting_values(sorted(value_ids)).items()}
+    for row in matrix.rows:
+        if row.setting_type in NUMERIC_TYPES:
+            numbers = [matrix.values[value_id].number for value_id in row.value_counts if matrix.values[value_id].number is not None]
+            if numbers:
+                row.numeric_range = (min(numbers), max(numbers))
+    return matrix
+
+def _finish_row(matrix: FleetMatrix, setting_keys: dict[int, tuple[str, str, str, int, str]], row_id: tuple[int, int], value_ids: array) -> None:
+    value_counts = Counter(value_ids)
+    missing = value_counts.pop(MISSING, 0)
+    if len(value_counts) <= 1:
+        # Jobs without it at all don't count as different. Otherwise every single extruder 2 setting would turn up
+        # as soon as one single extruder job's in there, and that's not news to anyone.
+        matrix.uniform_rows += 1
+        return
+    key_id, position = row_id
+    name, label, category, child_level, setting_type = setting_keys[key_id]
+    common_value = value_counts.most_common(1)[0][0]
+    deviations: dict[int, array] = {}
+    for column, value_id in enumerate(value_ids):
+        if value_id != common_value and value_id != MISSING:
+            deviations.setdefault(value_id, array("I")).append(column)
+    matrix.rows.append(FleetRow(key = name, label = label, category = category, child_level = child_level, setting_type = setting_type, position = position,
+                                value_counts = dict(value_counts), common_value = common_value, deviations = deviations, missing = missing))
+
+def make_fleet_rows(matrix: FleetMatrix, base_indent: int, extruder_label: str) -> str:
+    """Table rows for every setting that isn't the same everywhere, with a heading row for each category"""
+    job_count = len(matrix.jobs)
+    show_extruders = matrix.max_extruders > 1
+    rows_html: list[str] = []
+    category = None
+    for row in matrix.rows:
+        if row.category != category:
+            category = row.category
+            rows_html.append(indent(f'<tr class="category"><th colspan="6">{html.escape(matrix.category_labels.get(category, category))}</th></tr>', base_indent))
+        label = html.escape(row.label)
+        if show_extruders:
+            label += f' <span class="extruder">({html.escape(extruder_label)} #{row.position + 1})</span>'
+        cells = [
+            f'<td class="setting" style="padding-left: {max(row.child_level, 0) + 0.5}em" title="{html.escape(row.key)}">{label}</td>',
+            f'<td class="number">{len(row.value_counts)}</td>',
+            f'<td>{_value_html(matrix.values[row.common_value])} <span class="count">({row.value_counts[row.common_value]}/{job_count})</span></td>',
+            f'<td class="number">{_number_text(row.numeric_range[0]) if row.numeric_range else ""}</td>',
+            f'<td class="number">{_number_text(row.numeric_range[1]) if row.numeric_range else ""}</td>',
+            f'<td>{_deviations_html(matrix, row)}</td>',
+        ]
+        rows_html.append(indent(f'<tr>{"".join(cells)}</tr>', base_indent))
+    return "\n".join(rows_html)
+
+def make_fleet_job_rows(matrix: FleetMatrix, base_indent: int) -> str:
+    """The key for the job numbers in the deviations"""
+    return "\n".join(indent(f'<tr id="job-{column + 1}"><td class="number">{column + 1}</td><td>{html.escape(job.job_name)}</td><td>{html.escape(job.profile_name)}</td>'
+                            f'<td>{html.escape(job.machine_name)}</td><td>{html.escape(job.captured_at.replace("T", " "))}</td></tr>', base_indent)
+                     for column, job in enumerate(matrix.jobs))
+
+def _value_html(value: FleetValue) -> str:
+    text = value.display.replace("<br>", "\n")
+    if len(text) <= DISPLAY_LENGTH and "\n" not in text:
+        return f'<span class="value">{html.escape(text)}</span>'
+    first_line = text[:DISPLAY_LENGTH].split("\n")[0]
+    return f'<span class="value" title="{html.escape(text)}">{html.escape(first_line)}…</span>'
+
+def _number_text(number: float) -> str:
+    return str(int(number)) if number.is_integer() else f"{number:g}"
+
+def _deviations_html(matrix: FleetMatrix, row: FleetRow) -> str:
+    """Each value that isn't the usual one, and links to the jobs that have it. Most popular first."""
+    deviations_html = []
+    for value_id, columns in sorted(row.deviations.items(), key = lambda deviation: (-len(deviation[1]), deviation[1][0])):
+        deviations_html.append(f'<div class="deviation">{_value_html(matrix.values[value_id])}: {_job_links(columns)}</div>')
+    return "".join(deviations_html)
+
+def _job_links(columns: array) -> str:
+    """Links to the jobs in the key, with runs of jobs in a row as first-last (jobs in a row tend to go together)"""
+    job_links = []
+    run_start = 0
+    for index, column in enumerate(columns):
+        if index + 1 < len(columns) and columns[index + 1] == column + 1:
+            continue
+        first = columns[run_start]
+        job_links.append(f'<a href="#job-{first + 1}">{first + 1}</a>' if first == column else
+                         f'<a href="#job-{first + 1}">{first + 1}</a>–<a href="#job-{column + 1}">{column + 1}</a>')
+        run_start = index + 1
+    return ", ".join(job_links)
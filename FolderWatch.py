@@ -0,0 +1,170 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Bookkeeping for watching a folder of job files: what's been seen (so a restart doesn't read everything again)
+# and the index page linking to every report (which gets a row changed, not the whole thing rewritten from scratch).
+# The actual watching is in the extension, since reading settings needs Cura.
+
+import html
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from .JobFiles import is_job_file
+
+
+@dataclass
+class WatchedJob:
+    """What's known about one job file in the watched folder"""
+    name: str  # File name in the watched folder
+    size: int
+    mtime_ns: int
+    fingerprint: str = ""  # Of the settings in it (see JobFile.fingerprint())
+    report: str = ""  # Report's file name in the output folder
+    profile_name: str = ""
+    printer_name: str = ""
+    updated: str = ""  # When the report was last written
+    error: str = ""  # Why there isn't a report, if there isn't
+
+    def is_unchanged(self, size: int, mtime_ns: int) -> bool:
+        return self.size == size and self.mtime_ns == mtime_ns
+
+class WatchIndex:
+    """Every job file that's been looked at, saved as JSON so it survives a restart.
+    A file only gets read again if its size or modified time has changed."""
+
+    # Something still being copied in changes size between scans. Leave it alone until it's had time to settle.
+    SETTLE_SECONDS: float = 5.0
+
+    def __init__(self, index_filename: str):
+        self._index_filename = index_filename
+        self._jobs: dict[str, WatchedJob] = {}
+        self._lock = threading.Lock()  # Reports finish on the worker threads
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self._index_filename, "r", encoding = "utf-8") as index_file:
+                self._jobs = {job["name"]: WatchedJob(**job) for job in json.load(index_file)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError):
+            self._jobs = {}  # Unreadable or from some other version. Worst case is everything gets read again.
+
+    def save(self) -> None:
+        with self._lock:
+            jobs = [asdict(job) for job in self._jobs.values()]
+        temp_filename = self._index_filename + ".tmp"
+        with open(temp_filename, "w", encoding = "utf-8") as index_file:
+            json.dump(jobs, index_file, indent = 1)
+        os.replace(temp_filename, self._index_filename)  # So a crash halfway through doesn't lose the lot
+
+    def get(self, name: str) -> Optional[WatchedJob]:
+        with self._lock:
+            return self._jobs.get(name)
+
+    def jobs(self) -> list[WatchedJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def update(self, job: WatchedJob) -> None:
+        with self._lock:
+            self._jobs[job.name] = job
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def scan(self, folder: str, skip: set[str]) -> tuple[list[WatchedJob], list[str]]:
+        """Job files that are new or have changed (as WatchedJobs with just the size and time filled in),
+        and the names of ones that have gone. Only looks at sizes and times, so it's cheap to do often.
+        Anything in skip is still being worked on and gets left for the next scan."""
+        changed: list[WatchedJob] = []
+        present: set[str] = set()
+        settled_before = time.time_ns() - int(self.SETTLE_SECONDS * 1e9)
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not is_job_file(entry.name):
+                    continue
+                present.add(entry.name)
+                if entry.name in skip:
+                    continue
+                stat = entry.stat()
+                known = self.get(entry.name)
+                if known is not None and known.is_unchanged(stat.st_size, stat.st_mtime_ns):
+                    continue
+                if stat.st_mtime_ns > settled_before:
+                    continue
+                changed.append(WatchedJob(name = entry.name, size = stat.st_size, mtime_ns = stat.st_mtime_ns))
+        with self._lock:
+            removed = [name for name in self._jobs if name not in present]
+        # Oldest first, so a pile of jobs gets done in the order they turned up
+        changed.sort(key = lambda job: job.mtime_ns)
+        return changed, removed
+
+class JobFolderPage:
+    """The page with a row for every job. Each row is one line with the job's name on it, so a changed
+    job means changing that one line instead of making the whole page again."""
+
+    ROW_START: str = '<tr data-job="'
+    ROWS_END: str = "</tbody>"
+
+    def __init__(self, page_filename: str, empty_page: str):
+        self._page_filename = page_filename
+        self._empty_page = empty_page  # What to start with if there isn't a page yet
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_row(job: WatchedJob, error_label: str) -> str:
+        name = html.escape(job.name)
+        if job.error:
+            return (f'{JobFolderPage.ROW_START}{name}" class="job-error"><td>{name}</td><td colspan="3">{html.escape(error_label)}: {html.escape(job.error)}</td>'
+                    f'<td>{html.escape(job.updated)}</td></tr>')
+        return (f'{JobFolderPage.ROW_START}{name}"><td><a href="{html.escape(job.report)}">{name}</a></td><td>{html.escape(job.profile_name)}</td>'
+                f'<td>{html.escape(job.printer_name)}</td><td><code>{job.fingerprint[:12]}</code></td><td>{html.escape(job.updated)}</td></tr>')
+
+    def set_row(self, name: str, row: Optional[str]) -> None:
+        """Replaces the row for name, or adds it in order if there isn't one. None takes it out."""
+        row_start = f'{self.ROW_START}{html.escape(name)}"'
+        with self._lock:
+            try:
+                with open(self._page_filename, "r", encoding = "utf-8") as page:
+                    lines = page.read().split("\n")
+            except FileNotFoundError:
+                lines = self._empty_page.split("\n")
+            rows_end = next((index for index, line in enumerate(lines) if line.strip() == self.ROWS_END), None)
+            if rows_end is None:
+                # Someone's been editing it. Start again, it's only an index.
+                lines = self._empty_page.split("\n")
+                rows_end = next(index for index, line in enumerate(lines) if line.strip() == self.ROWS_END)
+            position = rows_end
+            for index, line in enumerate(lines[:rows_end]):
+                stripped = line.lstrip()
+                if stripped.startswith(row_start):
+                    del lines[index]
+                    position = index
+                    break
+                if stripped.startswith(self.ROW_START) and position == rows_end and stripped[len(self.ROW_START):] > row_start[len(self.ROW_START):]:
+                    position = index  # First row that sorts after this one (unless this one's already further down)
+            if row is not None:
+                lines.insert(position, row)
+            temp_filename = self._page_filename + ".tmp"
+            with open(temp_filename, "w", encoding = "utf-8") as page:
+                page.write("\n".join(lines))
+            os.replace(temp_filename, self._page_filename)
+
+@dataclass
+class WatchSession:
+    """One go at watching a folder, from starting to stopping"""
+    folder: str
+    output_folder: str
+    index: WatchIndex
+    page: JobFolderPage
+    pool: ThreadPoolExecutor  # Renders reports. Reading the settings happens on the main thread.
+    pending: deque[WatchedJob] = field(default_factory = deque)  # Changed jobs waiting to be read
+    in_flight: set[str] = field(default_factory = set)  # Names of jobs being rendered
@@ -5,6 +5,36 @@
 # https://github.com/5axes/CuraHtmlDoc/
 #--------------------------------------------------------------------------------------------------
 # Version history (Reborn edition)
+# v1.3.0:
+#   - Search box now uses an index generated at export time instead of digging through every row on every keystroke. It waits for you to stop typing, too.
+#   - You can now search by setting values, not just names.
+#   - Optional "lazy" page format which embeds the settings as data and only builds each category's table when it's opened (and long ones a bit at a time). Static is still the default because it prints properly.
+#   - Rows for reports and comparisons are now built as SettingRow objects first so both page formats get exactly the same rows.
+#   - JSON (nested or flat) and CSV exports of the settings, with raw and formatted values, states and tree depth. Written as they go instead of all at once at the end.
+#   - Can also write any of those next to every HTML export from the same capture (htmlsettingsexport/data_formats preference).
+#   - Report and comparison rows are now made by one SettingRowRenderer which remembers escaped labels, tooltips and classes instead of working them out again for every cell. 2-3x as many rows a second (see benchmarks/row_rendering.py).
+#   - benchmarks/export_benchmark.py times each stage of an export (capture, compare, assemble, minify, whole thing) against made up machines from 600 to 5000 settings and 1 to 16 extruders, and complains if something got slower than the saved baseline.
+#   - Exports now log how long each part took (reading the stacks, each category, thumbnail, comparing, rendering, minifying, writing) along with getProperty calls and output sizes. Can also go in a comment at the end of the page, or you can get a full cProfile dump.
+#   - Loads faster when Cura starts. All Cura loads now is the menu and the preferences (ExportMenu.py). This file, and everything only an export needs (difflib, webbrowser, the Qt dialog, snapshots, Cura's setting translations, etc.), waits until you use the menu, or until something that was left running when Cura closed (automatic export, a watched folder, the report server) needs it. Startup cost went from ~14 ms to under 1 ms on my machine, and benchmarks/import_time.py fails if anything export-only gets loaded at startup again.
+#   - Automatic export is back, but it stays out of the way this time. It waits a few seconds after a slice finishes (so five re-slices in a row is one export), grabs the settings, then does the slow part on another thread. If nothing changed since the last time it wrote that job's report, it doesn't write it again.
+#   - Every export has a fingerprint of its settings (in a <meta name="settings-fingerprint"> tag if anything else wants to use it). Exporting exactly the same thing over the top of a report that hasn't been touched since now leaves the file alone instead of rewriting it and opening another tab. Turn off htmlsettingsexport/skip_unchanged if you actually want that.
+#   - Optional archive (htmlsettingsexport/archive) that keeps every capture in a little SQLite database, with each value and setting name only stored once. Where each setting sat in the tree and what it was called is kept once per machine and language, so old jobs come back exactly as they were captured whatever's been archived since (benchmarks/fleet_report.py checks). "Compare archived jobs..." lets you search it (like "infill_sparse_density > 30, support_structure = tree, since 2025-07-01") and compare any two matches, or one of them with what you've got now.
+#   - Each export now gets its own ExportContext with everything it needs read from Cura up front, instead of leaving bits of itself lying around on the extension. Exports can be made on any thread, and a manual export doesn't have to wait for an automatic one to finish any more.
+#   - Stopped changing Python's locale for the whole of Cura just to get the date (Qt knows the system's date format without any of that).
+#   - Optional (htmlsettingsexport/collapse_extruders) single cell across all the extruders for settings which are the same on every one of them, so on a 5 extruder toolchanger you only get 5 cells where there's actually something different. Comparisons do it for each profile separately. Search and filters don't care either way.
+#   - "Compare active profile against..." compares with any custom profile, quality level or intent without switching to it. It reads the settings from copies of the stacks with that profile swapped in, which Cura never finds out about, so nothing gets re-sliced (twice).
+#   - Optional compact markup (htmlsettingsexport/compact_markup) for static pages. Rows go on one line with no tabs, the depth goes in data-depth and CSS draws the ►s, and the state tooltips are one CSS rule per class instead of a title on every cell. Rows are about a third of the size (see the end of benchmarks/export_benchmark.py).
+#   - Can watch a folder (htmlsettingsexport/watch_folder) for G-code and 3MF files and write a report for each one, with an index page. Only files whose size or time changed get read, only ones whose settings changed get a new report, and it picks up where it left off after a restart. Settings get read on the main thread one job at a time, and the reports are rendered by a couple of worker threads.
+#   - "Fleet report from archived jobs..." shows every setting a few hundred archived jobs don't all agree on, with how many values it has, the most common one, min/max and which jobs are different. It's built one setting at a time as a matrix of value codes (jobs as columns), so only the distinct values and the odd ones out get kept. About 3.5 s for 300 jobs * 2000 settings * 2 extruders (benchmarks/fleet_report.py).
+#   - "Compare with the most similar archived job..." turns every archived job into a NumPy row (number settings scaled 0-1 across the archive, enums and bools one-hot) and finds the closest ones to the current settings with one matrix * vector, then compares with the one you pick. The matrix gets kept until the archive has different jobs in it (benchmarks/profile_similarity.py).
+#   - benchmarks/memory_budget.py runs capture, compare and rendering under tracemalloc and fails if peak memory for any of them, CategorySettings left alive, or page bytes (per page and per row, report and compare, minified and not) go over benchmarks/budgets.json. Turns out minifying on its own is more like 25-30% smaller than 45%, so that's what the budget holds it to.
+#   - Each category's rendered (and minified) bit of the page gets kept for next time, keyed by a hash of its settings plus the language, extruders, mode and formatting options. Export the same job again after changing the infill and only the infill gets rendered. Least recently used ones go once they add up to 16 MB. A re-export of 2000 settings * 4 extruders went from ~4.4 s to ~0.7 s, mostly because minifying was most of it (benchmarks/fragment_cache.py).
+#   - "Compare with project file..." compares a 3MF project with the current settings without opening it. Just the stack and profile files get read out of the zip (never the meshes) and turned into detached stacks like the watched folder does, so nothing in the scene changes and it takes the same time whatever size the models are.
+#   - "Toggle report server" serves reports over HTTP (just http.server, nothing to install) from the latest capture, the stored comparison profile or the archive, with /compare?a=&b= for comparing any two. Pages get made when they're asked for and the last 64 MB of them are kept gzipped, keyed by a fingerprint made from what's already known about the page (the archive keeps every job's settings fingerprint, the page options are just preferences). Browsers get that as an ETag, so asking again for something that hasn't changed gets a 304 without anything being loaded from the archive, compared or rendered. Localhost only unless you say otherwise.
+#   - "Export changed settings only" only reads the settings in the stacks' user changes (plus the parents they hang off, found by walking up their definitions) instead of everything. Usually around 10x quicker to capture with a realistic number of changes on a big machine (benchmarks/changed_capture.py), and pages are a fraction of the size.
+#   - Comparisons sort out which differences are actually differences. The value relations in the machine's definition get turned into a graph of what's worked out from what (once per definition, it's kept for next time), and any difference that follows from another one through it gets marked as an effect of that one, with a tooltip saying which. The root causes are in bold, listed together in a "What changed what" section at the top, and there's a button to hide everything that just followed along. Anything you set by hand is never an effect of anything. Comparisons on the report server get them too, from the graph for whichever machine's active in Cura. Turn it off with htmlsettingsexport/root_causes (benchmarks/root_causes.py).
+#   - Captures keep what every label and translated value was before it got translated (and where its translation lives), so one capture can be made into pages in any language. htmlsettingsexport/languages lists other languages to make every export in too, each translated from the same capture and made one after another after the page in Cura's language. That's one capture instead of one capture (and a restart) per language, not faster rendering: threads just took turns, since rendering's all Python. The plugin's own strings follow whatever language the page being made on that thread is in, so the report server can make pages in different languages on its threads at once. Enum options never actually got translated before because their translation context was missing its spaces, that's fixed too (benchmarks/languages.py).
+#   - BatchRender.py renders lots of reports at once across a pool of processes (threads just take turns, rendering's all Python), for things like remaking the whole archive after a template change. Each report goes to its worker as a snapshot: the capture as zlib'd JSON with each string in it once, about a quarter of the size of pickling it. Workers render, minify and write, and results come back in the same order with reports per second at the end. Snapshots get read from whatever they come from (a generator over the archive, say) only a few per worker ahead, so a big batch never has to fit in memory. It's for scripts, since packaged Cura can't start Python processes (benchmarks/batch_render.py).
 # v1.2.2:
 #   - Messed around with CSS rules to fix display problems when filtering and searching (that's literally it, this note is the only change in the .py file).
 # v1.2.1:
@@ -57,46 +87,109 @@
 #   - Made "show/hide user changed settings" button useful in that it toggles showing **only** user changes.
 #   - Now uses Python standard library functions to both check for a web browser and open the page in it instead of an unholy mix of Python and Qt.
 
-import configparser  # The script lists are stored in metadata as serialised config files.
+import copy
 import datetime
-import difflib
+import hashlib
 import html
-import locale
+import json
 import os
 import re
-import webbrowser
+import threading
+import time
 
-from dataclasses import InitVar, dataclass, field
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import InitVar, dataclass, field, replace
 from datetime import datetime
 from enum import Enum, auto
-from typing import Any, Optional
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from cura.CuraApplication import CuraApplication
 from cura.CuraVersion import CuraVersion
-from cura.Snapshot import Snapshot
 from cura.Utils.Threading import call_on_qt_thread
-from PyQt6.QtCore import QBuffer
-from PyQt6.QtWidgets import QFileDialog
-from UM.Extension import Extension
 from UM.i18n import i18nCatalog
 from UM.Logger import Logger
 from UM.Message import Message
-from UM.Qt.Duration import DurationFormat
-from UM.Resources import Resources
-from UM.Settings.ContainerStack import ContainerStack
-from UM.Settings.InstanceContainer import InstanceContainer
-from UM.Settings.Models.SettingPreferenceVisibilityHandler import \
-    SettingPreferenceVisibilityHandler
 
-i18n_cura_catalog = i18nCatalog("cura")
-i18n_printer_catalog = i18nCatalog("fdmprinter.def.json")
-i18n_extruder_catalog = i18nCatalog("fdmextruder.def.json")
+from .ExportMenu import ExportPreferences
+
+# Everything else (the Qt bits, snapshots, difflib, etc.) gets imported where it's used.
+# Cura loads this at startup and most sessions never export anything, so why make them wait for it?
+
+# The language the page being made on this thread is in. None is whatever Cura's set to.
+# Each thread gets its own, so the report server's threads (and the watched folder's) can each be making a page in a different language.
+_page_language: ContextVar[Optional[str]] = ContextVar("page_language", default = None)
+
+# Cura's setting translations are big, so they're only loaded the first time something needs translating (in each language)
+_catalogs: dict[tuple[str, Optional[str]], i18nCatalog] = {}
+
+def get_catalog(name: str, language: Optional[str] = None) -> i18nCatalog:
+    """Gets (and loads, if it's the first time) a translation catalog in a language (None for Cura's)"""
+    loaded_catalog = _catalogs.get((name, language))
+    if loaded_catalog is None:
+        loaded_catalog = _catalogs[(name, language)] = i18nCatalog(name) if language is None else i18nCatalog(name, language)
+    return loaded_catalog
+
+@contextmanager
+def page_language(language: Optional[str]) -> Iterator[None]:
+    """Everything translated on this thread inside the with block comes out in language (None for Cura's)"""
+    token = _page_language.set(language)
+    try:
+        yield
+    finally:
+        _page_language.reset(token)
+
+class PageCatalog:
+    """The plugin's own translations, in the language of whatever page is being made on this thread
+    (or Cura's when there isn't one). Otherwise it's just an i18nCatalog."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def i18nc(self, context: str, text: str, *args) -> str:
+        return get_catalog(self.name, _page_language.get()).i18nc(context, text, *args)
+
+    def hasTranslationLoaded(self) -> bool:
+        return get_catalog(self.name, _page_language.get()).hasTranslationLoaded()
+
+@dataclass(frozen = True, slots = True)
+class SourceText:
+    """Text from a capture the way it was before it was translated, and where to find its translations.
+    Captures keep these so a page can be made from them in any language, not just the one Cura was in."""
+    catalog_name: str
+    context: str
+    text: str
+    suffix: str = ""  # Units and the like, which don't get translated
+
+    def translate(self, language: Optional[str] = None) -> str:
+        return get_catalog(self.catalog_name, language).i18nc(self.context, self.text) + self.suffix
+
+# Every capture has the same labels and options in it, so they all share one of each instead of making thousands more every time
+_source_texts: dict[SourceText, SourceText] = {}
+
+def get_source_text(catalog_name: str, context: str, text: str, suffix: str = "") -> SourceText:
+    """A SourceText, and the same one every time it's for the same thing"""
+    source_text = SourceText(catalog_name, context, text, suffix)
+    return _source_texts.setdefault(source_text, source_text)
 
 class ExportMode(Enum):
     """More stuffup-proof than just using a string literal"""
     REPORT = auto()
     COMPARE = auto()
 
+class ExportResult(Enum):
+    """How an export went"""
+    WRITTEN = auto()
+    UNCHANGED = auto()  # Already had exactly this at that path so it wasn't written again
+    FAILED = auto()
+
+class PageFormat(Enum):
+    """How the settings tables are put in the page"""
+    STATIC = auto()
+    LAZY = auto()
+
 class CssClasses(Enum):
     """It occurred to me I was using CSS classes as magic strings"""
     def __init__(self, full_name: str, abbr_name: str):  # Runs for each item in Enum
@@ -127,6 +220,11 @@ class CssClasses(Enum):
     THUMBNAIL = ("--thumbnail--", "__u")
     TWO_COLUMN_LEFT = ("--two-column-left--", "__v")
     TWO_COLUMN_RIGHT = ("--two-column-right--", "__w")
+    LAZY_PLACEHOLDER = ("--lazy-placeholder--", "__ai")
+    LAZY_SENTINEL = ("--lazy-sentinel--", "__aj")
+    ALL_EXTRUDERS = ("--all-extruders--", "__ak")
+    COMPARE_CAUSE = ("--compare-cause--", "__al")
+    COMPARE_EFFECT = ("--compare-effect--", "__am")
 
     # These ones only referenced in template files
     HEADER_CONTENT_WRAPPER = ("--header-content-wrapper--", "__x")
@@ -155,6 +253,8 @@ class CategorySetting:
     label: str = ""
     key: str = ""
     value: list[str] = field(default_factory = list)
+    # Straight from the stack before any formatting, for the data exports
+    raw_value: list[Any] = field(default_factory = list)
     setting_type: str = ""
     css_class: list[str] = field(default_factory = list)
     # Keep separate from CSS so I can track things like disabled separately to errors
@@ -163,6 +263,10 @@ class CategorySetting:
     children: dict[Optional[dict[str,"CategorySetting"]]] = field(default_factory = dict)
     skip: bool = False
     extruders: int = 1
+    # The label and any values that got translated, before they were (so pages can be made in other languages).
+    # Values that didn't get translated (like numbers) are None, and so is the whole thing if none of them were.
+    label_source: Optional[SourceText] = None
+    value_source: Optional[list[Optional[SourceText]]] = None
 
     extruder_count: InitVar[int] = 1
 
@@ -170,50 +274,59 @@ class CategorySetting:
         """Pre-populate lists so no pesky IndexErrors crop up"""
         self.extruders = extruder_count
         self.value = [""] * extruder_count
+        self.raw_value = [None] * extruder_count
         self.css_class = [""] * extruder_count
         self.error_class = [""] * extruder_count
 
+    def set_value_source(self, extruder: int, source: SourceText) -> None:
+        if self.value_source is None:
+            self.value_source = [None] * self.extruders
+        self.value_source[extruder] = source
+
+    def localised(self, language: str) -> "CategorySetting":
+        """A copy (children and all) with the label and values in another language. Anything without a source stays as it is."""
+        localised_setting = copy.copy(self)
+        if self.label_source is not None:
+            localised_setting.label = self.label_source.translate(language)
+        if self.value_source is not None:
+            localised_setting.value = [source.translate(language) if source is not None else value for value, source in zip(self.value, self.value_source)]
+        if self.children:
+            localised_setting.children = {key: child.localised(language) if child is not None else None for key, child in self.children.items()}
+        return localised_setting
+
     def internal_representation(self) -> str:
         """Format a string to be used for the HTML <title> attribute as a tooltip"""
         return f"{self.key}: {self.setting_type}"
 
-    def make_td_no_children(self, cell_indent: int = 0) -> list[str]:
-        """Makes a <td> cell for each extruder for this setting (no recursion)"""
-
-        td_lines = []
+    def fingerprint_details(self) -> list[Any]:
+        """Everything about this setting (not its children) that ends up in an export"""
+        return [self.key, self.label, self.setting_type, self.child_level, self.skip,
+                self.value, self.raw_value, self.css_class, self.error_class]
 
-        cell_class = []
-        cell_tooltip = []
-        for i, value in enumerate(self.value):
-            if self.skip:
-                value = ""
-                self.error_class[i] = ""
-                self.css_class[i] = ""
-                cell_class.append("")
-            else:
-                if self.error_class[i]:
-                    cell_class.append(self.error_class[i])
-                elif self.css_class[i]:
-                    cell_class.append(self.css_class[i])
-                else:
-                    cell_class.append("")
-            # Set tooltip based on class
-            cell_tooltip.append(HTMLSettingsExportReborn.css_class_to_human_readable(cell_class[i]))
-            display_value = html.escape(value.replace("<br>", "\n")).replace("\n", "<br>")  # For when you want a safely escaped value which is subsequently unescaped.
-            td_lines.append(indent(f'<td class="{(cell_class[i] + " " + CssClasses.SETTING_VALUE.full) if cell_class[i] else CssClasses.SETTING_VALUE.full}" title="{html.escape(cell_tooltip[i])}">{display_value}</td>', cell_indent))
-        return td_lines
+    def add_to_fingerprint(self, fingerprint) -> None:
+        """Adds everything about this setting (and its children) that ends up in an export to a hashlib hash"""
+        fingerprint.update(fingerprint_json(self.fingerprint_details()))
+        for child in self.children.values():
+            if child is not None:
+                child.add_to_fingerprint(fingerprint)
 
 @dataclass
 class BlankSetting(CategorySetting):
     """Holds a blank setting to use when comparing items.
     It does however need the correct number of extruders."""
 
-    def make_td_no_children(self, cell_indent: int = 0) -> list[str]:
-        """We're a blank so return empty cells"""
-        td_lines = []
-        for _ in range(self.extruders):
-            td_lines.append(indent(f'<td class="{CssClasses.SETTING_VALUE.full}"></td>', cell_indent))
-        return td_lines
+@dataclass
+class SettingRow:
+    """One row of a settings table, ready to be turned into either HTML or page data"""
+    key: str
+    label: str
+    tooltip: str  # For the label cell
+    child_level: int
+    row_class: str  # Everything that goes in the <tr>'s class attribute
+    # (value, CSS class, tooltip) for each value cell. Values use <br> for new lines.
+    cells: list[tuple[str, str, Optional[str]]] = field(default_factory = list)
+    # How many extruder columns each cell covers. Empty if they're all just the one.
+    spans: list[int] = field(default_factory = list)
 
 @dataclass
 class SettingProfile:
@@ -222,6 +335,8 @@ class SettingProfile:
     settings: dict[str, list[CategorySetting]] = field(default_factory = dict)
     # Map Cura's internal key to translated labels
     settings_labels: dict[str, str] = field(default_factory = dict)
+    # The same labels before they were translated
+    settings_labels_source: dict[str, SourceText] = field(default_factory = dict)
     profile_name: str = ""
     preset_name: str = ""
     printer_name: str = ""
@@ -229,6 +344,52 @@ class SettingProfile:
     global_changed_settings: list[Any] = field(default_factory = list)
     extruder_changed_settings: list[list[Any]] = field(default_factory = list)
     visible_settings: list[Any] = field(default_factory = list)
+    # Only the changed settings (and the parents they hang off) were captured, and categories without any left out
+    changed_only: bool = False
+    _fingerprint: Optional[str] = field(default = None, init = False, repr = False, compare = False)
+    _category_fingerprints: dict[str, str] = field(default_factory = dict, init = False, repr = False, compare = False)
+
+    def fingerprint(self) -> str:
+        """Hash of everything captured that ends up in an export. Same settings, same fingerprint, no matter
+        when they were captured or which Cura session (or computer) did it."""
+        # Visible and changed settings aren't in here directly, but they're already in each setting's classes
+        if self._fingerprint is None:
+            fingerprint = hashlib.sha256()
+            fingerprint.update(fingerprint_json([self.profile_name, self.preset_name, self.printer_name, self.extruder_count]))
+            if self.changed_only:  # Only when it is, so full captures keep the fingerprints they've always had
+                fingerprint.update(fingerprint_json(["changed only"]))
+            for category, category_settings in self.settings.items():
+                fingerprint.update(fingerprint_json([category, self.settings_labels.get(category, "")]))
+                for setting in category_settings:
+                    if setting is not None:
+                        setting.add_to_fingerprint(fingerprint)
+            self._fingerprint = fingerprint.hexdigest()
+        return self._fingerprint
+
+    def category_fingerprint(self, category: str) -> str:
+        """Same idea as fingerprint(), but just one category. If it's the same, so is that category's part of the page."""
+        category_fingerprint = self._category_fingerprints.get(category)
+        if category_fingerprint is None:
+            fingerprint = hashlib.sha256()
+            fingerprint.update(fingerprint_json([category, self.settings_labels.get(category, ""), self.extruder_count]))
+            for setting in self.settings.get(category, []):
+                if setting is not None:
+                    setting.add_to_fingerprint(fingerprint)
+            category_fingerprint = self._category_fingerprints[category] = fingerprint.hexdigest()
+        return category_fingerprint
+
+    def localised(self, language: str) -> "SettingProfile":
+        """A copy with all the labels and values that can be translated in another language.
+        Just looks things up in catalogs, so it's fine on any thread."""
+        localised_profile = copy.copy(self)
+        localised_profile.settings = {category: [setting.localised(language) if setting is not None else None for setting in category_settings]
+                                      for category, category_settings in self.settings.items()}
+        localised_profile.settings_labels = {category: self.settings_labels_source[category].translate(language) if category in self.settings_labels_source else label
+                                             for category, label in self.settings_labels.items()}
+        # Different labels, different fingerprints
+        localised_profile._fingerprint = None
+        localised_profile._category_fingerprints = {}
+        return localised_profile
 
     def get_flattened_category_dict(self, category: list | dict) -> dict[str, Any]:
         flattened_dict = {}
@@ -283,6 +444,8 @@ class CompareProfiles:
     def __init__(self, profile_a: SettingProfile, profile_b: SettingProfile):
         self.profile_a = profile_a
         self.profile_b = profile_b
+        # SettingDependencies.RootCauses, if something's worked out which differences caused which
+        self.root_causes = None
 
         # Get number of extruders (required for blank settings)
         self.extruders_a = profile_a.extruder_count
@@ -319,8 +482,9 @@ class CompareProfiles:
         # In theory I just made sure both profiles have all categories so hopefully it doesn't raise an exception.
         for category, category_setting_keys in self.category_keys.items():
             #try:
-            current_category_a = self.profile_a_settings.get(category, {})
-            current_category_b = self.profile_b_settings.get(category, {})
+            # setdefault so the blanks stay put when a whole category's only in one profile (like a changed settings only capture)
+            current_category_a = self.profile_a_settings.setdefault(category, {})
+            current_category_b = self.profile_b_settings.setdefault(category, {})
             #except KeyError as e:
             #    Logger.logException("w", f"CompareProfiles.()__init__() did not find category {category} in both settings dictionaries: {e}")
             #   continue
@@ -359,6 +523,7 @@ class CompareProfiles:
         """
         Aligns two lists, inserting placeholders for missing items to maintain relative order.
         """
+        import difflib  # Only comparisons need it
         matcher = difflib.SequenceMatcher(None, list_a, list_b)
         aligned_a = []
         aligned_b = []
@@ -409,63 +574,66 @@ class CompareProfiles:
                 raise ValueError(f"CompareProfiles.combine_aligned_lists found falsy values in both lists at index {i}")
         return combined_list
 
-    def make_setting_row(self, category, setting_key, base_indent: int = 0) -> str:
-        """Has the label and settings from both profiles """
-        setting_row: list[str] = []
-        cell_tooltip: str = ""
-        label_a: str = ""
-        label_b: str = ""
-        child_level: int = -1
-        row_css_classes = []
-
-        setting_a: CategorySetting = self.profile_a_settings[category][setting_key]
-        setting_b: CategorySetting = self.profile_b_settings[category][setting_key]
-
-        # *Theoretically* the internal representation and child level should be
-        # the same if they both exist, so might as well take it from profile A.
-        if not isinstance(setting_a, BlankSetting):
-            label_a = setting_a.label
-            row_css_classes.extend(setting_a.css_class)
-            cell_tooltip = setting_a.internal_representation()
-            child_level = setting_a.child_level
-        if not isinstance(setting_b, BlankSetting):
-            label_b = setting_b.label
-            row_css_classes.extend(setting_b.css_class)
-            if cell_tooltip == "":
-                cell_tooltip = setting_b.internal_representation()
-            if child_level == -1:
-                child_level = setting_b.child_level
-
-        # Skip this if they're both blank
-        if isinstance(setting_a, BlankSetting) and isinstance(setting_b, BlankSetting) \
-            or setting_a.skip and setting_b.skip:
-            return ""
-
-        label: str = ""
-        if label_a == label_b:
-            label = label_a
-        elif label_a and not label_b:
-            label = label_a
-        elif label_b and not label_a:
-            label = label_b
-        else:
-            # They both exist but they're not the same. Did you change language on me between profiles? Profile A wins.
-            label = label_a
-
-        # Figure out if they're different
+    @staticmethod
+    def settings_differ(setting_a: CategorySetting, setting_b: CategorySetting) -> Optional[bool]:
+        """Whether a setting's values are different between the profiles, or None if it doesn't get a row at all"""
+        if isinstance(setting_a, BlankSetting) and isinstance(setting_b, BlankSetting) or setting_a.skip and setting_b.skip:
+            return None
         min_extruders = min(len(setting_a.value), len(setting_b.value))
-        different = setting_a.value[:min_extruders] != setting_b.value[:min_extruders]
-
-        row_css_class = HTMLSettingsExportReborn.get_css_row_class(row_css_classes)
-        setting_row.append(indent(f'<tr class="{CssClasses.SETTING_ROW.full}{(" " + row_css_class) if row_css_class else ""}{(" " + CssClasses.COMPARE_DIFFERENT.full) if different else ""}">', base_indent))
-        child_prefix = HTMLSettingsExportReborn.CHILD_SPACER * child_level
-        label = html.escape(label).replace("\n", "<br>")
-        setting_row.append(indent(f'<td title="{html.escape(cell_tooltip)}" class="{CssClasses.SETTING_LABEL.full}">{child_prefix}{label}</td>', base_indent + 1))
-
-        setting_row.extend(setting_a.make_td_no_children(base_indent + 1))
-        setting_row.extend(setting_b.make_td_no_children(base_indent + 1))
-        setting_row.append(indent("</tr>", base_indent))
-        return "\n".join(setting_row)
+        return setting_a.value[:min_extruders] != setting_b.value[:min_extruders]
+
+    def find_root_causes(self, dependency_graph) -> None:
+        """Works out which differences follow from which (see SettingDependencies) for the page to show"""
+        differing_keys: list[str] = []
+        changed_keys: set[str] = set()
+        known_keys: set[str] = set()
+        labels: dict[str, str] = {}
+        for category, category_setting_keys in self.category_keys.items():
+            settings_a = self.profile_a_settings[category]
+            settings_b = self.profile_b_settings[category]
+            for key in category_setting_keys:
+                setting_a, setting_b = settings_a[key], settings_b[key]
+                known_keys.add(key)
+                labels[key] = setting_a.label or setting_b.label
+                if self.settings_differ(setting_a, setting_b):
+                    differing_keys.append(key)
+                if CssClasses.SETTING_LOCAL.full in setting_a.css_class or CssClasses.SETTING_LOCAL.full in setting_b.css_class:
+                    changed_keys.add(key)
+        self.root_causes = dependency_graph.find_root_causes(differing_keys, changed_keys, known_keys, labels)
+
+    def localised(self, language: str) -> "CompareProfiles":
+        """The same comparison between both profiles in another language"""
+        localised_compare = CompareProfiles(self.profile_a.localised(language), self.profile_b.localised(language))
+        if self.root_causes is not None:
+            labels = {}
+            for category, category_setting_keys in localised_compare.category_keys.items():
+                for key in category_setting_keys:
+                    labels[key] = localised_compare.profile_a_settings[category][key].label or localised_compare.profile_b_settings[category][key].label
+            localised_compare.root_causes = replace(self.root_causes, labels = {key: labels.get(key, label) for key, label in self.root_causes.labels.items()})
+        return localised_compare
+
+    def fingerprint(self) -> str:
+        """Hash of both profiles (in order, since A vs B isn't the same page as B vs A)"""
+        compare_details = ["compare", self.profile_a.fingerprint(), self.profile_b.fingerprint()]
+        if self.root_causes is not None:
+            compare_details.append([self.root_causes.roots, self.root_causes.causes])
+        return hashlib.sha256(fingerprint_json(compare_details)).hexdigest()
+
+    def category_fingerprint(self, category: str) -> str:
+        """Hash of one category's rows: both sides of every setting in it, blanks and all, in the order they line up"""
+        fingerprint = hashlib.sha256()
+        fingerprint.update(fingerprint_json(["compare", category, self.profile_a.settings_labels.get(category, ""), self.extruders_a, self.extruders_b]))
+        settings_a = self.profile_a_settings.get(category, {})
+        settings_b = self.profile_b_settings.get(category, {})
+        # The flattened settings have every child in there already, so no add_to_fingerprint() here
+        for key in self.category_keys.get(category, []):
+            for setting in (settings_a.get(key), settings_b.get(key)):
+                fingerprint.update(fingerprint_json([isinstance(setting, BlankSetting), setting.fingerprint_details() if setting is not None else None]))
+            if self.root_causes is not None:
+                # Causes are named in effects' tooltips, so a root's label is part of them too
+                fingerprint.update(fingerprint_json([self.root_causes.fingerprint_details(key),
+                                                     [self.root_causes.label(root) for root in self.root_causes.causes.get(key, ())]]))
+        return fingerprint.hexdigest()
 
     def make_th_cells(self, base_indent: int = 0) -> str:
         """Make <th> cells for profile A/B, extruder #"""
@@ -482,7 +650,8 @@ class CompareProfiles:
 #    os.path.join(os.path.abspath(os.path.dirname(__file__)),'resources')
 #)  # Plugin translation file import
 
-catalog = i18nCatalog("htmlsettingsexport")
+PLUGIN_CATALOG_NAME: str = "htmlsettingsexport"
+catalog = PageCatalog(PLUGIN_CATALOG_NAME)
 
 if catalog.hasTranslationLoaded():
     Logger.log("i", "HTML Settings Export translation loaded")
@@ -490,7 +659,684 @@ if catalog.hasTranslationLoaded():
 def indent(string: str, level: int = 0) -> str:
     return f'{chr(9) * level}{string}'  # Heresy in plugin code. Space savings in HTML.
 
-class HTMLSettingsExportReborn(Extension):
+def css_string(text: str) -> str:
+    """text as a quoted CSS string (for content:) that's also safe inside a <style> element"""
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\A ").replace("<", "\\3C ")
+    return f'"{escaped}"'
+
+def fingerprint_json(item: Any) -> bytes:
+    """Turns something into the same bytes every time, for hashing"""
+    # Raw values can be anything the stack felt like. Some things' str() has a memory address in it so just use the type.
+    return json.dumps(item, ensure_ascii = True, sort_keys = True, separators = (",", ":"), default = lambda other: type(other).__name__).encode("ascii")
+
+def search_index_entry(label: str, key: str, values: list[str]) -> str:
+    """Makes the search index entry for a setting row.
+    Everything the search box looks at, lowercased in advance so the page doesn't have to do it on every keystroke."""
+    # Values use <br> for new lines but nobody is going to search for that
+    value_text = "\t".join(value.replace("<br>", " ") for value in values)
+    return f"{label}\n{key}\n{value_text}".lower()
+
+def make_search_index_script(entries: list[str]) -> str:
+    """Embeds the search index as JSON (one entry per setting row, in row order) for the search box to use."""
+    index_json = json.dumps(entries, ensure_ascii = False, separators = (",", ":"))
+    index_json = index_json.replace("</", "<\\/")  # Make sure nothing in a value can close the <script> early
+    return f'<script type="application/json" id="search_index">{index_json}</script>'
+
+class LazyPageData:
+    """Collects setting rows as compact data for pages which build their tables when they're opened.
+    Rows are [child level, label, tooltip, row style, [values], [cell styles]] where styles index into
+    a shared list of [CSS class, tooltip] so they only appear in the page once.
+    Rows with cells covering more than one extruder have [column spans] on the end as well."""
+
+    def __init__(self):
+        self._styles: dict[tuple[str, Optional[str]], int] = {}
+        self.categories: list[list[list[Any]]] = []
+        # Classes the placeholder row of each category needs so the filters know what's in it before it's built
+        self._category_local: list[bool] = []
+        self._category_different: list[bool] = []
+        self._category_all_effects: list[bool] = []  # Every difference in it follows from another one
+        self._category_all_disabled: list[bool] = []
+
+    def _get_style(self, css_class: str, tooltip: Optional[str] = None) -> int:
+        style = (css_class, tooltip)
+        if style not in self._styles:
+            self._styles[style] = len(self._styles)
+        return self._styles[style]
+
+    def add_category(self) -> int:
+        """Starts a new category and returns its index"""
+        self.categories.append([])
+        self._category_local.append(False)
+        self._category_different.append(False)
+        self._category_all_effects.append(True)
+        self._category_all_disabled.append(True)
+        return len(self.categories) - 1
+
+    def add_row(self, setting_row: SettingRow) -> None:
+        """Adds a row to the most recently added category"""
+        self.categories[-1].append([
+            setting_row.child_level,
+            setting_row.label,
+            setting_row.tooltip,
+            self._get_style(setting_row.row_class),
+            [value.replace("<br>", "\n") for value, _, _ in setting_row.cells],
+            [self._get_style(cell_class, cell_tooltip) for _, cell_class, cell_tooltip in setting_row.cells],
+        ])
+        if setting_row.spans:
+            self.categories[-1][-1].append(setting_row.spans)
+        row_classes = setting_row.row_class.split()
+        if CssClasses.SETTING_LOCAL.full in row_classes or CssClasses.SOME_LOCAL.full in row_classes:
+            self._category_local[-1] = True
+        if CssClasses.COMPARE_DIFFERENT.full in row_classes:
+            self._category_different[-1] = True
+            if CssClasses.COMPARE_EFFECT.full not in row_classes:
+                self._category_all_effects[-1] = False
+        if CssClasses.SETTING_DISABLED.full not in row_classes:
+            self._category_all_disabled[-1] = False
+
+    def make_placeholder_row(self, category_index: int) -> str:
+        """Makes the hidden row which stands in for a category's rows until they're all built"""
+        if not self.categories[category_index]:
+            return ""
+        placeholder_classes = [CssClasses.LAZY_PLACEHOLDER.full]
+        if self._category_local[category_index]:
+            placeholder_classes.append(CssClasses.SETTING_LOCAL.full)
+        if self._category_different[category_index]:
+            placeholder_classes.append(CssClasses.COMPARE_DIFFERENT.full)
+            if self._category_all_effects[category_index]:
+                placeholder_classes.append(CssClasses.COMPARE_EFFECT.full)
+        if self._category_all_disabled[category_index]:
+            placeholder_classes.append(CssClasses.SETTING_DISABLED.full)
+        return f'<tr class="{" ".join(placeholder_classes)}" hidden></tr>'
+
+    def make_script(self) -> str:
+        """Embeds the page data as JSON for the lazy rendering script to use"""
+        page_data = {
+            "styles": [list(style) for style in self._styles],  # Dicts keep insertion order so this lines up with the indexes
+            "categories": self.categories,
+        }
+        page_json = json.dumps(page_data, ensure_ascii = False, separators = (",", ":"))
+        page_json = page_json.replace("</", "<\\/")  # Make sure nothing in a value can close the <script> early
+        return f'<script type="application/json" id="page_data">{page_json}</script>'
+
+
+@dataclass(frozen = True)
+class CategoryFragment:
+    """One category's bit of a page, ready to go back in the next page that has exactly the same category"""
+    html: str  # Header, rows and footer (or a placeholder instead of rows for lazy pages), minified if the page is
+    search_entries: tuple[str, ...]
+    compact_depths: frozenset[int] = frozenset()
+    lazy_rows: tuple[SettingRow, ...] = ()  # Lazy pages' rows go in the page data, not the HTML
+    size: int = 0  # Roughly how many bytes it's holding on to
+
+class FragmentCache:
+    """Rendered categories from recent exports, so re-exporting a job where you only changed the infill only renders the infill.
+    Least recently used ones go first once they add up to more than max_bytes."""
+
+    MAX_BYTES: int = 16 * 1024 * 1024  # A few pages' worth of a big multi-extruder machine
+    ROW_OVERHEAD: int = 200  # A guess at what a lazy page's SettingRow costs before its strings
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._fragments: OrderedDict[tuple, CategoryFragment] = OrderedDict()
+        self._lock = threading.Lock()  # Automatic exports render on another thread
+
+    @classmethod
+    def make_fragment(cls, fragment_html: str, search_entries: list[str], compact_depths: set[int], lazy_rows: list[SettingRow]) -> CategoryFragment:
+        size = len(fragment_html) + sum(len(entry) for entry in search_entries)
+        size += sum(cls.ROW_OVERHEAD + len(row.label) + len(row.tooltip) + sum(len(value) for value, _, _ in row.cells) for row in lazy_rows)
+        return CategoryFragment(html = fragment_html, search_entries = tuple(search_entries), compact_depths = frozenset(compact_depths),
+                                lazy_rows = tuple(lazy_rows), size = size)
+
+    def get(self, cache_key: tuple) -> Optional[CategoryFragment]:
+        with self._lock:
+            fragment = self._fragments.get(cache_key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._fragments.move_to_end(cache_key)
+            self.hits += 1
+            return fragment
+
+    def put(self, cache_key: tuple, fragment: CategoryFragment) -> None:
+        if fragment.size > self.max_bytes:
+            return  # It'd only push everything else out and then go itself
+        with self._lock:
+            previous = self._fragments.pop(cache_key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            self._fragments[cache_key] = fragment
+            self.total_bytes += fragment.size
+            while self.total_bytes > self.max_bytes:
+                _, oldest = self._fragments.popitem(last = False)
+                self.total_bytes -= oldest.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fragments.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+
+class SettingRowRenderer:
+    """Turns captured settings into SettingRows and SettingRows into HTML, for reports and comparisons alike.
+    There are thousands of cells but only a handful of different classes and tooltips, so it remembers
+    everything it works out instead of working it out again for every cell."""
+
+    # Values get cached too, but there's no limit to how many different ones there can be over time
+    VALUE_CACHE_LIMIT: int = 20000
+
+    def __init__(self):
+        self._row_states: dict[tuple[str, ...], str] = {}
+        self._row_classes: dict[tuple[tuple[str, ...], bool, str], str] = {}
+        self._class_tooltips: dict[str, str] = {}
+        self._cell_classes: dict[str, str] = {}
+        self._title_attributes: dict[Optional[str], str] = {}
+        self._labels: dict[tuple[str, str], str] = {}
+        self._label_tooltips: dict[str, str] = {}
+        self._display_values: dict[str, str] = {}
+        self._child_prefixes: dict[int, str] = {}
+        self._indents: dict[int, str] = {}
+        self._all_extruders_classes: dict[str, str] = {}
+        self._all_extruders_tooltips: dict[tuple[Optional[str], int], Optional[str]] = {}
+        self._compact_class_attributes: dict[str, str] = {}
+        self._compact_tooltip_rules: Optional[str] = None
+
+    def _row_state(self, state_classes: tuple[str, ...]) -> str:
+        """The one class that sums up all a row's cells"""
+        row_state = self._row_states.get(state_classes)
+        if row_state is None:
+            row_state = self._row_states[state_classes] = HTMLSettingsExportReborn.get_css_row_class(list(state_classes))
+        return row_state
+
+    def _row_class(self, state_classes: tuple[str, ...], different: bool = False, dependency_class: str = "") -> str:
+        """Everything that goes in a <tr>'s class attribute"""
+        cache_key = (state_classes, different, dependency_class)
+        row_class = self._row_classes.get(cache_key)
+        if row_class is None:
+            row_css_class = self._row_state(state_classes)
+            row_class = f'{CssClasses.SETTING_ROW.full}{(" " + row_css_class) if row_css_class else ""}{(" " + CssClasses.COMPARE_DIFFERENT.full) if different else ""}'
+            if dependency_class:
+                row_class += " " + dependency_class
+            self._row_classes[cache_key] = row_class
+        return row_class
+
+    def _class_tooltip(self, css_class: str) -> str:
+        tooltip = self._class_tooltips.get(css_class)
+        if tooltip is None:
+            tooltip = HTMLSettingsExportReborn.css_class_to_human_readable(css_class)
+            self._class_tooltips[css_class] = tooltip
+        return tooltip
+
+    def _cell_class(self, state_class: str) -> str:
+        """Everything that goes in a value <td>'s class attribute"""
+        cell_class = self._cell_classes.get(state_class)
+        if cell_class is None:
+            cell_class = f"{state_class} {CssClasses.SETTING_VALUE.full}" if state_class else CssClasses.SETTING_VALUE.full
+            self._cell_classes[state_class] = cell_class
+        return cell_class
+
+    def _setting_cells(self, setting: CategorySetting, fallback_class: str = "") -> list[tuple[str, str, Optional[str]]]:
+        """(value, CSS class, tooltip) for each extruder's value cell.
+        The tooltip comes from fallback_class if the cell doesn't have a class of its own."""
+        if isinstance(setting, BlankSetting):
+            # No tooltips for blanks
+            return [("", CssClasses.SETTING_VALUE.full, None)] * setting.extruders
+        if setting.skip:
+            return [("", CssClasses.SETTING_VALUE.full, self._class_tooltip(fallback_class))] * setting.extruders
+        cells = []
+        for value, css_class, error_class in zip(setting.value, setting.css_class, setting.error_class):
+            state_class = error_class or css_class
+            cells.append((value, self._cell_class(state_class), self._class_tooltip(state_class or fallback_class)))
+        return cells
+
+    def _collapse_cells(self, cells: list[tuple[str, str, Optional[str]]]) -> tuple[list[tuple[str, str, Optional[str]]], list[int]]:
+        """One cell across every extruder if they're all exactly the same, otherwise the cells as they were.
+        Also returns how many columns each cell covers."""
+        if len(cells) < 2 or cells.count(cells[0]) != len(cells):
+            return cells, [1] * len(cells)
+        value, cell_class, cell_tooltip = cells[0]
+        all_extruders_class = self._all_extruders_classes.get(cell_class)
+        if all_extruders_class is None:
+            all_extruders_class = self._all_extruders_classes[cell_class] = f"{cell_class} {CssClasses.ALL_EXTRUDERS.full}"
+        tooltip_key = (cell_tooltip, len(cells))
+        if tooltip_key not in self._all_extruders_tooltips:
+            all_extruders_tooltip = None  # Blanks don't get tooltips, and there's nothing interesting about all of them being blank
+            if cell_tooltip is not None:
+                all_extruders_tooltip = catalog.i18nc("@tooltip:all_extruders", "Same on all {0} extruders").format(len(cells))
+                if cell_tooltip:
+                    all_extruders_tooltip = cell_tooltip + "\n" + all_extruders_tooltip
+            self._all_extruders_tooltips[tooltip_key] = all_extruders_tooltip
+        return [(value, all_extruders_class, self._all_extruders_tooltips[tooltip_key])], [len(cells)]
+
+    def make_report_rows(self, setting: CategorySetting, collapse_extruders: bool = False) -> list[SettingRow]:
+        """The row for a setting followed by the rows for all its children.
+        With collapse_extruders, settings which are the same on every extruder get one cell across all of them."""
+        setting_rows: list[SettingRow] = []
+        self._add_report_rows(setting, setting_rows, collapse_extruders)
+        return setting_rows
+
+    def _add_report_rows(self, setting: CategorySetting, setting_rows: list[SettingRow], collapse_extruders: bool) -> None:
+        if setting.skip:
+            return
+        state_classes = tuple(setting.css_class)
+        # Tooltips for cells without a class of their own come from the row
+        cells = self._setting_cells(setting, self._row_state(state_classes))
+        spans: list[int] = []
+        if collapse_extruders:
+            cells, spans = self._collapse_cells(cells)
+        setting_rows.append(SettingRow(
+            key = setting.key,
+            label = setting.label,
+            tooltip = setting.internal_representation(),
+            child_level = setting.child_level,
+            row_class = self._row_class(state_classes),
+            cells = cells,
+            spans = spans if len(cells) < setting.extruders else [],
+        ))
+        for child in setting.children.values():
+            if child is not None:  # Shouldn't be None, but in case it is
+                self._add_report_rows(child, setting_rows, collapse_extruders)
+
+    def make_compare_row(self, compare: "CompareProfiles", category: str, setting_key: str, collapse_extruders: bool = False) -> Optional[SettingRow]:
+        """Has the label and settings from both profiles, or None if there's nothing to show.
+        With collapse_extruders, each profile's cells get collapsed into one if they're the same on all its extruders."""
+        setting_a: CategorySetting = compare.profile_a_settings[category][setting_key]
+        setting_b: CategorySetting = compare.profile_b_settings[category][setting_key]
+        blank_a = isinstance(setting_a, BlankSetting)
+        blank_b = isinstance(setting_b, BlankSetting)
+
+        # Skip this if they're both blank
+        different = compare.settings_differ(setting_a, setting_b)
+        if different is None:
+            return None
+
+        cell_tooltip: str = ""
+        label_a: str = ""
+        label_b: str = ""
+        child_level: int = -1
+        row_css_classes: list[str] = []
+        # *Theoretically* the internal representation and child level should be
+        # the same if they both exist, so might as well take it from profile A.
+        if not blank_a:
+            label_a = setting_a.label
+            row_css_classes.extend(setting_a.css_class)
+            cell_tooltip = setting_a.internal_representation()
+            child_level = setting_a.child_level
+        if not blank_b:
+            label_b = setting_b.label
+            row_css_classes.extend(setting_b.css_class)
+            if cell_tooltip == "":
+                cell_tooltip = setting_b.internal_representation()
+            if child_level == -1:
+                child_level = setting_b.child_level
+
+        # If they both exist but they're not the same, did you change language on me between profiles? Profile A wins.
+        label: str = label_a if label_a else label_b
+
+        # Roots that other differences follow from stand out, and the ones that follow say what from
+        dependency_class = ""
+        root_causes = compare.root_causes
+        if different and root_causes is not None:
+            if root_causes.roots.get(setting_key):
+                dependency_class = CssClasses.COMPARE_CAUSE.full
+            elif setting_key in root_causes.causes:
+                dependency_class = CssClasses.COMPARE_EFFECT.full
+                cause_labels = ", ".join(root_causes.label(root) for root in root_causes.causes[setting_key])
+                cell_tooltip += "\n" + catalog.i18nc("@tooltip:follows_from", "Follows from {0}").format(cause_labels)
+
+        cells_a = self._setting_cells(setting_a)
+        cells_b = self._setting_cells(setting_b)
+        spans: list[int] = []
+        if collapse_extruders:
+            cells_a, spans_a = self._collapse_cells(cells_a)
+            cells_b, spans_b = self._collapse_cells(cells_b)
+            if len(cells_a) + len(cells_b) < setting_a.extruders + setting_b.extruders:
+                spans = spans_a + spans_b
+
+        return SettingRow(
+            key = setting_key,
+            label = label,
+            tooltip = cell_tooltip,
+            child_level = child_level,
+            row_class = self._row_class(tuple(row_css_classes), different, dependency_class),
+            cells = cells_a + cells_b,
+            spans = spans,
+        )
+
+    def _indent(self, level: int) -> str:
+        tabs = self._indents.get(level)
+        if tabs is None:
+            tabs = self._indents[level] = chr(9) * level
+        return tabs
+
+    def _title_attribute(self, tooltip: Optional[str]) -> str:
+        title = self._title_attributes.get(tooltip)
+        if title is None:
+            title = f' title="{html.escape(tooltip)}"' if tooltip is not None else ""
+            self._title_attributes[tooltip] = title
+        return title
+
+    def _label_html(self, key: str, label: str) -> str:
+        label_html = self._labels.get((key, label))
+        if label_html is None:
+            label_html = html.escape(label).replace("\n", "<br>")
+            self._labels[(key, label)] = label_html
+        return label_html
+
+    def _label_tooltip(self, tooltip: str) -> str:
+        tooltip_html = self._label_tooltips.get(tooltip)
+        if tooltip_html is None:
+            tooltip_html = self._label_tooltips[tooltip] = html.escape(tooltip)
+        return tooltip_html
+
+    def _display_value(self, value: str) -> str:
+        display_value = self._display_values.get(value)
+        if display_value is None:
+            # For when you want a safely escaped value which is subsequently unescaped.
+            display_value = html.escape(value.replace("<br>", "\n")).replace("\n", "<br>")
+            if len(self._display_values) >= self.VALUE_CACHE_LIMIT:
+                self._display_values.clear()
+            self._display_values[value] = display_value
+        return display_value
+
+    def _child_prefix(self, child_level: int) -> str:
+        child_prefix = self._child_prefixes.get(child_level)
+        if child_prefix is None:
+            child_prefix = self._child_prefixes[child_level] = HTMLSettingsExportReborn.CHILD_SPACER * child_level
+        return child_prefix
+
+    def make_row_html(self, setting_row: SettingRow, base_indent: int = 0) -> str:
+        """Turns a SettingRow into a <tr> with a label cell and a cell per value"""
+        row_indent = self._indent(base_indent)
+        cell_indent = self._indent(base_indent + 1)
+        row_html_lines: list[str] = [
+            f'{row_indent}<tr class="{setting_row.row_class}">',
+            f'{cell_indent}<td title="{self._label_tooltip(setting_row.tooltip)}" class="{CssClasses.SETTING_LABEL.full}">{self._child_prefix(setting_row.child_level)}{self._label_html(setting_row.key, setting_row.label)}</td>'
+        ]
+        if setting_row.spans:
+            for (value, cell_class, cell_tooltip), span in zip(setting_row.cells, setting_row.spans):
+                colspan = f' colspan="{span}"' if span > 1 else ""
+                row_html_lines.append(f'{cell_indent}<td class="{cell_class}"{colspan}{self._title_attribute(cell_tooltip)}>{self._display_value(value)}</td>')
+        else:
+            for value, cell_class, cell_tooltip in setting_row.cells:
+                row_html_lines.append(f'{cell_indent}<td class="{cell_class}"{self._title_attribute(cell_tooltip)}>{self._display_value(value)}</td>')
+        row_html_lines.append(f'{row_indent}</tr>')
+        return "\n".join(row_html_lines)
+
+    def _compact_class_attribute(self, cell_class: str) -> str:
+        """Just the state part of a value cell's classes. Everything else is worked out from where the cell is."""
+        class_attribute = self._compact_class_attributes.get(cell_class)
+        if class_attribute is None:
+            state_classes = [css_class for css_class in cell_class.split() if css_class not in (CssClasses.SETTING_VALUE.full, CssClasses.ALL_EXTRUDERS.full)]
+            class_attribute = f' class="{" ".join(state_classes)}"' if state_classes else ""
+            self._compact_class_attributes[cell_class] = class_attribute
+        return class_attribute
+
+    def make_compact_row_html(self, setting_row: SettingRow) -> str:
+        """Same row as make_row_html, on one line with nothing that can come from CSS instead.
+        Depth goes in data-depth and cells' state tooltips come from make_compact_style()'s rules."""
+        depth = f' data-depth="{setting_row.child_level}"' if setting_row.child_level > 0 else ""
+        row_html: list[str] = [f'<tr class="{setting_row.row_class}"{depth}><td title="{self._label_tooltip(setting_row.tooltip)}">{self._label_html(setting_row.key, setting_row.label)}</td>']
+        for (value, cell_class, _), span in zip(setting_row.cells, setting_row.spans or repeat(1)):
+            colspan = f' colspan="{span}"' if span > 1 else ""
+            row_html.append(f'<td{self._compact_class_attribute(cell_class)}{colspan}>{self._display_value(value)}</td>')
+        row_html.append('</tr>')
+        return "".join(row_html)
+
+    def make_compact_style(self, depths: Iterable[int]) -> str:
+        """The rules compact rows need which can't go in a template: one for each depth used, and the
+        (translated) tooltip for each state, which used to be a title on every cell."""
+        if self._compact_tooltip_rules is None:
+            all_extruders_before, _, all_extruders_after = catalog.i18nc("@tooltip:all_extruders", "Same on all {0} extruders").partition("{0}")
+            all_extruders = f'{css_string(all_extruders_before)} attr(colspan) {css_string(all_extruders_after)}'
+            tooltip_rules: list[str] = [f'td[colspan]:hover::after{{content:{all_extruders}}}']
+            state_classes = (CssClasses.SETTING_LOCAL, CssClasses.SETTING_HIDDEN, CssClasses.SETTING_DISABLED, CssClasses.ERROR_WARNING, CssClasses.ERROR_ERROR)
+            for state_class in state_classes:
+                tooltip = self._class_tooltip(state_class.full)
+                if not tooltip:
+                    continue
+                # Cells with a state of their own, then cells without one in a row that has one (like the title used to do)
+                selectors = [f'td.{state_class.full}']
+                if state_class not in (CssClasses.ERROR_WARNING, CssClasses.ERROR_ERROR):  # Rows don't get those
+                    selectors.append(f'tr.{state_class.full}>td+td:not([class])')
+                for selector in selectors:
+                    tooltip_rules.append(f'{selector}:hover::after{{content:{css_string(tooltip)}}}')
+                    tooltip_rules.append(f'{selector}[colspan]:hover::after{{content:{css_string(tooltip + chr(10))} {all_extruders}}}')
+            self._compact_tooltip_rules = "\n".join(tooltip_rules)
+        depth_rules = [f'tr[data-depth="{depth}"]>td:first-child::before{{content:"{"►" * depth}"}}' for depth in sorted(depths) if depth > 0]
+        return "<style>\n" + "\n".join(depth_rules + [self._compact_tooltip_rules]) + "\n</style>"
+
+@dataclass
+class ExportPhase:
+    """What one part of an export cost. Time and getProperty calls don't include phases started inside this one."""
+    name: str
+    seconds: float = 0.0
+    property_calls: int = 0
+    output_bytes: Optional[int] = None  # Only for phases which make something worth measuring
+
+class PropertyCallCounter:
+    """Stands in for a container stack and counts the getProperty calls made on it.
+    Everything else goes straight through to the real stack."""
+    def __init__(self, stack, export_timer: "ExportTimer"):
+        self._stack = stack
+        self._export_timer = export_timer
+
+    def getProperty(self, key: str, property_name: str) -> Any:
+        self._export_timer.property_calls += 1
+        return self._stack.getProperty(key, property_name)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stack, name)
+
+class ExportTimer:
+    """Keeps track of where the time goes during an export, so "it's slow" comes with numbers attached"""
+    def __init__(self):
+        self.phases: dict[str, ExportPhase] = {}
+        self.property_calls: int = 0
+        self._started = time.perf_counter()
+        # [seconds, getProperty calls] used by phases started inside each phase that's currently running
+        self._nested_costs: list[list[float | int]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[ExportPhase]:
+        """Times everything in the with block as the named phase (adding to it if it's been used before)"""
+        export_phase = self.phases.setdefault(name, ExportPhase(name))
+        self._nested_costs.append([0.0, 0])
+        start_time = time.perf_counter()
+        start_calls = self.property_calls
+        try:
+            yield export_phase
+        finally:
+            seconds = time.perf_counter() - start_time
+            property_calls = self.property_calls - start_calls
+            nested_seconds, nested_calls = self._nested_costs.pop()
+            export_phase.seconds += seconds - nested_seconds
+            export_phase.property_calls += property_calls - nested_calls
+            if self._nested_costs:
+                self._nested_costs[-1][0] += seconds
+                self._nested_costs[-1][1] += property_calls
+
+    def count_property_calls(self, stack) -> PropertyCallCounter:
+        return PropertyCallCounter(stack, self)
+
+    def set_output_size(self, name: str, output: str | bytes | int) -> None:
+        if isinstance(output, str):
+            output = len(output.encode("utf-8"))
+        elif isinstance(output, bytes):
+            output = len(output)
+        self.phases.setdefault(name, ExportPhase(name)).output_bytes = output
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    def summary(self) -> str:
+        """A little table of every phase for the log"""
+        name_width = max((len(name) for name in self.phases), default = 0) + 2
+        summary_lines = [f"HTML settings export took {self.total_seconds * 1000:.1f} ms and {self.property_calls} getProperty calls:"]
+        for export_phase in self.phases.values():
+            summary_line = f"  {export_phase.name:<{name_width}}{export_phase.seconds * 1000:9.1f} ms{export_phase.property_calls:9} getProperty"
+            if export_phase.output_bytes is not None:
+                summary_line += f"{export_phase.output_bytes:12} bytes"
+            summary_lines.append(summary_line)
+        return "\n".join(summary_lines)
+
+class ExportIndex:
+    """Remembers the fingerprint of what was last written to each report, so the same thing doesn't get
+    written over itself (and then uploaded again by whatever's syncing the folder).
+    Stored as {fingerprint: {path: [size, modified time in ns]}} so it can tell if someone's changed the file since."""
+
+    MAX_REPORTS: int = 500  # Oldest ones get forgotten first
+
+    def __init__(self, index_filename: str):
+        self._index_filename = index_filename
+        self._reports: Optional[dict[str, dict[str, list[int]]]] = None  # Loaded the first time it's needed
+        self._lock = threading.Lock()  # Exports finishing on different threads all record here
+
+    @staticmethod
+    def _normalise_path(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def _file_stat(path: str) -> Optional[list[int]]:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        return [stat_result.st_size, stat_result.st_mtime_ns]
+
+    def _load(self) -> dict[str, dict[str, list[int]]]:
+        if self._reports is None:
+            self._reports = {}
+            try:
+                with open(self._index_filename, "r", encoding = "utf-8") as index_file:
+                    reports = json.load(index_file)
+                if isinstance(reports, dict):
+                    self._reports = reports
+            except FileNotFoundError:
+                pass  # First export
+            except Exception as e:
+                Logger.log("w", f"Couldn't read export index {self._index_filename}, starting a new one: {e}")
+        return self._reports
+
+    def is_current(self, fingerprint: str, path: str) -> bool:
+        """Whether the file at path is still exactly what was written there with this fingerprint"""
+        with self._lock:
+            file_stat = self._load().get(fingerprint, {}).get(self._normalise_path(path))
+        return file_stat is not None and file_stat == self._file_stat(path)
+
+    def record(self, fingerprint: str, path: str) -> None:
+        """Remembers that this fingerprint was just written to path"""
+        path = self._normalise_path(path)
+        file_stat = self._file_stat(path)
+        if file_stat is None:
+            return
+        with self._lock:
+            reports = self._load()
+            for fingerprint_paths in reports.values():
+                fingerprint_paths.pop(path, None)  # Whatever was there before isn't any more
+            fingerprint_paths = reports.pop(fingerprint, {})
+            fingerprint_paths[path] = file_stat
+            reports[fingerprint] = fingerprint_paths  # Dicts keep insertion order so the newest are at the end
+            for old_fingerprint in [old_fingerprint for old_fingerprint, old_paths in reports.items() if not old_paths]:
+                del reports[old_fingerprint]
+            while sum(len(paths) for paths in reports.values()) > self.MAX_REPORTS:
+                del reports[next(iter(reports))]
+            self._save()
+
+    def _save(self) -> None:
+        temp_filename = self._index_filename + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self._index_filename), exist_ok = True)
+            with open(temp_filename, "w", encoding = "utf-8") as index_file:
+                json.dump(self._reports, index_file)
+            os.replace(temp_filename, self._index_filename)  # So a crash halfway through doesn't leave half an index
+        except Exception as e:
+            Logger.logException("w", f"Couldn't save export index {self._index_filename}: {e}")
+
+@dataclass(frozen = True)
+class ReportDetails:
+    """Everything about the print (rather than the settings) that goes at the top of a report.
+    Read from Cura on the main thread so the page can be made on any thread."""
+    job_name: str
+    intent_category: str
+    date_time: str
+    material_weights: tuple[float, ...]
+    material_lengths: tuple[float, ...]
+    material_costs: tuple[float, ...]
+    currency: str
+    print_time: str
+    extruders_enabled: tuple[Any, ...]
+    extruder_materials: tuple[str, ...]
+    post_processing_scripts: Optional[str]
+    encoded_snapshot: str  # Blank if there isn't a thumbnail
+
+    def fingerprint_details(self) -> list[Any]:
+        """Everything but the date, since that changes every time"""
+        return [self.job_name, self.intent_category, list(self.material_weights), list(self.material_lengths), list(self.material_costs),
+                self.currency, self.print_time, list(self.extruders_enabled), list(self.extruder_materials), self.post_processing_scripts,
+                hashlib.sha256(self.encoded_snapshot.encode("ascii")).hexdigest()]
+
+@dataclass(frozen = True)
+class ExportContext:
+    """Everything one export needs, decided and captured before it starts. Making the page only looks at this,
+    never at the extension (or Cura), so any number of them can be made at once."""
+    export_mode: ExportMode
+    page_format: PageFormat
+    minify: bool
+    plugin_version: str
+    setting_profile: SettingProfile  # For comparisons, this is profile B
+    profile_compare: Optional[CompareProfiles] = None
+    report_details: Optional[ReportDetails] = None
+    collapse_extruders: bool = False  # One cell for settings that are the same on every extruder
+    compact_markup: bool = False  # Rows without anything CSS can do instead (static pages only)
+    language: Optional[str] = None  # What the page is made in. None is Cura's language (and the one the settings were captured in).
+    # The timer's the one thing in here that does change, but only this export ever touches it
+    export_timer: ExportTimer = field(default_factory = ExportTimer, compare = False)
+
+    @property
+    def data_source(self) -> SettingProfile | CompareProfiles:
+        """What the page (and any data files) are made from"""
+        return self.profile_compare if self.export_mode == ExportMode.COMPARE else self.setting_profile
+
+    def fingerprint(self) -> str:
+        """Fingerprint of the whole page: the settings plus everything else that goes in it (apart from the date)"""
+        # A new version of the plugin probably makes a different page from the same settings
+        page_details = [self.plugin_version, self.export_mode.name, self.page_format.name, self.collapse_extruders, self.compact_markup, self.data_source.fingerprint()]
+        if self.report_details is not None:
+            page_details.extend(self.report_details.fingerprint_details())
+        if self.language is not None:  # Only when there is one, so pages in Cura's language keep the fingerprints they've always had
+            page_details.append(self.language)
+        return hashlib.sha256(fingerprint_json(page_details)).hexdigest()
+
+    def localised(self, language: str, export_timer: Optional[ExportTimer] = None) -> "ExportContext":
+        """The same export in another language, with its own timer (a new one if there isn't one).
+        Fine on any thread, it never goes near Cura."""
+        export_timer = export_timer or ExportTimer()
+        if self.export_mode == ExportMode.COMPARE:
+            profile_compare = self.profile_compare.localised(language)
+            return replace(self, setting_profile = profile_compare.profile_b, profile_compare = profile_compare, language = language, export_timer = export_timer)
+        return replace(self, setting_profile = self.setting_profile.localised(language), language = language, export_timer = export_timer)
+
+def format_local_date_time() -> str:
+    """The date and time the way the system's locale likes them. Qt knows that without changing Python's locale
+    for the whole of Cura (which isn't thread safe, and isn't ours to change)."""
+    try:
+        from PyQt6.QtCore import QDateTime, QLocale
+        return QLocale.system().toString(QDateTime.currentDateTime(), QLocale.FormatType.ShortFormat)
+    except Exception as e:
+        Logger.log("w", f"Could not get system locale for date/time formatting: {e}. Using ISO format as fallback.")
+        return datetime.now().isoformat(sep = " ", timespec = "seconds")
+
+class HTMLSettingsExportReborn(ExportPreferences):
+    """Does all the actual work. ExportMenu.py makes one the first time the menu (or anything else) needs it,
+    so none of this gets loaded when Cura starts."""
 
     # "consts" for the placeholders in HTML where these strings are used.
     # (They're in the Python so they can be dynamically localised with i18n)
@@ -500,6 +1346,7 @@ class HTMLSettingsExportReborn(Extension):
     # enabled = doing its thing (so the text is to set things back to normal).
     HTML_REPLACEMENT_TITLE: str = "$$$TITLE$$$"
     HTML_REPLACEMENT_LANG: str = "$$$LANG$$$"
+    HTML_REPLACEMENT_SETTINGS_FINGERPRINT: str = "$$$SETTINGS_FINGERPRINT$$$"
     HTML_REPLACEMENT_TABLE_COLUMNS: str = "$$$TABLE_COLUMNS$$$"
     HTML_REPLACEMENT_DISABLED_SETTINGS_DEFAULT: str = "$$$DISABLED_SETTINGS_DEFAULT$$$"
     HTML_REPLACEMENT_DISABLED_SETTINGS_DISABLED: str = "$$$DISABLED_SETTINGS_DISABLED$$$"
@@ -513,6 +1360,10 @@ class HTMLSettingsExportReborn(Extension):
     HTML_REPLACEMENT_DIFFERENT_SETTINGS_DEFAULT: str = "$$$DIFFERENT_SETTINGS_DEFAULT$$$"
     HTML_REPLACEMENT_DIFFERENT_SETTINGS_DISABLED: str = "$$$DIFFERENT_SETTINGS_DISABLED$$$"
     HTML_REPLACEMENT_DIFFERENT_SETTINGS_ENABLED: str = "$$$DIFFERENT_SETTINGS_ENABLED$$$"
+    # The button's only there if there's anything for it to do, so the whole thing goes in after the rest
+    HTML_REPLACEMENT_EFFECT_SETTINGS_BUTTON: str = "$$$EFFECT_SETTINGS_BUTTON$$$"
+    HTML_REPLACEMENT_EFFECT_SETTINGS_DISABLED: str = "$$$EFFECT_SETTINGS_DISABLED$$$"
+    HTML_REPLACEMENT_EFFECT_SETTINGS_ENABLED: str = "$$$EFFECT_SETTINGS_ENABLED$$$"
     HTML_REPLACEMENT_PROJECT_TITLE: str = "$$$PROJECT_NAME$$$"
     HTML_REPLACEMENT_PROFILE_NAME: str = "$$$PROFILE_NAME$$$"
     HTML_REPLACEMENT_PROFILE_A: str = "$$$PROFILE_A$$$"
@@ -523,96 +1374,1047 @@ class HTMLSettingsExportReborn(Extension):
     HTML_REPLACEMENT_PRINTER_B_NAME: str = "$$$PRINTER_B_NAME$$$"
     HTML_REPLACEMENT_SEARCH_PLACEHOLDER: str = "$$$SEARCH_SETTINGS_PLACEHOLDER$$$"
     HTML_REPLACEMENT_CLEAR_SEARCH: str = "$$$CLEAR_SEARCH$$$"
+    # Watched folder index page
+    HTML_REPLACEMENT_JOB_FILE: str = "$$$JOB_FILE$$$"
+    HTML_REPLACEMENT_PROFILE: str = "$$$PROFILE$$$"
+    HTML_REPLACEMENT_PRINTER: str = "$$$PRINTER$$$"
+    HTML_REPLACEMENT_FINGERPRINT: str = "$$$FINGERPRINT$$$"
+    HTML_REPLACEMENT_UPDATED: str = "$$$UPDATED$$$"
+    # Fleet report page
+    HTML_REPLACEMENT_SUMMARY: str = "$$$SUMMARY$$$"
+    HTML_REPLACEMENT_SETTING: str = "$$$SETTING$$$"
+    HTML_REPLACEMENT_DISTINCT: str = "$$$DISTINCT$$$"
+    HTML_REPLACEMENT_MOST_COMMON: str = "$$$MOST_COMMON$$$"
+    HTML_REPLACEMENT_MIN: str = "$$$MIN$$$"
+    HTML_REPLACEMENT_MAX: str = "$$$MAX$$$"
+    HTML_REPLACEMENT_DIFFERENT_JOBS: str = "$$$DIFFERENT_JOBS$$$"
+    HTML_REPLACEMENT_JOBS: str = "$$$JOBS$$$"
+    HTML_REPLACEMENT_JOB: str = "$$$JOB$$$"
+    HTML_REPLACEMENT_CAPTURED: str = "$$$CAPTURED$$$"
+    # These get the rows themselves, which are already HTML, so they go in after the rest
+    HTML_REPLACEMENT_FLEET_ROWS: str = "$$$FLEET_ROWS$$$"
+    HTML_REPLACEMENT_FLEET_JOBS: str = "$$$FLEET_JOBS$$$"
+    # Report server index page (the options and rows are HTML too)
+    HTML_REPLACEMENT_COMPARE: str = "$$$COMPARE$$$"
+    HTML_REPLACEMENT_SERVER_OPTIONS: str = "$$$SERVER_OPTIONS$$$"
+    HTML_REPLACEMENT_SERVER_ROWS: str = "$$$SERVER_ROWS$$$"
 
     CHILD_SPACER = f'<div class="{CssClasses.CHILD_SPACER.full}">►</div>'
+
+    # What a language has to look like (it ends up in file names)
+    LANGUAGE_PATTERN: str = r"[A-Za-z]{2,3}(?:[_-][A-Za-z0-9]+)*"
+    # Most archived jobs that go in one fleet report. It'll cope with more, but nobody's reading a key that long.
+    FLEET_JOB_LIMIT: int = 2000
+    # How many of the closest archived jobs to offer when looking for the most similar one
+    SIMILAR_JOB_COUNT: int = 5
+    # How long to wait after a slice finishes in case another one's about to start (in milliseconds)
+    AUTO_EXPORT_DELAY: int = 3000
+    # How often to look for new jobs, and how soon to get to the next one when there's a queue (in milliseconds)
+    WATCH_INTERVAL: int = 10000
+    WATCH_BUSY_INTERVAL: int = 200
+    # Reports rendered at once. Reading settings needs the main thread so only the rendering goes here.
+    WATCH_WORKERS: int = 2
+    # Most archived jobs listed on the report server's index page (older ones still work if you know their number)
+    SERVER_INDEX_JOBS: int = 200
     
     def __init__(self):
-        super().__init__()
-
         self._application = CuraApplication.getInstance()
 
         self._preferences = self._application.getPreferences()
 
-        self._plugin_dir = os.path.dirname(__file__)
-
-        self._export_mode: ExportMode = ExportMode.REPORT
+        # Everything else about an export lives in its ExportContext
         self._compare_profile_a: SettingProfile = None
-        self._compare_profile_b: SettingProfile = None
-        self._profile_compare: CompareProfiles = None
+
+        self._init_page_rendering()
+
+        self._add_preferences()  # Already done by the menu in Cura, but not everything that makes one of these is Cura
+
+        # Only one automatic export at a time. Anything else can happen whenever it likes.
+        self._auto_export_lock = threading.Lock()
+
+        self._backend_state = None
+        self._auto_export_timer = None  # Made the first time it's needed
+        self._export_index: Optional[ExportIndex] = None  # Made the first time it's needed
+        self._plugin_version: Optional[str] = None
+        self._settings_archive = None  # Made the first time it's needed, so sqlite3 only gets loaded if it's used
+        self._similarity_index = None  # ProfileSimilarity.SimilarityIndex, until the archive has different jobs in it
+        self._dependency_graphs = {}  # SettingDependencies.DependencyGraph for each machine definition ID, they don't change while Cura's running
+        self._watch_session = None  # FolderWatch.WatchSession while a folder's being watched
+        self._watch_timer = None  # Made the first time it's needed
+        self._report_server = None  # ReportServer.ReportServer while it's running
+        # The last report capture, for the report server. Only ever replaced as a whole, so other threads always see a matching pair.
+        self._latest_capture: Optional[tuple[SettingProfile, ReportDetails]] = None
+
+    def _init_page_rendering(self) -> None:
+        """The bits of the exporter that making pages out of ExportContexts needs. None of them go anywhere near Cura."""
+        self._plugin_dir = os.path.dirname(__file__)
 
         self._minify_output = True
 
-        self._export_fail = False  # I catch so many exceptions I sometimes end up with blank files
+        self._row_renderers: dict[Optional[str], SettingRowRenderer] = {}  # One for each language, they remember translated tooltips
+        self._fragment_cache = FragmentCache()
 
-        # Set up menu item
-        self.setMenuName("HTML Settings Export")
-        self.addMenuItem(catalog.i18nc("@menu:export", "Export settings"), self._save_report_html)
-        self.addMenuItem("  ", lambda: None)
-        self.addMenuItem(catalog.i18nc("@menu:compare_first", "Store first profile for comparison"), self._save_profile_a)
-        self.addMenuItem(catalog.i18nc("@menu:make_comparison", "Export comparison with first profile"), self._save_compare_html)
+    @classmethod
+    def _make_page_renderer(cls) -> "HTMLSettingsExportReborn":
+        """An exporter that can only make pages (_assemble_html) and doesn't need Cura running to do it.
+        No preferences, no application. For processes that aren't Cura (see BatchRender.py)."""
+        page_renderer = cls.__new__(cls)
+        page_renderer._init_page_rendering()
+        return page_renderer
 
     def _save_profile_a(self):
-        self._compare_profile_a = self._get_setting_profile()
+        export_timer = ExportTimer()
+        try:
+            self._compare_profile_a = self._get_setting_profile(export_timer)
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return
         Message(catalog.i18nc("@message:saved_profile_a", "Profile stored for comparison"), title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn"), lifetime = 15).show()
 
     def _save_compare_html(self):
         if self._compare_profile_a is None:
             Message(catalog.i18nc("@message:no_profile_a", "Please store a profile first"), title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn")).show()
             return
-        self._compare_profile_b = self._get_setting_profile()
-        self._profile_compare = CompareProfiles(self._compare_profile_a, self._compare_profile_b)
-        self._export_mode = ExportMode.COMPARE
-        self._save_settings_html()
+        self._save_settings_html(ExportMode.COMPARE)
 
     def _save_report_html(self):
-        self._export_mode = ExportMode.REPORT
-        self._save_settings_html()
+        self._save_settings_html(ExportMode.REPORT)
+
+    def _save_changed_report_html(self):
+        self._save_settings_html(ExportMode.REPORT, changed_only = True)
 
-    def _save_settings_html(self):
+    def _save_other_profile_compare_html(self):
+        """Compares the active profile with another one, without Cura having to switch to it and back"""
+        from PyQt6.QtWidgets import QInputDialog
+
+        from .DetachedProfiles import available_profiles, make_detached_stacks
+        plugin_title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn")
+        profile_choices = available_profiles()
+        if not profile_choices:
+            Message(catalog.i18nc("@message:no_other_profiles", "There aren't any profiles to compare with for this printer's current configuration."), title = plugin_title).show()
+            return
+        choice_descriptions = [profile_choice.description() for profile_choice in profile_choices]
+        description, accepted = QInputDialog.getItem(None, plugin_title, catalog.i18nc("@dialog:other_profile", "Compare the active profile against:"), choice_descriptions, 0, False)
+        if not accepted:
+            return
+        export_timer = ExportTimer()
+        try:
+            with export_timer.phase("detach stacks"):
+                detached_stacks = make_detached_stacks(profile_choices[choice_descriptions.index(description)])
+            other_profile = self._get_setting_profile(export_timer, detached_stacks)
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return
+        Logger.log("d", export_timer.summary())
+        self._save_settings_html(ExportMode.COMPARE, (other_profile, None))
+
+    def _save_project_compare_html(self):
+        """Compares a 3MF project's settings (as profile A) with the current ones, without opening it.
+        Only the stack and profile files get read out of the zip, so a project full of huge meshes is no slower than an empty one,
+        and the scene never finds out."""
+        from PyQt6.QtWidgets import QFileDialog
+
+        from .DetachedProfiles import make_job_stacks
+        from .JobFiles import read_job_file
+        plugin_title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn")
+        project_filename, _ = QFileDialog.getOpenFileName(None, catalog.i18nc("@dialog:project_file", "Compare the current settings with project"),
+                                                          self._preferences.getValue("local_file/dialog_save_path") or "",
+                                                          catalog.i18nc("@dialog:project_filter", "Cura project (*.3mf)"))
+        if not project_filename:
+            Logger.log("d", "User cancelled choosing a project to compare with")
+            return
+        export_timer = ExportTimer()
+        try:
+            with export_timer.phase("read project"):
+                job_file = read_job_file(project_filename)
+        except (OSError, ValueError) as e:
+            Logger.log("w", f"Couldn't get settings from {project_filename}: {e}")
+            Message(catalog.i18nc("@message:project_read_failed", "Couldn't get any settings out of {0}. Was it saved by Cura as a project?").format(os.path.basename(project_filename)),
+                    title = plugin_title).show()
+            return
+        try:
+            with export_timer.phase("detach stacks"):
+                detached_stacks = make_job_stacks(job_file)
+            project_profile = self._get_setting_profile(export_timer, detached_stacks)
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return
+        Logger.log("d", export_timer.summary())
+        self._save_settings_html(ExportMode.COMPARE, (project_profile, None))
+
+    def _save_archive_compare_html(self):
+        """Asks which archived jobs to compare (or one against the current settings) and exports the comparison"""
+        from PyQt6.QtWidgets import QInputDialog
+        plugin_title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn")
+        if not self._get_bool_preference(self.PREFERENCE_ARCHIVE):
+            Message(catalog.i18nc("@message:archive_off", "The archive is turned off. Turn on htmlsettingsexport/archive and every export from then on will be kept in it."), title = plugin_title).show()
+            return
+        query_text, accepted = QInputDialog.getText(None, plugin_title, catalog.i18nc("@dialog:archive_query",
+            "Find archived jobs (e.g. infill_sparse_density > 30, support_structure = tree, since 2025-07-01).\nLeave blank for all of them."))
+        if not accepted:
+            return
+        from .SettingsArchive import ArchiveQuery
+        try:
+            archived_jobs = self._get_settings_archive().find_jobs(ArchiveQuery.parse(query_text), limit = 500)
+        except Exception as e:
+            Logger.logException("w", f"Couldn't search the settings archive for {query_text}: {e}")
+            Message(catalog.i18nc("@message:archive_query_failed", "Couldn't search the archive for that: {0}").format(e), title = plugin_title).show()
+            return
+        if not archived_jobs:
+            Message(catalog.i18nc("@message:archive_no_jobs", "No archived jobs match that."), title = plugin_title).show()
+            return
+
+        job_descriptions = [archived_job.description() for archived_job in archived_jobs]
+        description_a, accepted = QInputDialog.getItem(None, plugin_title, catalog.i18nc("@dialog:archive_job_a", "First job:"), job_descriptions, 0, False)
+        if not accepted:
+            return
+        current_settings = catalog.i18nc("@dialog:archive_current_settings", "Current settings")
+        description_b, accepted = QInputDialog.getItem(None, plugin_title, catalog.i18nc("@dialog:archive_job_b", "Compare it with:"), [current_settings, *job_descriptions], 0, False)
+        if not accepted:
+            return
+        try:
+            profile_a = self._get_settings_archive().load_profile(archived_jobs[job_descriptions.index(description_a)].job_id)
+            profile_b = None if description_b == current_settings else self._get_settings_archive().load_profile(archived_jobs[job_descriptions.index(description_b)].job_id)
+        except Exception as e:
+            Logger.logException("e", f"Couldn't load archived jobs to compare: {e}")
+            Message(catalog.i18nc("@message:archive_load_failed", "Couldn't load those jobs from the archive. Please check log file."), title = plugin_title).show()
+            return
+        self._save_settings_html(ExportMode.COMPARE, (profile_a, profile_b))
+
+    def _save_fleet_report_html(self):
+        """Asks which archived jobs to look at and exports every setting they don't all agree on, and who's disagreeing"""
+        from PyQt6.QtWidgets import QInputDialog
+        plugin_title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn")
+        if not self._get_bool_preference(self.PREFERENCE_ARCHIVE):
+            Message(catalog.i18nc("@message:archive_off", "The archive is turned off. Turn on htmlsettingsexport/archive and every export from then on will be kept in it."), title = plugin_title).show()
+            return
+        query_text, accepted = QInputDialog.getText(None, plugin_title, catalog.i18nc("@dialog:fleet_query",
+            "Which archived jobs go in the fleet report? (e.g. machine = Ender, since 2025-07-01)\nLeave blank for all of them."))
+        if not accepted:
+            return
+        from .SettingsArchive import ArchiveQuery
+        try:
+            archived_jobs = self._get_settings_archive().find_jobs(ArchiveQuery.parse(query_text), limit = self.FLEET_JOB_LIMIT)
+        except Exception as e:
+            Logger.logException("w", f"Couldn't search the settings archive for {query_text}: {e}")
+            Message(catalog.i18nc("@message:archive_query_failed", "Couldn't search the archive for that: {0}").format(e), title = plugin_title).show()
+            return
+        if len(archived_jobs) < 2:
+            Message(catalog.i18nc("@message:fleet_too_few", "A fleet report needs at least two archived jobs, and {0} matched that.").format(len(archived_jobs)), title = plugin_title).show()
+            return
+        output_filename = self._get_file_save_path(catalog.i18nc("@save:fleet_report", "fleet report") + ".html")
+        if not output_filename:
+            Logger.log("d", "User cancelled save for fleet report")
+            return
+
+        from .FleetReport import build_fleet_matrix, make_fleet_job_rows, make_fleet_rows
+        archived_jobs.reverse()  # Oldest first, so job numbers go up with time
+        export_timer = ExportTimer()
+        try:
+            with export_timer.phase("fleet matrix"):
+                fleet_matrix = build_fleet_matrix(self._get_settings_archive(), archived_jobs)
+            with export_timer.phase("render"):
+                page = self._load_file_with_replacements(os.path.join(self._plugin_dir, "html_fleet.html"), {
+                    self.HTML_REPLACEMENT_LANG: catalog.i18nc("@page:language", "en"),
+                    self.HTML_REPLACEMENT_TITLE: catalog.i18nc("@fleet:title", "Fleet report: {0} jobs").format(len(archived_jobs)),
+                    self.HTML_REPLACEMENT_SUMMARY: catalog.i18nc("@fleet:summary", "{0} settings differ between jobs. {1} are the same on every job and aren't shown.").format(
+                        len(fleet_matrix.rows), fleet_matrix.uniform_rows),
+                    self.HTML_REPLACEMENT_SETTING: catalog.i18nc("@setting:label", "Setting"),
+                    self.HTML_REPLACEMENT_DISTINCT: catalog.i18nc("@fleet:distinct", "Values"),
+                    self.HTML_REPLACEMENT_MOST_COMMON: catalog.i18nc("@fleet:most_common", "Most common"),
+                    self.HTML_REPLACEMENT_MIN: catalog.i18nc("@fleet:min", "Min"),
+                    self.HTML_REPLACEMENT_MAX: catalog.i18nc("@fleet:max", "Max"),
+                    self.HTML_REPLACEMENT_DIFFERENT_JOBS: catalog.i18nc("@fleet:different_jobs", "Jobs that are different"),
+                    self.HTML_REPLACEMENT_JOBS: catalog.i18nc("@fleet:jobs", "Jobs"),
+                    self.HTML_REPLACEMENT_JOB: catalog.i18nc("@fleet:job", "Job"),
+                    self.HTML_REPLACEMENT_PROFILE: catalog.i18nc("@label", "Profile"),
+                    self.HTML_REPLACEMENT_PRINTER: catalog.i18nc("@label", "Printer"),
+                    self.HTML_REPLACEMENT_CAPTURED: catalog.i18nc("@fleet:captured", "Captured"),
+                })
+                page = page.replace(self.HTML_REPLACEMENT_FLEET_ROWS, make_fleet_rows(fleet_matrix, 4, catalog.i18nc("@settings:extruder", "Extruder")))
+                page = page.replace(self.HTML_REPLACEMENT_FLEET_JOBS, make_fleet_job_rows(fleet_matrix, 4))
+            with export_timer.phase("write"):
+                with open(output_filename, "w", encoding = "utf-8") as output_file:
+                    output_file.write(page)
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return
+        Logger.log("d", export_timer.summary())
+        self._open_in_browser(output_filename)
+
+    def _save_similar_compare_html(self):
+        """Finds the archived jobs closest to the current settings and compares the current settings with one of them"""
+        from PyQt6.QtWidgets import QInputDialog
+        plugin_title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn")
+        if not self._get_bool_preference(self.PREFERENCE_ARCHIVE):
+            Message(catalog.i18nc("@message:archive_off", "The archive is turned off. Turn on htmlsettingsexport/archive and every export from then on will be kept in it."), title = plugin_title).show()
+            return
+        from .SettingsArchive import ArchiveQuery
+        export_timer = ExportTimer()
+        try:
+            current_profile = self._get_setting_profile(export_timer)
+            with export_timer.phase("find similar"):
+                archived_jobs = self._get_settings_archive().find_jobs(ArchiveQuery())
+                # Capturing just now put the current settings in the archive (or already had), and it's not much use being told they're the same as themselves
+                job_name = self._application.getPrintInformation().jobName
+                this_job = frozenset(archived_job.job_id for archived_job in archived_jobs
+                                     if archived_job.job_name == job_name and archived_job.fingerprint == current_profile.fingerprint())
+                similar_jobs = self._get_similarity_index(archived_jobs).nearest(current_profile, self.SIMILAR_JOB_COUNT, this_job)
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return
+        Logger.log("d", export_timer.summary())
+        if not similar_jobs:
+            Message(catalog.i18nc("@message:no_similar_jobs", "There aren't any other jobs in the archive to compare with yet."), title = plugin_title).show()
+            return
+
+        job_descriptions = [similar_job.description() for similar_job in similar_jobs]
+        description, accepted = QInputDialog.getItem(None, plugin_title, catalog.i18nc("@dialog:similar_job", "Most similar archived jobs (closest first). Compare the current settings with:"),
+                                                     job_descriptions, 0, False)
+        if not accepted:
+            return
+        try:
+            similar_profile = self._get_settings_archive().load_profile(similar_jobs[job_descriptions.index(description)].job.job_id)
+        except Exception as e:
+            Logger.logException("e", f"Couldn't load archived job to compare: {e}")
+            Message(catalog.i18nc("@message:archive_load_failed", "Couldn't load those jobs from the archive. Please check log file."), title = plugin_title).show()
+            return
+        self._save_settings_html(ExportMode.COMPARE, (similar_profile, current_profile))
+
+    def _find_root_causes(self, profile_compare: CompareProfiles, export_timer: ExportTimer) -> None:
+        """Works out which differences follow from which, using the active machine's definitions. Main thread only.
+        It's only extra information, so a comparison without it is better than no comparison."""
+        try:
+            with export_timer.phase("dependency graph"):
+                dependency_graph = self._get_dependency_graph()
+            with export_timer.phase("root causes"):
+                profile_compare.find_root_causes(dependency_graph)
+        except Exception as e:
+            Logger.logException("w", f"Couldn't work out which differences caused which: {e}")
+
+    def _get_dependency_graph(self):
+        """The dependency graph for the active machine's definition, built the first time it's needed"""
+        definition = self._application.getGlobalContainerStack().definition
+        dependency_graph = self._dependency_graphs.get(definition.getId())
+        if dependency_graph is None:
+            from .SettingDependencies import DependencyGraph
+            dependency_graph = self._dependency_graphs[definition.getId()] = DependencyGraph.from_definitions(definition.findDefinitions())
+        return dependency_graph
+
+    @call_on_qt_thread  # The definitions are Cura's, so they only get looked at on the main thread
+    def _get_served_dependency_graph(self):
+        """The active machine's definition ID and dependency graph, for the report server's threads.
+        None if there isn't one, the comparison just goes without root causes then."""
+        try:
+            return self._application.getGlobalContainerStack().definition.getId(), self._get_dependency_graph()
+        except Exception as e:
+            Logger.logException("w", f"Couldn't get the dependency graph for a served comparison: {e}")
+            return None
+
+    def _get_similarity_index(self, archived_jobs):
+        """Turning the archive into a matrix takes a few seconds, so it only gets done again when there are different jobs in it
+        (an old job being captured again only changes its time, not its settings)"""
+        from .ProfileSimilarity import SimilarityIndex
+        if self._similarity_index is None or self._similarity_index.job_ids != frozenset(archived_job.job_id for archived_job in archived_jobs):
+            self._similarity_index = SimilarityIndex.build(self._get_settings_archive(), archived_jobs)
+        return self._similarity_index
+
+    def _save_settings_html(self, export_mode: ExportMode, compare_profiles: Optional[tuple[SettingProfile, Optional[SettingProfile]]] = None, changed_only: bool = False):
         # output_filename = os.path.abspath(os.path.join(self._plugin_dir, "cura_settings.html"))
         output_filename = self._get_file_save_path(self._application.getPrintInformation().jobName + ".html")
         if not output_filename:
             # User cancelled save dialog
             Logger.log("d", "User cancelled save for HTML export")
             return
-        self._export_fail = False
-        
+        export_result = self._write_settings_html(output_filename, export_mode, compare_profiles, changed_only)
+        if export_result == ExportResult.FAILED:
+            return
+        if export_result == ExportResult.UNCHANGED:
+            # Not opening it again either, they've probably still got it open from last time
+            Message(catalog.i18nc("@message:export_unchanged", "Nothing has changed since {0} was saved, so it was left as it is.").format(os.path.basename(output_filename)),
+                    title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn"), lifetime = 15).show()
+            return
+        self._open_in_browser(output_filename)
+
+    def _open_in_browser(self, output_filename: str) -> None:
+        try:
+            import webbrowser  # Surprisingly heavy for something that's used once per export
+            webbrowser.open_new_tab(output_filename)
+        except Exception as e:
+            Message(title = catalog.i18nc("@plugin_name", "HTML Settings Export Reborn"),
+                    text = catalog.i18nc("@export_browser_fail", "Could not open a web browser to display output file.\nPlease navigate to where you saved the file and open it manually.")).show()
+            Logger.log("e", f"HTMLSettingsExportReborn could not open a web browser to display output file {output_filename}\n{e}")
+
+    def _write_settings_html(self, output_filename: str, export_mode: ExportMode, compare_profiles: Optional[tuple[SettingProfile, Optional[SettingProfile]]] = None,
+                             changed_only: bool = False) -> ExportResult:
+        """Captures the settings and writes the page (plus any data files) in the given mode,
+        unless the file's already got exactly that in it.
+        compare_profiles is for comparing something other than the stored first profile (like archived jobs).
+        If its second profile is None, that's the current settings.
+        changed_only only captures what's been changed (reports only)."""
+        export_timer = ExportTimer()
+        with self._profiling(output_filename):
+            try:
+                # Capture once and use it for the page and any data files that go with it
+                export_context = self._capture_export(export_mode, export_timer, compare_profiles, changed_only)
+                fingerprint = export_context.fingerprint()
+                if self._is_export_unchanged(fingerprint, output_filename):
+                    return ExportResult.UNCHANGED
+            except Exception as e:
+                self._export_failed(e, export_timer)
+                return ExportResult.FAILED
+            if not self._render_and_write(export_context, output_filename, fingerprint):
+                return ExportResult.FAILED
+            return ExportResult.WRITTEN
+
+    def _capture_export(self, export_mode: ExportMode, export_timer: ExportTimer, compare_profiles: Optional[tuple[SettingProfile, Optional[SettingProfile]]] = None,
+                        changed_only: bool = False) -> ExportContext:
+        """Reads everything an export needs from Cura. Call on the main thread, stacks don't like other threads."""
+        if export_mode == ExportMode.COMPARE:
+            profile_a, profile_b = compare_profiles or (self._compare_profile_a, None)
+            profile_b = profile_b or self._get_setting_profile(export_timer)
+            with export_timer.phase("compare alignment"):
+                profile_compare = CompareProfiles(profile_a, profile_b)
+            if self._get_bool_preference(self.PREFERENCE_ROOT_CAUSES):
+                self._find_root_causes(profile_compare, export_timer)
+            return self._new_export_context(export_mode, export_timer, profile_b, profile_compare = profile_compare)
+        setting_profile = self._get_setting_profile(export_timer, changed_only = changed_only)
+        report_details = self._get_report_details(export_timer)
+        self._latest_capture = (setting_profile, report_details)
+        return self._new_export_context(export_mode, export_timer, setting_profile, report_details = report_details)
+
+    def _new_export_context(self, export_mode: ExportMode, export_timer: ExportTimer, setting_profile: SettingProfile, **details) -> ExportContext:
+        """An ExportContext for settings that have already been captured, with the page options from the preferences"""
+        return ExportContext(export_mode = export_mode, setting_profile = setting_profile, export_timer = export_timer, **self._get_page_options(), **details)
+
+    def _get_page_options(self) -> dict[str, Any]:
+        """The parts of an ExportContext that come from the preferences (and the plugin) instead of what got captured"""
+        return dict(page_format = self._get_page_format(), minify = self._minify_output, plugin_version = self._get_plugin_version(),
+                    collapse_extruders = self._get_bool_preference(self.PREFERENCE_COLLAPSE_EXTRUDERS),
+                    compact_markup = self._get_bool_preference(self.PREFERENCE_COMPACT_MARKUP))
+
+    def _get_report_details(self, export_timer: ExportTimer) -> ReportDetails:
+        from UM.Qt.Duration import DurationFormat
+        print_information = self._application.getPrintInformation()
+        extruder_stacks = self._application.getExtruderManager().getActiveExtruderStacks()
+        return ReportDetails(
+            job_name = print_information.jobName,
+            intent_category = self._application.getMachineManager().activeIntentCategory,
+            date_time = format_local_date_time(),
+            material_weights = tuple(print_information.materialWeights),
+            material_lengths = tuple(print_information.materialLengths),
+            material_costs = tuple(print_information.materialCosts),
+            currency = str(self._preferences.getValue("cura/currency")),
+            print_time = print_information.currentPrintTime.getDisplayString(DurationFormat.Format.Long),
+            extruders_enabled = tuple(extruder.getMetaDataEntry("enabled") for extruder in extruder_stacks),
+            extruder_materials = tuple(extruder.material.getMetaData().get("material", "") for extruder in extruder_stacks),
+            post_processing_scripts = self._application.getGlobalContainerStack().getMetaDataEntry("post_processing_scripts"),
+            encoded_snapshot = self._get_encoded_thumbnail(export_timer) or "",
+        )
+
+    def _render_and_write(self, export_context: ExportContext, output_filename: str, fingerprint: Optional[str] = None) -> bool:
+        """Second half of an export, once everything's been captured. Fine on any thread.
+        Any other languages the preference asks for get made after the page in Cura's language, one at a time
+        (rendering's all Python, so threads only take turns at it). Returns whether it all worked."""
+        written = self._render_and_write_page(export_context, output_filename, fingerprint)
+        base_filename = os.path.splitext(output_filename)[0]
+        for language in self._get_page_languages():
+            written = self._render_and_write_language(export_context, language, f"{base_filename}.{language}.html") and written
+        return written
+
+    def _render_and_write_language(self, export_context: ExportContext, language: str, output_filename: str) -> bool:
+        """One of _render_and_write's other languages. Left alone if the file's already got exactly that in it."""
+        export_timer = ExportTimer()
+        try:
+            with export_timer.phase("localise"):
+                localised_context = export_context.localised(language, export_timer)
+            fingerprint = localised_context.fingerprint()
+            if self._is_export_unchanged(fingerprint, output_filename):
+                return True
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return False
+        # The data files are the same settings whatever language, so they only go with the page in Cura's language
+        return self._render_and_write_page(localised_context, output_filename, fingerprint, companion_data = False)
+
+    def _render_and_write_page(self, export_context: ExportContext, output_filename: str, fingerprint: Optional[str] = None, companion_data: bool = True) -> bool:
+        """Renders and writes just the one page (plus its data files if companion_data). Returns whether it worked."""
+        export_timer = export_context.export_timer
         try:
-            output_page = self._assemble_html()
-            if not self._export_fail:
+            with export_timer.phase("render"):
+                output_page = self._assemble_html(export_context)
+            if self._get_bool_preference(self.PREFERENCE_TIMING_COMMENT):
+                # Everything but writing it, which is the best a page can do when it's describing itself
+                html_split_end = output_page.rpartition("</html>")
+                output_page = html_split_end[0] + "<!--\n" + export_timer.summary().replace("--", "- -") + "\n-->\n" + html_split_end[1] + html_split_end[2]
+            with export_timer.phase("write"):
                 with open(output_filename, "w", encoding="utf-8") as page:
                     page.write(output_page)
+            export_timer.set_output_size("write", os.path.getsize(output_filename))
+        except Exception as e:
+            self._export_failed(e, export_timer)
+            return False
+        Logger.log("i", export_timer.summary())
+        Logger.log("i", f"HTML settings export successful to {output_filename}")
+        if fingerprint is not None:
+            self._get_export_index().record(fingerprint, output_filename)
+        if companion_data:
+            self._save_companion_data(export_context.data_source, output_filename)
+        return True
+
+    def _get_export_index(self) -> ExportIndex:
+        if self._export_index is None:
+            from UM.Resources import Resources
+            self._export_index = ExportIndex(os.path.join(Resources.getDataStoragePath(), "htmlsettingsexport", "export_index.json"))
+        return self._export_index
+
+    def _is_export_unchanged(self, fingerprint: str, output_filename: str) -> bool:
+        if not self._get_bool_preference(self.PREFERENCE_SKIP_UNCHANGED) or not self._get_export_index().is_current(fingerprint, output_filename):
+            return False
+        Logger.log("i", f"{output_filename} already has exactly these settings in it, not writing it again")
+        return True
+
+    def _get_plugin_version(self) -> str:
+        if self._plugin_version is None:
+            try:
+                with open(os.path.join(self._plugin_dir, "plugin.json"), "r", encoding = "utf-8") as plugin_file:
+                    self._plugin_version = str(json.load(plugin_file).get("version", ""))
+            except Exception as e:
+                Logger.log("w", f"Couldn't read plugin version: {e}")
+                self._plugin_version = ""
+        return self._plugin_version
+
+    def _export_failed(self, e: Exception, export_timer: ExportTimer) -> None:
+        Logger.logException("e", f"Exception while trying to save HTML settings: {e}")
+        Logger.log("i", export_timer.summary())
+        Message(title = catalog.i18nc("@plugin_name", "HTML Settings Export Reborn"),
+                text = catalog.i18nc("@export_exception", "Error while trying to save HTML settings. Please check log file.")).show()
+
+    @contextmanager
+    def _profiling(self, output_filename: str) -> Iterator[None]:
+        """Runs cProfile over the with block if the preference says to, and saves it next to the output file"""
+        if not self._get_bool_preference(self.PREFERENCE_PROFILE_EXPORT):
+            yield
+            return
+        import cProfile  # Hardly anyone will turn this on
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Only one profiler at a time, so whichever export got there second goes without
+            Logger.log("w", f"Couldn't profile export to {output_filename}: {e}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profile_filename = os.path.splitext(output_filename)[0] + ".prof"
+            try:
+                profiler.dump_stats(profile_filename)
+                Logger.log("i", f"HTML settings export profile written to {profile_filename}")
+            except Exception as e:
+                Logger.logException("w", f"Couldn't write HTML settings export profile to {profile_filename}: {e}")
+
+    def _toggle_auto_export(self) -> None:
+        auto_export = not self._get_bool_preference(self.PREFERENCE_AUTO_EXPORT)
+        self._preferences.setValue(self.PREFERENCE_AUTO_EXPORT, auto_export)
+        if auto_export:
+            message_text = catalog.i18nc("@message:auto_export_on", "Settings will be exported to {0} every time a slice finishes.").format(self._get_auto_export_folder())
+        else:
+            message_text = catalog.i18nc("@message:auto_export_off", "Settings will no longer be exported automatically.")
+        Message(message_text, title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn"), lifetime = 15).show()
+
+    def _resume_background_work(self) -> None:
+        """Starts up whatever was running when Cura closed. The menu calls this once Cura's ready (if there's anything to start)."""
+        if self._preferences.getValue(self.PREFERENCE_WATCH_FOLDER):
+            self._start_watching()  # Carries on from where it was, the index remembers what it's already done
+        if self._get_bool_preference(self.PREFERENCE_REPORT_SERVER):
+            self._start_report_server()
+
+    def _on_backend_state_change(self, state) -> None:
+        self._backend_state = state
+        from UM.Backend.Backend import BackendState
+        if state != BackendState.Done or not self._get_bool_preference(self.PREFERENCE_AUTO_EXPORT):
+            return
+        if self._auto_export_timer is None:
+            from PyQt6.QtCore import QTimer
+            self._auto_export_timer = QTimer()
+            self._auto_export_timer.setSingleShot(True)
+            self._auto_export_timer.timeout.connect(self._start_auto_export)
+        # Starting it again if it's already going is what turns a burst of slices into one export
+        self._auto_export_timer.start(self.AUTO_EXPORT_DELAY)
+
+    def _start_auto_export(self) -> None:
+        """Captures the settings here on the main thread (stacks don't like other threads) then
+        renders and writes them on another one so nobody has to wait for it"""
+        from UM.Backend.Backend import BackendState
+        if self._backend_state != BackendState.Done:
+            return  # It's slicing again (or the slice got thrown away). The next one will start the timer again.
+        if not self._auto_export_lock.acquire(blocking = False):
+            self._auto_export_timer.start(self.AUTO_EXPORT_DELAY)  # Still busy with the last one, try again later
+            return
+        export_timer = ExportTimer()
+        try:
+            output_filename = os.path.join(self._get_auto_export_folder(), self._application.getPrintInformation().jobName + ".html")
+            export_context = self._capture_export(ExportMode.REPORT, export_timer)
+            fingerprint = export_context.fingerprint()
+            # Always skip unchanged ones here, otherwise it's a new file every time you move the camera and re-slice
+            if self._get_export_index().is_current(fingerprint, output_filename):
+                Logger.log("d", f"Settings haven't changed since the last export to {output_filename}, not writing it again")
+                self._auto_export_lock.release()
+                return
+        except Exception as e:
+            self._auto_export_lock.release()
+            Logger.logException("e", f"Exception while trying to capture settings for automatic export: {e}")
+            return
+        threading.Thread(target = self._finish_auto_export, args = (export_context, output_filename, fingerprint),
+                         name = "HTMLSettingsExportAutoExport", daemon = True).start()
+
+    def _finish_auto_export(self, export_context: ExportContext, output_filename: str, fingerprint: str) -> None:
+        """The other thread's half of an automatic export. Let go of the automatic export lock when it's done."""
+        try:
+            with self._profiling(output_filename):
+                self._render_and_write(export_context, output_filename, fingerprint)
+        finally:
+            self._auto_export_lock.release()
+
+    def _toggle_watch_folder(self) -> None:
+        if self._watch_session is not None:
+            folder = self._watch_session.folder
+            self._stop_watching()
+            self._preferences.setValue(self.PREFERENCE_WATCH_FOLDER, "")
+            message_text = catalog.i18nc("@message:watch_off", "No longer watching {0} for jobs.").format(folder)
+        else:
+            from PyQt6.QtWidgets import QFileDialog
+            folder = QFileDialog.getExistingDirectory(None, catalog.i18nc("@dialog:watch_folder", "Folder to watch for G-code and 3MF files"),
+                                                      self._preferences.getValue("local_file/dialog_save_path") or "")
+            if not folder:
+                Logger.log("d", "User cancelled choosing a folder to watch")
+                return
+            self._preferences.setValue(self.PREFERENCE_WATCH_FOLDER, folder)
+            if self._start_watching():
+                message_text = catalog.i18nc("@message:watch_on", "Watching {0} for G-code and 3MF files. Their reports (and an index of them) go in {1}.").format(folder, self._watch_session.output_folder)
             else:
-                raise Exception("self._export_fail triggered")
+                self._preferences.setValue(self.PREFERENCE_WATCH_FOLDER, "")
+                message_text = catalog.i18nc("@message:watch_fail", "Couldn't start watching {0}. Please check log file.").format(folder)
+        Message(message_text, title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn"), lifetime = 15).show()
+
+    def _start_watching(self) -> bool:
+        """Starts looking for jobs in the watched folder every so often. Returns whether it could."""
+        folder = self._preferences.getValue(self.PREFERENCE_WATCH_FOLDER)
+        if not folder or not os.path.isdir(folder):
+            Logger.log("w", f"Can't watch {folder} for jobs, it isn't a folder")
+            return False
+        output_folder = self._preferences.getValue(self.PREFERENCE_WATCH_OUTPUT_FOLDER) or os.path.join(folder, "settings reports")
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .FolderWatch import JobFolderPage, WatchIndex, WatchSession
+        try:
+            os.makedirs(output_folder, exist_ok = True)
+            empty_page = self._load_file_with_replacements(os.path.join(self._plugin_dir, "html_watch_index.html"), {
+                self.HTML_REPLACEMENT_LANG: catalog.i18nc("@page:language", "en"),
+                self.HTML_REPLACEMENT_TITLE: catalog.i18nc("@watch:title", "Settings reports for {0}").format(os.path.basename(os.path.normpath(folder))),
+                self.HTML_REPLACEMENT_JOB_FILE: catalog.i18nc("@watch:job_file", "Job file"),
+                self.HTML_REPLACEMENT_PROFILE: catalog.i18nc("@label", "Profile"),
+                self.HTML_REPLACEMENT_PRINTER: catalog.i18nc("@label", "Printer"),
+                self.HTML_REPLACEMENT_FINGERPRINT: catalog.i18nc("@watch:fingerprint", "Settings fingerprint"),
+                self.HTML_REPLACEMENT_UPDATED: catalog.i18nc("@watch:updated", "Updated"),
+            })
+            self._watch_session = WatchSession(
+                folder = folder,
+                output_folder = output_folder,
+                index = WatchIndex(os.path.join(output_folder, "watch_index.json")),
+                page = JobFolderPage(os.path.join(output_folder, "index.html"), empty_page),
+                pool = ThreadPoolExecutor(max_workers = self.WATCH_WORKERS, thread_name_prefix = "HTMLSettingsExportWatch"),
+            )
+            if not os.path.exists(os.path.join(output_folder, "index.html")):
+                # Someone deleted it, but the index still knows what should be on it
+                for watched_job in self._watch_session.index.jobs():
+                    self._watch_session.page.set_row(watched_job.name, JobFolderPage.make_row(watched_job, catalog.i18nc("@watch:no_report", "No report")))
         except Exception as e:
-            Logger.logException("e", f"Exception while trying to save HTML settings: {e}")
-            Message(title = catalog.i18nc("@plugin_name", "HTML Settings Export Reborn"),
-                    text = catalog.i18nc("@export_exception", "Error while trying to save HTML settings. Please check log file.")).show()
+            Logger.logException("e", f"Couldn't start watching {folder} for jobs: {e}")
+            self._watch_session = None
+            return False
+        if self._watch_timer is None:
+            from PyQt6.QtCore import QTimer
+            self._watch_timer = QTimer()
+            self._watch_timer.setSingleShot(True)
+            self._watch_timer.timeout.connect(self._watch_tick)
+        self._watch_timer.start(0)
+        Logger.log("i", f"Watching {folder} for jobs, reports go in {output_folder}")
+        return True
+
+    def _stop_watching(self) -> None:
+        watch_session, self._watch_session = self._watch_session, None
+        if watch_session is None:
             return
-        Logger.log("i", f"HTML settings export successful to {output_filename}")
+        self._watch_timer.stop()
+        # Anything already rendering can finish (and get recorded), anything still waiting gets done next time
+        watch_session.pool.shutdown(wait = False, cancel_futures = True)
+
+    def _toggle_report_server(self) -> None:
+        if self._report_server is not None:
+            self._stop_report_server()
+            self._preferences.setValue(self.PREFERENCE_REPORT_SERVER, False)
+            message_text = catalog.i18nc("@message:server_off", "The report server has stopped.")
+        elif self._start_report_server():
+            self._preferences.setValue(self.PREFERENCE_REPORT_SERVER, True)
+            message_text = catalog.i18nc("@message:server_on", "Reports are being served at {0}").format(self._report_server.url)
+        else:
+            message_text = catalog.i18nc("@message:server_fail", "Couldn't start the report server. Please check log file.")
+        Message(message_text, title = catalog.i18nc("@message:plugin_title", "HTML Settings Export Reborn"), lifetime = 15).show()
 
+    def _start_report_server(self) -> bool:
+        """Starts serving reports on its own threads. Returns whether it could."""
+        from .ReportServer import ReportServer
+        host = self._preferences.getValue(self.PREFERENCE_REPORT_SERVER_HOST) or "127.0.0.1"
         try:
-            webbrowser.open_new_tab(output_filename)
+            port = int(self._preferences.getValue(self.PREFERENCE_REPORT_SERVER_PORT))
+        except (TypeError, ValueError):
+            port = self.DEFAULT_REPORT_SERVER_PORT
+        try:
+            self._report_server = ReportServer(self._find_served_page, host, port)
+        except OSError as e:
+            Logger.log("w", f"Couldn't start the report server on {host}:{port}: {e}")
+            return False
+        self._report_server.start()
+        Logger.log("i", f"Report server listening at {self._report_server.url}")
+        return True
+
+    def _stop_report_server(self) -> None:
+        report_server, self._report_server = self._report_server, None
+        if report_server is not None:
+            report_server.stop()
+
+    def _find_served_page(self, path: str, parameters: dict[str, str]):
+        """What the report server should send for a URL. Called on the server's threads, so it only uses things
+        that have already been captured (or the archive), never Cura's stacks. Comparisons get their root causes
+        from the dependency graph, which the main thread looks up for them.
+            /                    Everything that can be looked at
+            /report?id=<id>      A report
+            /compare?a=<id>&b=<id>  A comparison
+        IDs are archived job numbers, "latest" for the last report exported (or automatically exported) since Cura started,
+        or "stored" for the profile stored for comparison. Either page can have &lang=<language> on the end."""
+        from .ReportServer import ServedSource
+        if path in ("/", "/index.html"):
+            return ServedSource(render = self._make_server_index_html)
+        # Read once, so the page that gets made is the one the fingerprint is for even if someone changes them in between
+        page_options = self._get_page_options()
+        if path == "/report":
+            profile_key, load_profile = self._find_served_profile(parameters.get("id", "latest"))
+            page_key = ["report", profile_key]
+
+            def make_export_context() -> ExportContext:
+                setting_profile, report_details = load_profile()
+                return ExportContext(export_mode = ExportMode.REPORT, setting_profile = setting_profile, report_details = report_details, **page_options)
+        elif path == "/compare":
+            if "a" not in parameters or "b" not in parameters:
+                raise ValueError("A comparison needs two IDs, like /compare?a=1&b=2")
+            profile_key_a, load_profile_a = self._find_served_profile(parameters["a"])
+            profile_key_b, load_profile_b = self._find_served_profile(parameters["b"])
+            served_graph = self._get_served_dependency_graph() if self._get_bool_preference(self.PREFERENCE_ROOT_CAUSES) else None
+            # Which machine's graph it was, since another machine's could make different root causes from the same two profiles
+            page_key = ["compare", profile_key_a, profile_key_b, served_graph[0] if served_graph is not None else None]
+
+            def make_export_context() -> ExportContext:
+                profile_a, _ = load_profile_a()
+                profile_b, _ = load_profile_b()
+                profile_compare = CompareProfiles(profile_a, profile_b)
+                if served_graph is not None:
+                    profile_compare.find_root_causes(served_graph[1])  # The graph never changes once it's made, so any thread can use it
+                return ExportContext(export_mode = ExportMode.COMPARE, setting_profile = profile_b, profile_compare = profile_compare, **page_options)
+        else:
+            return None
+        language = parameters.get("lang") or None
+        if language is not None and not re.fullmatch(self.LANGUAGE_PATTERN, language):
+            raise ValueError(f"\"{language}\" isn't a language")
+
+        def render() -> str:
+            # Only happens if it's not in the cache already and the browser hasn't already got it, so that's the only time
+            # anything gets loaded from the archive (or compared, or translated)
+            export_context = make_export_context()
+            return self._assemble_html(export_context.localised(language) if language is not None else export_context)
+
+        # Made from what's already known about the page instead of the page itself. Archived jobs never change
+        # (and their settings' fingerprint is in the archive), the rest are already in memory with theirs worked out.
+        page_details = [page_options["plugin_version"], page_options["page_format"].name, page_options["collapse_extruders"], page_options["compact_markup"],
+                        language, page_key]
+        return ServedSource(render = render, fingerprint = hashlib.sha256(fingerprint_json(page_details)).hexdigest())
+
+    def _find_served_profile(self, profile_id: str) -> tuple[list[Any], Callable[[], tuple[SettingProfile, ReportDetails]]]:
+        """Something that's different for every different capture with that ID (for fingerprinting pages made from it),
+        and how to get the capture itself when it's actually needed. Loading an archived job is the slow part, so it waits.
+        Raises KeyError if there's nothing with that ID, ValueError if it's not an ID at all."""
+        if profile_id == "latest":
+            latest_capture = self._latest_capture
+            if latest_capture is None:
+                raise KeyError("Nothing's been exported since Cura started")
+            setting_profile, report_details = latest_capture
+            # Worked out when it was exported, so that's free
+            return ["latest", setting_profile.fingerprint(), report_details.fingerprint_details()], lambda: latest_capture
+        if profile_id == "stored":
+            stored_profile = self._compare_profile_a
+            if stored_profile is None:
+                raise KeyError("There isn't a profile stored for comparison")
+            stored_details = self._make_served_report_details(catalog.i18nc("@server:stored_profile", "Stored for comparison"), "", stored_profile.extruder_count)
+            return ["stored", stored_profile.fingerprint()], lambda: (stored_profile, stored_details)
+        try:
+            job_id = int(profile_id)
+        except ValueError:
+            raise ValueError(f"\"{profile_id}\" isn't an archived job number, latest or stored") from None
+        if not self._get_bool_preference(self.PREFERENCE_ARCHIVE):
+            raise KeyError("The archive is turned off")
+        settings_archive = self._get_settings_archive()
+        archived_job = settings_archive.get_job(job_id)  # Just the one row
+        archived_details = self._make_served_report_details(archived_job.job_name, archived_job.captured_at.replace("T", " "), archived_job.extruder_count)
+        return (["archived", job_id, archived_job.fingerprint, archived_job.job_name, archived_job.captured_at, archived_job.extruder_count],
+                lambda: (settings_archive.load_profile(job_id), archived_details))
+
+    @staticmethod
+    def _make_served_report_details(job_name: str, date_time: str, extruder_count: int) -> ReportDetails:
+        """Report details for settings that were captured without any (stored and archived ones just have the settings)"""
+        return ReportDetails(job_name = job_name, intent_category = "", date_time = date_time, material_weights = (), material_lengths = (), material_costs = (),
+                             currency = "", print_time = "", extruders_enabled = (), extruder_materials = ("",) * max(extruder_count, 1),
+                             post_processing_scripts = None, encoded_snapshot = "")
+
+    def _make_server_index_html(self) -> str:
+        """The report server's front page: everything it can show, and a form for comparing any two of them"""
+        served_profiles: list[tuple[str, str, str, str, str]] = []  # ID, job, profile, printer, captured
+        latest_capture = self._latest_capture
+        if latest_capture is not None:
+            setting_profile, report_details = latest_capture
+            served_profiles.append(("latest", report_details.job_name, setting_profile.profile_name, setting_profile.printer_name, report_details.date_time))
+        stored_profile = self._compare_profile_a
+        if stored_profile is not None:
+            served_profiles.append(("stored", catalog.i18nc("@server:stored_profile", "Stored for comparison"), stored_profile.profile_name, stored_profile.printer_name, ""))
+        archived_jobs = []
+        if self._get_bool_preference(self.PREFERENCE_ARCHIVE):
+            from .SettingsArchive import ArchiveQuery
+            archived_jobs = self._get_settings_archive().find_jobs(ArchiveQuery(), limit = self.SERVER_INDEX_JOBS)
+        served_profiles.extend((str(archived_job.job_id), archived_job.job_name, archived_job.profile_name, archived_job.machine_name, archived_job.captured_at.replace("T", " "))
+                               for archived_job in archived_jobs)
+
+        options_html = "\n".join(indent(f'<option value="{html.escape(profile_id)}">{html.escape(profile_id)}: {html.escape(job_name)} - {html.escape(profile_name)}</option>', 4)
+                                 for profile_id, job_name, profile_name, _, _ in served_profiles)
+        rows_html = "\n".join(indent(f'<tr><td class="number"><a href="/report?id={html.escape(profile_id)}">{html.escape(profile_id)}</a></td><td>{html.escape(job_name)}</td>'
+                                     f'<td>{html.escape(profile_name)}</td><td>{html.escape(printer_name)}</td><td>{html.escape(captured)}</td></tr>', 4)
+                              for profile_id, job_name, profile_name, printer_name, captured in served_profiles)
+        page = self._load_file_with_replacements(os.path.join(self._plugin_dir, "html_server_index.html"), {
+            self.HTML_REPLACEMENT_LANG: catalog.i18nc("@page:language", "en"),
+            self.HTML_REPLACEMENT_TITLE: catalog.i18nc("@server:title", "Cura Print Settings"),
+            self.HTML_REPLACEMENT_SUMMARY: catalog.i18nc("@server:summary", "Click a number for its report, or pick two to compare.") if served_profiles else
+                                           catalog.i18nc("@server:nothing", "Nothing to show yet. Export some settings (or turn on the archive) and it'll turn up here."),
+            self.HTML_REPLACEMENT_PROFILE_A: catalog.i18nc("@sticky:profile_a", "Profile A"),
+            self.HTML_REPLACEMENT_PROFILE_B: catalog.i18nc("@sticky:profile_b", "Profile B"),
+            self.HTML_REPLACEMENT_COMPARE: catalog.i18nc("@server:compare", "Compare"),
+            self.HTML_REPLACEMENT_JOB: catalog.i18nc("@fleet:job", "Job"),
+            self.HTML_REPLACEMENT_PROFILE: catalog.i18nc("@label", "Profile"),
+            self.HTML_REPLACEMENT_PRINTER: catalog.i18nc("@label", "Printer"),
+            self.HTML_REPLACEMENT_CAPTURED: catalog.i18nc("@fleet:captured", "Captured"),
+        })
+        return page.replace(self.HTML_REPLACEMENT_SERVER_OPTIONS, options_html).replace(self.HTML_REPLACEMENT_SERVER_ROWS, rows_html)
+
+    def _watch_tick(self) -> None:
+        """Looks for new and changed jobs, and reads the settings from the next one. Main thread only."""
+        watch_session = self._watch_session
+        if watch_session is None:
+            return
+        if not watch_session.pending:
+            try:
+                changed_jobs, removed_jobs = watch_session.index.scan(watch_session.folder, watch_session.in_flight)
+                for name in removed_jobs:
+                    # The report stays where it is, but it's not a job in this folder any more
+                    watch_session.index.remove(name)
+                    watch_session.page.set_row(name, None)
+                if removed_jobs:
+                    watch_session.index.save()
+            except OSError as e:
+                Logger.log("w", f"Couldn't check {watch_session.folder} for jobs: {e}")
+                changed_jobs = []
+            watch_session.pending.extend(changed_jobs)
+        # One job at a time since reading settings holds up Cura, and no more waiting to be rendered than there are workers
+        if watch_session.pending and len(watch_session.in_flight) < self.WATCH_WORKERS * 2:
+            self._capture_watched_job(watch_session, watch_session.pending.popleft())
+        self._watch_timer.start(self.WATCH_BUSY_INTERVAL if watch_session.pending else self.WATCH_INTERVAL)
+
+    def _capture_watched_job(self, watch_session, watched_job) -> None:
+        """Reads a job file's settings and hands the page to a worker, unless they're the same settings as last time"""
+        from .DetachedProfiles import make_job_stacks
+        from .JobFiles import read_job_file
+        job_filename = os.path.join(watch_session.folder, watched_job.name)
+        try:
+            job_file = read_job_file(job_filename)
+        except (OSError, ValueError) as e:
+            Logger.log("w", f"Couldn't get settings from {job_filename}: {e}")
+            self._record_watched_job(watch_session, replace(watched_job, error = str(e), updated = format_local_date_time()))
+            return
+        watched_job.fingerprint = job_file.fingerprint()
+        known_job = watch_session.index.get(watched_job.name)
+        if (known_job is not None and known_job.fingerprint == watched_job.fingerprint and not known_job.error
+                and os.path.exists(os.path.join(watch_session.output_folder, known_job.report))):
+            # Saved again (or copied over) with the same settings. Nothing to do but remember it's been seen.
+            watch_session.index.update(replace(known_job, size = watched_job.size, mtime_ns = watched_job.mtime_ns))
+            watch_session.index.save()
+            return
+
+        export_timer = ExportTimer()
+        try:
+            detached_stacks = make_job_stacks(job_file)
+            setting_profile = self._get_setting_profile(export_timer, detached_stacks)
+            export_context = self._new_export_context(ExportMode.REPORT, export_timer, setting_profile,
+                                                      report_details = self._get_job_report_details(job_file, detached_stacks))
         except Exception as e:
+            Logger.logException("w", f"Couldn't read the settings in {job_filename}: {e}")
+            self._record_watched_job(watch_session, replace(watched_job, error = str(e), updated = format_local_date_time()))
+            return
+        watched_job.report = watched_job.name + ".html"  # Not just the job name, job.gcode and job.3mf can both be there
+        watched_job.profile_name = setting_profile.profile_name
+        watched_job.printer_name = setting_profile.printer_name
+        watch_session.in_flight.add(watched_job.name)
+        watch_session.pool.submit(self._finish_watched_job, watch_session, export_context, watched_job)
+
+    def _finish_watched_job(self, watch_session, export_context: ExportContext, watched_job) -> None:
+        """The worker's half: renders and writes the report, then updates the index and its page"""
+        try:
+            output_filename = os.path.join(watch_session.output_folder, watched_job.report)
+            if not self._render_and_write(export_context, output_filename, export_context.fingerprint()):
+                watched_job.error = catalog.i18nc("@watch:render_failed", "Couldn't write the report (see the log)")
+            watched_job.updated = format_local_date_time()
+            self._record_watched_job(watch_session, watched_job)
+        finally:
+            watch_session.in_flight.discard(watched_job.name)
+
+    def _record_watched_job(self, watch_session, watched_job) -> None:
+        from .FolderWatch import JobFolderPage
+        watch_session.index.update(watched_job)
+        try:
+            watch_session.page.set_row(watched_job.name, JobFolderPage.make_row(watched_job, catalog.i18nc("@watch:no_report", "No report")))
+            watch_session.index.save()
+        except OSError as e:
+            Logger.log("w", f"Couldn't update the index of {watch_session.folder}: {e}")
+
+    def _get_job_report_details(self, job_file, detached_stacks) -> ReportDetails:
+        """What goes at the top of a report, as far as a job file can say. G-code knows the print time and filament
+        length (not weight or cost). Projects don't know either."""
+        from UM.Qt.Duration import Duration, DurationFormat
+        print_time = ""
+        material_lengths: tuple[float, ...] = ()
+        try:
+            if "TIME" in job_file.header:
+                print_time = Duration(int(job_file.header["TIME"])).getDisplayString(DurationFormat.Format.Long)
+            if "Filament used" in job_file.header:
+                material_lengths = tuple(float(length.strip().rstrip("m")) for length in job_file.header["Filament used"].split(","))
+        except ValueError:
+            Logger.log("w", f"Didn't understand the print time or filament used in {job_file.path}")
+        extruder_stacks = detached_stacks.extruder_stacks
+        return ReportDetails(
+            job_name = job_file.job_name,
+            intent_category = detached_stacks.intent_category,
+            date_time = format_local_date_time(),
+            material_weights = (),
+            material_lengths = material_lengths,
+            material_costs = (),
+            currency = str(self._preferences.getValue("cura/currency")),
+            print_time = print_time,
+            extruders_enabled = tuple(extruder.getMetaDataEntry("enabled", "True") for extruder in extruder_stacks),
+            extruder_materials = tuple(extruder.material.getMetaData().get("material", "") for extruder in extruder_stacks),
+            post_processing_scripts = detached_stacks.global_stack.getMetaDataEntry("post_processing_scripts"),
+            encoded_snapshot = job_file.thumbnail,
+        )
+
+    def _get_auto_export_folder(self) -> str:
+        for folder in (self._preferences.getValue(self.PREFERENCE_AUTO_EXPORT_FOLDER), self._preferences.getValue("local_file/dialog_save_path")):
+            if folder and os.path.isdir(folder):
+                return folder
+        return os.path.expanduser("~")
+
+    def _save_settings_data(self):
+        """Saves just the data (no HTML) for the current profile"""
+        from .DataExport import DataFormat, export_settings_data  # Only needed when someone asks for it
+
+        data_filters = {
+            catalog.i18nc("@save:json_filter", "JSON (*.json)"): DataFormat.JSON,
+            catalog.i18nc("@save:json_flat_filter", "Flat JSON (*.json)"): DataFormat.JSON_FLAT,
+            catalog.i18nc("@save:csv_filter", "CSV (*.csv)"): DataFormat.CSV,
+        }
+        output_filename, selected_filter = self._get_save_path_and_filter(
+            self._application.getPrintInformation().jobName + ".json",
+            catalog.i18nc("@save:data_dialog_title", "Save Settings Data"),
+            {name_filter: [data_format.suffix.rpartition(".")[2]] for name_filter, data_format in data_filters.items()})
+        if not output_filename:
+            Logger.log("d", "User cancelled save for settings data export")
+            return
+        try:
+            export_settings_data(self._get_setting_profile(), output_filename, data_filters.get(selected_filter, DataFormat.JSON))
+        except Exception as e:
+            Logger.logException("e", f"Exception while trying to save settings data: {e}")
             Message(title = catalog.i18nc("@plugin_name", "HTML Settings Export Reborn"),
-                    text = catalog.i18nc("@export_browser_fail", "Could not open a web browser to display output file.\nPlease navigate to where you saved the file and open it manually.")).show()
-            Logger.log("e", f"HTMLSettingsExportReborn could not open a web browser to display output file {output_filename}\n{e}")
+                    text = catalog.i18nc("@export_data_exception", "Error while trying to save settings data. Please check log file.")).show()
+            return
+        Logger.log("i", f"Settings data export successful to {output_filename}")
+
+    def _save_companion_data(self, data_source: SettingProfile | CompareProfiles, html_filename: str) -> None:
+        """Writes whichever data files the preferences ask for next to an HTML export"""
+        data_formats = [data_format.strip().upper() for data_format in str(self._preferences.getValue(self.PREFERENCE_DATA_FORMATS) or "").split(",") if data_format.strip()]
+        if not data_formats:
+            return
+        from .DataExport import DataFormat, export_settings_data  # Only needed when someone asks for it
+
+        base_filename = os.path.splitext(html_filename)[0]
+        for data_format_name in data_formats:
+            if data_format_name not in DataFormat.__members__:
+                Logger.log("w", f"Unknown settings data format {data_format_name} in {self.PREFERENCE_DATA_FORMATS}")
+                continue
+            data_format = DataFormat[data_format_name]
+            try:
+                export_settings_data(data_source, base_filename + data_format.suffix, data_format)
+            except Exception as e:
+                Logger.logException("e", f"Exception while trying to save {data_format_name} settings data: {e}")
+                Message(title = catalog.i18nc("@plugin_name", "HTML Settings Export Reborn"),
+                        text = catalog.i18nc("@export_data_exception", "Error while trying to save settings data. Please check log file.")).show()
+
+    def _get_page_languages(self) -> list[str]:
+        """The other languages pages get made in, in order and without repeats"""
+        languages: list[str] = []
+        for language in str(self._preferences.getValue(self.PREFERENCE_LANGUAGES) or "").split(","):
+            language = language.strip()
+            if not language or language in languages:
+                continue
+            if not re.fullmatch(self.LANGUAGE_PATTERN, language):
+                Logger.log("w", f"{language} in {self.PREFERENCE_LANGUAGES} doesn't look like a language, skipping it")
+                continue
+            languages.append(language)
+        return languages
+
+    def _get_page_format(self) -> PageFormat:
+        page_format = str(self._preferences.getValue(self.PREFERENCE_PAGE_FORMAT)).upper()
+        if page_format not in PageFormat.__members__:
+            Logger.log("w", f"Unknown HTML settings export page format {page_format}, using static")
+            return PageFormat.STATIC
+        return PageFormat[page_format]
 
     def _get_file_save_path(self, suggested_name: str = "cura settings.html") -> Optional[str]:
+        html_filter = catalog.i18nc("@save:html_filter", "HTML Files (*.html *.htm)")
+        file_name, _ = self._get_save_path_and_filter(suggested_name, catalog.i18nc("@save:dialog_title", "Save HTML Settings Export"), {html_filter: ["html", "htm"]})
+        return file_name
+
+    def _get_save_path_and_filter(self, suggested_name: str, title: str, name_filters: dict[str, list[str]]) -> tuple[Optional[str], str]:
+        """Shows a save dialog. name_filters maps each filter string to the extensions it allows (first one is the default).
+        Returns the chosen file name (or None if they cancelled) and the filter that was selected."""
+        from PyQt6.QtWidgets import QFileDialog
         dialog = QFileDialog()
 
-        dialog.setWindowTitle(catalog.i18nc("@save:dialog_title", "Save HTML Settings Export"))
+        dialog.setWindowTitle(title)
         dialog.setFileMode(QFileDialog.FileMode.AnyFile)
         dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
 
-        # Set HTML filter string
-        html_filter = catalog.i18nc("@save:html_filter", "HTML Files (*.html *.htm)")
         dialog.setNameFilters([
-            html_filter,
+            *name_filters.keys(),
             "All Files (*)"
         ])
 
-        dialog.selectNameFilter(html_filter)
+        dialog.selectNameFilter(next(iter(name_filters)))
 
         # Get default file save path from last Cura save location
         default_directory = self._preferences.getValue("local_file/dialog_save_path")
@@ -625,18 +2427,19 @@ class HTMLSettingsExportReborn(Extension):
 
         if not dialog.exec():
             # User cancelled the save
-            return None
+            return None, ""
 
         file_name = dialog.selectedFiles()[0]
         selected_filter = dialog.selectedNameFilter()
 
-        if selected_filter == html_filter:
+        if selected_filter in name_filters:
             _, ext = os.path.splitext(file_name)
-            if ext.lower() not in [".html", ".htm"]:
-                # Add a .html extension if the HTML name filter is selected but they didn't add the extension
-                file_name += ".html"
+            extensions = name_filters[selected_filter]
+            if ext.lower().lstrip(".") not in extensions:
+                # Add the extension if a name filter is selected but they didn't add the extension
+                file_name += "." + extensions[0]
 
-        return file_name
+        return file_name, selected_filter
 
     def _load_file_with_replacements(self, filename: str, replacements: dict[str,str], strip_comments: Optional[str] = None) -> str:
         """Loads a file then replaces the keys in the dict with the values"""
@@ -649,8 +2452,7 @@ class HTMLSettingsExportReborn(Extension):
                 file = file_handle.read()
         except Exception:
             Logger.logException("e", f"Exception trying to read {filename}")
-            self._export_fail = True
-            return ""
+            raise  # A page with a bit missing is worse than no page
         
         for key, value in replacements.items():
             #Logger.log("d", f"Replacing {key} with {value}")
@@ -668,12 +2470,22 @@ class HTMLSettingsExportReborn(Extension):
 
     def _minify_css_classes(self, page: str) -> str:
         """Reduce output file size by replacing full CSS class names in plugin code with abbreviations"""
+        return self._add_css_class_reference(self._minify_css_class_names(page))
+
+    def _minify_css_class_names(self, text: str) -> str:
+        """Just the replacing part of _minify_css_classes. Only looks one character either side of a class name,
+        so any bit of a page that starts and ends with a tag comes out the same on its own as it does in the whole page."""
         replacement_dict = {cls.full: cls.abbr for cls in CssClasses}
         for key, value in replacement_dict.items():
             search = r'(^|[\s"\'{}#:>+\~\[\],().=\\])(?:' + re.escape(key) + r')([\s"\'{}#:>+\~\[\],().=\\]|$)'
             mini = r'\g<1>' + value + r'\g<2>'
             #Logger.log("d", f'Regex search for {key} = {search} to replace with {mini}')
-            page = re.sub(search, mini, page)
+            text = re.sub(search, mini, text)
+        return text
+
+    def _add_css_class_reference(self, page: str) -> str:
+        """Puts a comment with what each abbreviation stands for at the end of a minified page"""
+        replacement_dict = {cls.full: cls.abbr for cls in CssClasses}
         comments_section = []
         comments_section.append("<!-- CSS class reference:")
         # Sort by the abbreviation (the value in the dictionary)
@@ -706,21 +2518,91 @@ class HTMLSettingsExportReborn(Extension):
                indent('</ol>', base_indent_level + 1)
                )
 
-    def _get_setting_profile(self) -> SettingProfile:
-        global_stack = self._application.getGlobalContainerStack()
-        machine_manager = self._application.getMachineManager()
-        extruder_stacks = self._application.getExtruderManager().getActiveExtruderStacks()
-        extruder_count = self._application.getGlobalContainerStack().getProperty("machine_extruder_count", "value")
+    def _get_setting_profile(self, export_timer: Optional[ExportTimer] = None, detached_stacks = None, changed_only: bool = False) -> SettingProfile:
+        """Reads every setting from the active stacks (or DetachedStacks if there are some). Main thread only.
+        Timings go in export_timer if there is one (and nowhere if there isn't).
+        changed_only reads just the settings in the stacks' user changes, plus their parents so they've got somewhere to go."""
+        export_timer = export_timer or ExportTimer()
+        with export_timer.phase("stack read"):
+            profile, extruder_stacks = self._read_profile_stacks(export_timer, detached_stacks)
+        wanted_keys = None
+        if changed_only:
+            profile.changed_only = True
+            with export_timer.phase("changed settings"):
+                wanted_keys = self._get_changed_keys_with_parents(profile, extruder_stacks[0])
+        for category in list(profile.settings):
+            with export_timer.phase(f"capture: {category}"):
+                category_settings, category_label = self._get_category_settings_list(
+                    category, extruder_stacks, profile,
+                    "fdmprinter.def.json" if category != "machine_settings" else "fdmextruder.def.json",
+                    wanted_keys = wanted_keys)
+            profile.settings_labels[category] = category_label
+            if changed_only and not category_settings:
+                del profile.settings[category]  # Nobody needs a page full of empty categories
+            else:
+                profile.settings[category] = category_settings
+
+        # Some other profile isn't what the job was sliced with so it doesn't belong in the archive.
+        # Neither does half a profile, everything that reads the archive expects all of it.
+        if detached_stacks is None and not changed_only and self._get_bool_preference(self.PREFERENCE_ARCHIVE):
+            with export_timer.phase("archive"):
+                self._archive_profile(profile)
+        return profile
+
+    @staticmethod
+    def _get_changed_keys_with_parents(profile: SettingProfile, definition_stack) -> set[str]:
+        """Every key in any stack's user changes, and every setting (and category) above each of them"""
+        wanted_keys: set[str] = set()
+        changed_keys = set(profile.global_changed_settings)
+        for extruder_changed_settings in profile.extruder_changed_settings:
+            changed_keys.update(extruder_changed_settings)
+        for key in changed_keys:
+            definition = definition_stack.getSettingDefinition(key)
+            # Once it gets to one that's already in, so is everything above it
+            while definition is not None and definition.key not in wanted_keys:
+                wanted_keys.add(definition.key)
+                definition = definition.parent
+        return wanted_keys
+
+    def _archive_profile(self, profile: SettingProfile) -> None:
+        # Not being able to archive something is no reason not to export it
+        try:
+            self._get_settings_archive().add_profile(profile, self._application.getPrintInformation().jobName)
+        except Exception as e:
+            Logger.logException("w", f"Couldn't add settings to the archive: {e}")
+
+    def _get_settings_archive(self):
+        if self._settings_archive is None:
+            from UM.Resources import Resources
+
+            from .SettingsArchive import SettingsArchive
+            archive_dir = os.path.join(Resources.getDataStoragePath(), "htmlsettingsexport")
+            os.makedirs(archive_dir, exist_ok = True)
+            self._settings_archive = SettingsArchive(os.path.join(archive_dir, "archive.sqlite"))
+        return self._settings_archive
+
+    def _read_profile_stacks(self, export_timer: ExportTimer, detached_stacks = None) -> tuple[SettingProfile, list[PropertyCallCounter]]:
+        """Starts a SettingProfile with everything but the settings themselves.
+        Also returns the extruder stacks to read the settings from."""
+        if detached_stacks is None:
+            global_stack = export_timer.count_property_calls(self._application.getGlobalContainerStack())
+            extruder_stacks = [export_timer.count_property_calls(extruder) for extruder in self._application.getExtruderManager().getActiveExtruderStacks()]
+            intent_category = self._application.getMachineManager().activeIntentCategory
+        else:
+            global_stack = export_timer.count_property_calls(detached_stacks.global_stack)
+            extruder_stacks = [export_timer.count_property_calls(extruder) for extruder in detached_stacks.extruder_stacks]
+            intent_category = detached_stacks.intent_category
+        extruder_count = global_stack.getProperty("machine_extruder_count", "value")
 
         empty_presets = ("", "empty", None)
         profile_name = global_stack.qualityChanges.getMetaData().get("name", "")
         if profile_name in empty_presets:
-            profile_name = catalog.i18nc("@page:missing_profile_name", "Default Profile")
+            profile_name = detached_stacks.profile_name if detached_stacks is not None else catalog.i18nc("@page:missing_profile_name", "Default Profile")
 
         # Preset / Intent (for UM printers)
         preset_name = global_stack.qualityChanges.getMetaData().get("name", "")
         if preset_name in empty_presets:
-            preset_name = machine_manager.activeIntentCategory
+            preset_name = intent_category
         if preset_name in empty_presets:
             preset_name = catalog.i18nc("@page:missing_profile_name", "None")
 
@@ -729,25 +2611,27 @@ class HTMLSettingsExportReborn(Extension):
         profile = SettingProfile(profile_name = profile_name, preset_name = preset_name, extruder_count = extruder_count)
         profile.global_changed_settings = global_stack.getTop().getAllKeys()
         profile.extruder_changed_settings = [extruder.getTop().getAllKeys() for extruder in extruder_stacks]
+        from UM.Settings.Models.SettingPreferenceVisibilityHandler import \
+            SettingPreferenceVisibilityHandler
         profile.visible_settings = SettingPreferenceVisibilityHandler().getVisible()
         profile.printer_name = global_stack.definition.getName()
-        for category in profile.settings:
-            category_settings, category_label = self._get_category_settings_list(
-                category, extruder_stacks, profile,
-                i18n_printer_catalog if category != "machine_settings" else i18n_extruder_catalog)
-            profile.settings[category] = category_settings
-            profile.settings_labels[category] = category_label
+        return profile, extruder_stacks
 
-        return profile
 
 
+    def _assemble_html(self, export_context: ExportContext) -> str:
+        """Makes the whole page. Everything it needs is in export_context so it doesn't matter which thread calls it."""
+        with page_language(export_context.language):
+            return self._assemble_page_html(export_context)
 
-    def _assemble_html(self) -> str:
+    def _assemble_page_html(self, export_context: ExportContext) -> str:
+        """The guts of _assemble_html, once everything's going to come out in the page's language"""
         # Information sources
-        global_stack = self._application.getGlobalContainerStack()
-        machine_manager = self._application.getMachineManager()
-        print_information = self._application.getPrintInformation()
-        extruder_stack = self._application.getExtruderManager().getActiveExtruderStacks()
+        setting_profile = export_context.setting_profile
+        profile_compare = export_context.profile_compare
+        report_details = export_context.report_details
+        export_mode = export_context.export_mode
+        strip_comments = export_context.minify
 
         #self._modified_global_settings = global_stack.getTop().getAllKeys()
         #self._modified_extruder_settings = [extruder.getTop().getAllKeys() for extruder in extruder_stack]
@@ -755,57 +2639,6 @@ class HTMLSettingsExportReborn(Extension):
         
         output_html: list[str] = []
 
-        # Get locale specific things all at once in case the system's locale
-        # is different to Cura's so we change it for the shortest time possible.
-        original_locale = None
-        formatted_date_time = None
-        
-        try:
-            # 1. Save the current locale settings.
-            # This returns a tuple containing the settings for all categories.
-            original_locale = locale.setlocale(locale.LC_ALL)
-            
-            # 2. Attempt to set the locale to the system's default.
-            # An empty string "" tells Python to use environment variables.
-            locale.setlocale(locale.LC_ALL, "")
-
-            # Get current date and time
-            now = datetime.now()
-            # Format using locale-specific date and time, separated by a space
-            formatted_date_time = now.strftime("%x %X") 
-            
-        except locale.Error as e:
-            # If locale setting fails (e.g., locale not supported on the OS),
-            # log a warning and proceed with a default, non-locale-specific format.
-            Logger.log("e", f"Could not set system locale for date/time formatting: {e}. Using ISO format as fallback.")
-            now = datetime.now()
-            # Fallback to ISO format, or any other default you prefer
-            formatted_date_time = now.isoformat(sep=' ', timespec='seconds') 
-            # You'd then use this fallback `formatted_date_time` in your HTML
-            
-        finally:
-            # 3. CRUCIALLY: Restore the original locale settings.
-            # This `finally` block ensures this happens even if an exception occurs.
-            if original_locale is not None:
-                try:
-                    locale.setlocale(locale.LC_ALL, original_locale)
-                except locale.Error as e:
-                    # Log if restoring locale fails (should be rare if `original_locale` was valid)
-                    Logger.log("e", f"Failed to restore original locale: {e}")
-
-        if self._export_mode == ExportMode.REPORT:
-            # Get a thumbnail first because it might take a little bit of time
-            encoded_snapshot: str = None
-            snapshot = self._createSnapshot()
-            if snapshot:
-                thumbnail_buffer = QBuffer()
-                
-                thumbnail_buffer.open(QBuffer.OpenModeFlag.ReadWrite)
-                        
-                snapshot.save(thumbnail_buffer, "PNG")
-                encoded_snapshot = thumbnail_buffer.data().toBase64().data().decode("utf-8")
-
-        
         # Indent level for rows in the top table
         # html > body > div > table
         info_indent: int = 4
@@ -814,16 +2647,12 @@ class HTMLSettingsExportReborn(Extension):
         # html > body > div
         details_indent: int = 3
 
-        # Indent level for each setting row
-        # html > body > div > details > table > tbody
-        setting_indent: int = 6
-
         # Get print quality settings for each extruder
         # Categories appear in the same order they do in Cura's print quality settings panel
         #settings_categories = ["resolution", "shell", "top_bottom", "infill", "material",
                                #"speed", "travel", "cooling", "dual", "support", "platform_adhesion",
                                #"meshfix", "blackmagic", "experimental"]
-        setting_profile = self._get_setting_profile()
+        # setting_profile is captured by whoever calls this so the same capture can go to other places too
         #Logger.log("d", f"setting_profile has just been created, and setting_profile.profile_name = {setting_profile.profile_name}")
 
         # Get settings for each category
@@ -836,7 +2665,7 @@ class HTMLSettingsExportReborn(Extension):
         empty_presets = ("", "empty", None)
         # Preset / Intent (for UM printers)
         preset_name = setting_profile.preset_name
-        if preset_name == machine_manager.activeIntentCategory:
+        if report_details is not None and preset_name == report_details.intent_category:
             um_intent = True
         else:
             um_intent = False
@@ -851,7 +2680,8 @@ class HTMLSettingsExportReborn(Extension):
         start_html_replacements = {
             self.HTML_REPLACEMENT_TITLE: catalog.i18nc("@page:title", "Cura Print Settings"),
             self.HTML_REPLACEMENT_LANG: catalog.i18nc("@page:language", "en"),
-            self.HTML_REPLACEMENT_TABLE_COLUMNS: setting_profile.extruder_count if self._export_mode == ExportMode.REPORT else self._profile_compare.total_extruders
+            self.HTML_REPLACEMENT_SETTINGS_FINGERPRINT: export_context.data_source.fingerprint(),
+            self.HTML_REPLACEMENT_TABLE_COLUMNS: setting_profile.extruder_count if export_mode == ExportMode.REPORT else profile_compare.total_extruders
         }
         sticky_replacements: dict[str, str] = {
             self.HTML_REPLACEMENT_LOCAL_CHANGES_DEFAULT: catalog.i18nc("@button:local_changes", "Toggle only user changes"),
@@ -861,107 +2691,130 @@ class HTMLSettingsExportReborn(Extension):
             self.HTML_REPLACEMENT_CLEAR_SEARCH: catalog.i18nc("@button:clear_search", "Clear"),
         }
         # Logger.log("d", f"Before sticky_replacements, setting_profile.profile_name = {setting_profile.profile_name}")
-        if self._export_mode == ExportMode.REPORT:
+        if export_mode == ExportMode.REPORT:
             report_replacements = {
-                self.HTML_REPLACEMENT_PROJECT_TITLE: print_information.jobName,
+                self.HTML_REPLACEMENT_PROJECT_TITLE: report_details.job_name,
                 self.HTML_REPLACEMENT_PROFILE_NAME: setting_profile.profile_name,
             }
             sticky_replacements.update(report_replacements)
-        elif self._export_mode == ExportMode.COMPARE:
+        elif export_mode == ExportMode.COMPARE:
             compare_replacements = {
                 self.HTML_REPLACEMENT_PROFILE_A: catalog.i18nc("@sticky:profile_a", "Profile A"),
-                self.HTML_REPLACEMENT_PROFILE_A_NAME: self._profile_compare.profile_a.profile_name + f' ({self._profile_compare.profile_a.preset_name})',
+                self.HTML_REPLACEMENT_PROFILE_A_NAME: profile_compare.profile_a.profile_name + f' ({profile_compare.profile_a.preset_name})',
                 self.HTML_REPLACEMENT_PROFILE_B: catalog.i18nc("@sticky:profile_b", "Profile B"),
-                self.HTML_REPLACEMENT_PROFILE_B_NAME: self._profile_compare.profile_b.profile_name + f' ({self._profile_compare.profile_b.preset_name})',
-                self.HTML_REPLACEMENT_PRINTER_A_NAME: self._profile_compare.profile_a.printer_name,
-                self.HTML_REPLACEMENT_PRINTER_B_NAME: self._profile_compare.profile_b.printer_name,
+                self.HTML_REPLACEMENT_PROFILE_B_NAME: profile_compare.profile_b.profile_name + f' ({profile_compare.profile_b.preset_name})',
+                self.HTML_REPLACEMENT_PRINTER_A_NAME: profile_compare.profile_a.printer_name,
+                self.HTML_REPLACEMENT_PRINTER_B_NAME: profile_compare.profile_b.printer_name,
                 self.HTML_REPLACEMENT_DIFFERENT_SETTINGS_DEFAULT: catalog.i18nc("@button:different_settings", "Toggle different settings"),
             }
             sticky_replacements.update(compare_replacements)
         else:
-            self._export_fail = True
-            raise ValueError(f'Invalid export_mode: {self._export_mode}')
-        sticky_html: str = self._load_file_with_replacements(report_sticky_html_file if self._export_mode == ExportMode.REPORT else compare_sticky_html_file, sticky_replacements)
+            raise ValueError(f'Invalid export_mode: {export_mode}')
+        sticky_html: str = self._load_file_with_replacements(report_sticky_html_file if export_mode == ExportMode.REPORT else compare_sticky_html_file, sticky_replacements, strip_comments)
+        root_causes = profile_compare.root_causes if export_mode == ExportMode.COMPARE else None
+        if export_mode == ExportMode.COMPARE:
+            effect_settings_button = ""
+            if root_causes is not None and root_causes.causes:
+                # Its own line, like the buttons before it
+                effect_settings_button = f'\n\t\t\t\t\t<button class="{CssClasses.SETTING_VISIBILITY.full}" id="effect_settings">{html.escape(catalog.i18nc("@button:effect_settings", "Toggle differences that follow from others"))}</button>'
+            sticky_html = sticky_html.replace(self.HTML_REPLACEMENT_EFFECT_SETTINGS_BUTTON, effect_settings_button)
         #Logger.log("d", f"Sticky replacements: {sticky_replacements}")
-        start_html: str = self._load_file_with_replacements(start_html_file, start_html_replacements)
+        start_html: str = self._load_file_with_replacements(start_html_file, start_html_replacements, strip_comments)
 
         # Yes I realise it's just one line but it doesn't belong in the sticky
-        main_start_html: str = self._load_file_with_replacements(main_start_html_file, {})
+        main_start_html: str = self._load_file_with_replacements(main_start_html_file, {}, strip_comments)
 
         output_html.append(start_html)
+        lazy_page = export_context.page_format == PageFormat.LAZY
+        # Lazy pages build their rows from data, so there's no markup to make compact
+        compact_rows = export_context.compact_markup and not lazy_page
+        compact_depths: set[int] = set()
+        if compact_rows:
+            compact_html_file = os.path.abspath(os.path.join(self._plugin_dir, "html_compact.html"))
+            output_html.append(self._load_file_with_replacements(compact_html_file, {}, strip_comments))
+            compact_style_index = len(output_html)
+            output_html.append("")  # Filled in at the end when it knows which depths the rows used
         output_html.append(sticky_html)
         output_html.append(main_start_html)
 
-        if self._export_mode == ExportMode.REPORT:
+        if export_mode == ExportMode.REPORT:
             output_html.append(indent('<table "border="1" cellpadding="3">', info_indent - 1))
             # Project name
-            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Project Name"), print_information.jobName), info_indent))
+            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Project Name"), report_details.job_name), info_indent))
             # Printer name
             output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Printer"), setting_profile.printer_name), info_indent))
             # Thumbnail
-            if encoded_snapshot:
-                output_html.append(indent(f'<tr><td colspan="2"><img class="{CssClasses.THUMBNAIL.full}" src="data:image/png;base64,{encoded_snapshot}" width="300" height="300", alt="{print_information.jobName}"></td></tr>', info_indent))
+            if report_details.encoded_snapshot:
+                output_html.append(indent(f'<tr><td colspan="2"><img class="{CssClasses.THUMBNAIL.full}" src="data:image/png;base64,{report_details.encoded_snapshot}" width="300" height="300", alt="{report_details.job_name}"></td></tr>', info_indent))
             # Date/time
-            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Date/time"), formatted_date_time), info_indent))
+            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Date/time"), report_details.date_time), info_indent))
             # Cura version
             output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Cura Version"), CuraVersion), info_indent))
 
             output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Intent") if um_intent else catalog.i18nc("@label", "Profile"), preset_name), info_indent))
             # Quality profile
             output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Quality Profile"), profile_name), info_indent))
+            if setting_profile.changed_only:
+                output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Settings"), catalog.i18nc("@page:changed_only", "Only changed settings (and the settings they're under)")), info_indent))
             # Extruders enabled/materials (multiple extruders)
             if setting_profile.extruder_count > 1:
-                extruders_enabled: list = []
-                extruder_materials: list = []
-                for extruder in extruder_stack:
-                    extruders_enabled.append(extruder.getMetaDataEntry("enabled"))
-                    extruder_materials.append(extruder.material.getMetaData().get("material", ""))
                 # Enabled extruders
-                extruders_enabled_html = self._make_ol_from_list(extruders_enabled, base_indent_level = info_indent)
+                extruders_enabled_html = self._make_ol_from_list(list(report_details.extruders_enabled), base_indent_level = info_indent)
                 output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Extruders enabled"), extruders_enabled_html), info_indent))
                 # Materials
-                extruder_materials_html = self._make_ol_from_list(extruder_materials, base_indent_level = info_indent)
+                extruder_materials_html = self._make_ol_from_list(list(report_details.extruder_materials), base_indent_level = info_indent)
                 output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Extruder materials"), extruder_materials_html), info_indent))
             # Material (single extruder)
             else:
-                output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material"), extruder_stack[0].material.getMetaData().get("material", "")), info_indent))
+                output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material"), report_details.extruder_materials[0]), info_indent))
             # Material weight
-            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material weight used"), self._make_ol_from_list(list((round(x, 1) for x in print_information.materialWeights)), base_indent_level = info_indent, suffix = "g")), info_indent))
+            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material weight used"), self._make_ol_from_list(list((round(x, 1) for x in report_details.material_weights)), base_indent_level = info_indent, suffix = "g")), info_indent))
             # Material length
-            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material length used"), self._make_ol_from_list(list((round(x, 2) for x in print_information.materialLengths)), info_indent, suffix = "m")), info_indent))
+            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material length used"), self._make_ol_from_list(list((round(x, 2) for x in report_details.material_lengths)), info_indent, suffix = "m")), info_indent))
             # Material cost
-            cura_currency = str(self._preferences.getValue("cura/currency"))
-            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material cost"), self._make_ol_from_list(list((round(x, 2) for x in print_information.materialCosts)), info_indent, prefix = cura_currency)), info_indent))
+            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Material cost"), self._make_ol_from_list(list((round(x, 2) for x in report_details.material_costs)), info_indent, prefix = report_details.currency)), info_indent))
             # Printing time
-            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Estimated print time"), print_information.currentPrintTime.getDisplayString(DurationFormat.Format.Long)), info_indent))
+            output_html.append(indent(self._make_tr_2_cells(catalog.i18nc("@label", "Estimated print time"), report_details.print_time), info_indent))
             # Close basic information table
             output_html.append(indent('</table>', info_indent - 1))
 
 
+        if root_causes is not None and root_causes.causes:
+            output_html.append(self._make_root_causes_section(root_causes, details_indent, info_indent))
+
         # Actually output from our SettingProfile
-        if self._export_mode == ExportMode.REPORT:
-            for category, category_settings in setting_profile.settings.items():
-                category_label = setting_profile.settings_labels[category]
-
-                details_open = True  # Almost always true
-                if category == "dual" and setting_profile.extruder_count == 1:
-                    details_open = False
-                output_html.append(self._make_category_header(category_label, setting_profile.extruder_count, details_indent, category, details_open))
-                for setting in category_settings:
-                    output_html.append(self._make_category_setting_row(setting, setting_indent))
-                output_html.append(self._make_category_footer(details_indent))
-        elif self._export_mode == ExportMode.COMPARE:
-            for category, category_settings in self._profile_compare.category_keys.items():
-                # If you've changed your language between profiles you'll have to live with your first choice
-                category_label = self._profile_compare.profile_a.settings_labels[category]
-
-                details_open = True  # Almost always true
-                if category == "dual" and setting_profile.extruder_count == 1:
-                    details_open = False
-                output_html.append(self._make_category_header(category_label, self._profile_compare.total_extruders, details_indent, category, details_open))
-                for setting in category_settings:
-                    output_html.append(self._profile_compare.make_setting_row(category, setting, setting_indent))
-                output_html.append(self._make_category_footer(details_indent))
+        if export_mode == ExportMode.REPORT:
+            page_categories = [(category, setting_profile.settings_labels[category], setting_profile.extruder_count)
+                               for category in setting_profile.settings]
+        elif export_mode == ExportMode.COMPARE:
+            # If you've changed your language between profiles you'll have to live with your first choice
+            page_categories = [(category, profile_compare.profile_a.settings_labels[category], profile_compare.total_extruders)
+                               for category in profile_compare.category_keys]
+
+        # Everything else that changes what a category looks like. The language is in there for the tooltips.
+        page_language = catalog.i18nc("@page:language", "en")
+        lazy_page_data = LazyPageData()
+        search_index: list[str] = []
+        minified_parts: set[int] = set()  # Cached categories are already minified (if the page is)
+        for category, category_label, column_count in page_categories:
+            details_open = True  # Almost always true
+            if (category == "dual" and setting_profile.extruder_count == 1) or lazy_page:
+                details_open = False
+            lazy_category_index = lazy_page_data.add_category() if lazy_page else None
+            cache_key = (export_context.data_source.category_fingerprint(category), column_count, export_context.language, page_language, export_mode.name,
+                         export_context.minify, export_context.page_format.name, export_context.collapse_extruders, compact_rows,
+                         details_open, lazy_category_index)
+            fragment = self._fragment_cache.get(cache_key)
+            if fragment is None:
+                fragment = self._make_category_fragment(export_context, category, category_label, column_count, details_open, lazy_category_index, compact_rows)
+                self._fragment_cache.put(cache_key, fragment)
+            if export_context.minify:
+                minified_parts.add(len(output_html))
+            output_html.append(fragment.html)
+            search_index.extend(fragment.search_entries)
+            compact_depths.update(fragment.compact_depths)
+            for setting_row in fragment.lazy_rows:
+                lazy_page_data.add_row(setting_row)
         # Get settings for each extruder
         #extruder_settings, extruder_label = self._get_category_settings_list("machine_settings", extruder_stack, i18n_extruder_catalog)
         #output_html.append(self._make_category_header(extruder_label, details_indent, "machine_settings"))
@@ -969,9 +2822,10 @@ class HTMLSettingsExportReborn(Extension):
         #    output_html.append(self._make_category_setting_row(setting, setting_indent))
         #output_html.append(self._make_category_footer(details_indent))
 
-        if self._export_mode == ExportMode.REPORT:
-            scripts_list = global_stack.getMetaDataEntry("post_processing_scripts")
+        if export_mode == ExportMode.REPORT:
+            scripts_list = report_details.post_processing_scripts
             if scripts_list :
+                import configparser  # The script lists are stored in metadata as serialised config files.
                 # Get post-processing scripts
                 output_html.append(self._make_category_header(catalog.i18nc("@label", "Post-processing scripts"), setting_profile.extruder_count, details_indent, "post_processing_scripts", two_column=True, two_column_titles=[catalog.i18nc("@settings:post_name", "Post-processor name"), catalog.i18nc("@settings:post_settings", "Post-processor settings")]))
                 for script_str in scripts_list.split("\n"):
@@ -996,6 +2850,7 @@ class HTMLSettingsExportReborn(Extension):
                 output_html.append(self._make_category_footer(details_indent))
 
         end_html_file = os.path.abspath(os.path.join(self._plugin_dir, "html_end.html"))
+        lazy_html_file = os.path.abspath(os.path.join(self._plugin_dir, "html_lazy.html"))
         end_html_replacements: dict[str, str] = {
             self.HTML_REPLACEMENT_DISABLED_SETTINGS_DISABLED: catalog.i18nc("@button:settings_disabled_disabled", "Hide disabled settings"),
             self.HTML_REPLACEMENT_DISABLED_SETTINGS_ENABLED: catalog.i18nc("@button:settings_disabled_enabled", "Show disabled settings"),
@@ -1005,20 +2860,87 @@ class HTMLSettingsExportReborn(Extension):
             self.HTML_REPLACEMENT_LOCAL_CHANGES_ENABLED: catalog.i18nc("@button:settings_local_enabled", "Remove user changes filter"),
             self.HTML_REPLACEMENT_DIFFERENT_SETTINGS_DISABLED: catalog.i18nc("@button:settings_different_disabled", "Filter to only different settings"),
             self.HTML_REPLACEMENT_DIFFERENT_SETTINGS_ENABLED: catalog.i18nc("@button:settings_different_enabled", "Remove different settings filter"),
+            self.HTML_REPLACEMENT_EFFECT_SETTINGS_DISABLED: catalog.i18nc("@button:settings_effect_disabled", "Hide differences that follow from others"),
+            self.HTML_REPLACEMENT_EFFECT_SETTINGS_ENABLED: catalog.i18nc("@button:settings_effect_enabled", "Show differences that follow from others"),
         }
 
-        end_html = self._load_file_with_replacements(end_html_file, end_html_replacements)
+        end_html = self._load_file_with_replacements(end_html_file, end_html_replacements, strip_comments)
 
+        if compact_rows:
+            output_html[compact_style_index] = self._get_row_renderer(export_context.language).make_compact_style(compact_depths)
+        output_html.append(indent(make_search_index_script(search_index), details_indent - 1))
+        if lazy_page:
+            output_html.append(indent(lazy_page_data.make_script(), details_indent - 1))
+            output_html.append(self._load_file_with_replacements(lazy_html_file, {}, strip_comments))
         output_html.append(end_html)
+        if export_context.minify:
+            # Everything but the categories, which got minified on their way into the cache
+            with export_context.export_timer.phase("minify"):
+                output_html = [line if index in minified_parts else self._minify_css_class_names(line) for index, line in enumerate(output_html)]
         # Get rid of any blank lines
         output_html = [line for line in output_html if line.strip() != ""]
         
         output_html = "\n".join(output_html)
-        if self._minify_output:
-            output_html = self._minify_css_classes(output_html)
+        export_context.export_timer.set_output_size("render", output_html)
+        if export_context.minify:
+            with export_context.export_timer.phase("minify"):
+                output_html = self._add_css_class_reference(output_html)
+            export_context.export_timer.set_output_size("minify", output_html)
         return output_html
         
 
+    def _get_row_renderer(self, language: Optional[str]) -> SettingRowRenderer:
+        row_renderer = self._row_renderers.get(language)
+        if row_renderer is None:
+            row_renderer = self._row_renderers.setdefault(language, SettingRowRenderer())  # Whichever thread gets there first
+        return row_renderer
+
+    def _make_category_fragment(self, export_context: ExportContext, category: str, category_label: str, column_count: int,
+                                details_open: bool, lazy_category_index: Optional[int], compact_rows: bool) -> CategoryFragment:
+        """Renders one category's <details> block (and its search index entries) from scratch"""
+        row_renderer = self._get_row_renderer(export_context.language)
+        # Indent level for each <details> block
+        # html > body > div
+        details_indent: int = 3
+        # Indent level for each setting row
+        # html > body > div > details > table > tbody
+        setting_indent: int = 6
+        profile_compare = export_context.profile_compare
+        if export_context.export_mode == ExportMode.REPORT:
+            setting_rows = [row for setting in export_context.setting_profile.settings[category]
+                            for row in row_renderer.make_report_rows(setting, export_context.collapse_extruders)]
+        else:
+            setting_rows = [row for row in (row_renderer.make_compare_row(profile_compare, category, setting, export_context.collapse_extruders)
+                                            for setting in profile_compare.category_keys[category]) if row is not None]
+
+        lazy_page = lazy_category_index is not None
+        html_parts: list[str] = [self._make_category_header(category_label, column_count, details_indent, category, details_open,
+                                                            lazy_category_index = lazy_category_index, profile_compare = profile_compare)]
+        search_entries: list[str] = []
+        compact_depths: set[int] = set()
+        for setting_row in setting_rows:
+            search_entries.append(search_index_entry(setting_row.label, setting_row.key, [cell[0] for cell in setting_row.cells]))
+            if lazy_page:
+                continue  # These go in the page data instead
+            elif compact_rows:
+                compact_depths.add(setting_row.child_level)
+                html_parts.append(row_renderer.make_compact_row_html(setting_row))
+            else:
+                html_parts.append(row_renderer.make_row_html(setting_row, setting_indent))
+        if lazy_page:
+            # The placeholder needs to know what's in the category, and a throwaway LazyPageData is the thing that knows
+            placeholder_data = LazyPageData()
+            placeholder_data.add_category()
+            for setting_row in setting_rows:
+                placeholder_data.add_row(setting_row)
+            html_parts.append(indent(placeholder_data.make_placeholder_row(0), setting_indent))
+        html_parts.append(self._make_category_footer(details_indent, lazy = lazy_page))
+        fragment_html = "\n".join(part for part in html_parts if part.strip() != "")
+        if export_context.minify:
+            with export_context.export_timer.phase("minify"):
+                fragment_html = self._minify_css_class_names(fragment_html)
+        return FragmentCache.make_fragment(fragment_html, search_entries, compact_depths, setting_rows if lazy_page else [])
+
     def _single_extruder_skip_setting(self, setting_name: str, setting_value: any) -> bool:
         """
         Determines if a setting should be skipped in the HTML output,
@@ -1044,9 +2966,10 @@ class HTMLSettingsExportReborn(Extension):
 
         return False
 
-    def _make_category_header(self, text: str, extruder_count: int, base_indent: int, category_key: str, details_open: bool = True, two_column: bool = False, two_column_titles: list[str] = None) -> str:
+    def _make_category_header(self, text: str, extruder_count: int, base_indent: int, category_key: str, details_open: bool = True, two_column: bool = False, two_column_titles: list[str] = None, lazy_category_index: Optional[int] = None, profile_compare: Optional[CompareProfiles] = None) -> str:
         category_header: list[str] = []
-        category_header.append(indent(f'<details class="{CssClasses.COLLAPSIBLE_SETTING.full} setting-{category_key}"{" open" if details_open else ""}>', base_indent))
+        lazy_attribute = f' data-lazy-category="{lazy_category_index}"' if lazy_category_index is not None else ""
+        category_header.append(indent(f'<details class="{CssClasses.COLLAPSIBLE_SETTING.full} setting-{category_key}"{lazy_attribute}{" open" if details_open else ""}>', base_indent))
         category_header.append(indent(f'<summary class="{CssClasses.CATEGORY_HEADER.full}"><h2>{html.escape(text)}</h2></summary>', base_indent + 1))
         category_header.append(indent(f'<table class="{CssClasses.CATEGORY.full}">', base_indent + 1))
         category_header.append(indent('<thead>', base_indent + 2))
@@ -1067,10 +2990,9 @@ class HTMLSettingsExportReborn(Extension):
             two_column_titles = [item if isinstance(item, str) else "" for item in two_column_titles]
             for title in two_column_titles:
                 category_header.append(indent(f'<th>{html.escape(title)}</th>', base_indent + 4))
-        elif self._export_mode == ExportMode.COMPARE:
-            category_header.extend(self._profile_compare.make_th_cells(base_indent + 4))
+        elif profile_compare is not None:
+            category_header.extend(profile_compare.make_th_cells(base_indent + 4))
         else:
-            # If self_export_mode wasn't valid it should have raised an exception well before now
             category_header.append(indent(f'<th>{html.escape(catalog.i18nc("@setting:label", "Setting"))}</th>', base_indent + 4))
             for i in range(extruder_count):
                 category_header.append(indent(f'<th>{html.escape(catalog.i18nc("@settings:extruder", "Extruder"))} #{i + 1}</th>', base_indent + 4))
@@ -1079,33 +3001,24 @@ class HTMLSettingsExportReborn(Extension):
         category_header.append(indent('<tbody>', base_indent + 2))
         return "\n".join(category_header)
 
-    def _make_category_setting_row(self, setting: CategorySetting, base_indent: int = 0) -> str:
-        if setting.skip:
-            return ""
-        row_css_class = self.get_css_row_class(setting.css_class)
-        category_setting_html_lines: list[str] = []
-        category_setting_html_lines.append(indent(f'<tr class="{CssClasses.SETTING_ROW.full}{(" " + row_css_class) if row_css_class else ""}">', base_indent))
-        cell_tooltip = setting.internal_representation()
-        child_prefix = self.CHILD_SPACER * setting.child_level
-        category_setting_html_lines.append(indent(f'<td title="{html.escape(cell_tooltip)}" class="{CssClasses.SETTING_LABEL.full}">{child_prefix}{html.escape(setting.label)}</td>', base_indent + 1))
-        for i, value in enumerate(setting.value):
-            if setting.error_class[i]:
-                cell_class = setting.error_class[i]
-            elif setting.css_class[i]:
-                cell_class = setting.css_class[i]
-            else:
-                cell_class = ""
-            class_tooltip = self.css_class_to_human_readable(cell_class if cell_class else row_css_class)
-            display_value = html.escape(value.replace("<br>", "\n")).replace("\n", "<br>")  # For when you want a safely escaped value which is subsequently unescaped.
-            category_setting_html_lines.append(indent(f'<td class="{cell_class + (" " + CssClasses.SETTING_VALUE.full) if cell_class else CssClasses.SETTING_VALUE.full}" title="{html.escape(class_tooltip)}">{display_value}</td>', base_indent + 1))
-        category_setting_html_lines.append(indent('</tr>', base_indent))
-        for child_key in setting.children:
-            if setting.children[child_key] is not None:  # Shouldn't be None, but in case it is
-                category_setting_html_lines.append(self._make_category_setting_row(setting.children[child_key], base_indent))
-        return "\n".join(category_setting_html_lines)
-
-    def _make_category_footer(self, base_indent: int):
-        return f'{indent("</tbody>", base_indent + 2)}\n{indent("</table>", base_indent + 1)}\n{indent("</details>", base_indent)}'
+    def _make_root_causes_section(self, root_causes, details_indent: int, row_indent: int) -> str:
+        """A table of each difference that others follow from, and what follows from it"""
+        section_html: list[str] = [self._make_category_header(catalog.i18nc("@label", "What changed what"), 0, details_indent, "root_causes", two_column = True,
+                                                              two_column_titles = [catalog.i18nc("@root_causes:cause", "Setting"),
+                                                                                   catalog.i18nc("@root_causes:effects", "Also different because of it")])]
+        for root, effects in root_causes.roots.items():
+            if not effects:
+                continue
+            # They're all differences, so they stay when the table's filtered down to those
+            section_html.append(self._make_tr_2_cells(html.escape(root_causes.label(root)), html.escape(", ".join(root_causes.label(effect) for effect in effects)),
+                                                      row_indent + 1, CssClasses.COMPARE_DIFFERENT.full))
+        section_html.append(self._make_category_footer(details_indent))
+        return "\n".join(section_html)
+
+    def _make_category_footer(self, base_indent: int, lazy: bool = False):
+        # Lazy pages watch for this scrolling into view to know when to add more rows
+        lazy_sentinel = f'\n{indent(f"<div class={chr(34)}{CssClasses.LAZY_SENTINEL.full}{chr(34)}></div>", base_indent + 1)}' if lazy else ""
+        return f'{indent("</tbody>", base_indent + 2)}\n{indent("</table>", base_indent + 1)}{lazy_sentinel}\n{indent("</details>", base_indent)}'
 
     @staticmethod
     def get_css_row_class(classes: list[str] | str) -> str:
@@ -1142,13 +3055,15 @@ class HTMLSettingsExportReborn(Extension):
             case _:
                 return catalog.i18nc("@settings:class_fallthrough", "")
 
-    def _get_category_settings_list(self, category_key: str, extruder_stack, profile: SettingProfile, local_catalog: i18nCatalog, children_local_stack: bool = False) -> tuple[list[CategorySetting], str]:
+    def _get_category_settings_list(self, category_key: str, extruder_stack, profile: SettingProfile, catalog_name: str, children_local_stack: bool = False,
+                                    wanted_keys: Optional[set[str]] = None) -> tuple[list[CategorySetting], str]:
         # Get translated category name... just make sure we're in a category
         translation_key = category_key + " label"
         category_translated = category_key  # We'll get value in a second, just use key as a fallback
         if extruder_stack[0].getProperty(category_key, "type") == "category":
             category_label = extruder_stack[0].getProperty(category_key, "label")
-            category_translated = local_catalog.i18nc(translation_key, category_label)
+            profile.settings_labels_source[category_key] = label_source = get_source_text(catalog_name, translation_key, category_label)
+            category_translated = label_source.translate()
         else:
             # This should only be run on the top level of categories
             return ([], "")
@@ -1163,13 +3078,17 @@ class HTMLSettingsExportReborn(Extension):
                         children_keys_list.append(child)
         else:
             children_keys_list = [child_def.key for child_def in self._application.getGlobalContainerStack().getSettingDefinition(category_key).children]
+        if wanted_keys is not None:
+            children_keys_list = [child_key for child_key in children_keys_list if child_key in wanted_keys]
 
         for child_key in children_keys_list:
-            category_settings.append(self._get_setting(child_key, category_key, extruder_stack, profile, local_catalog, 0, children_local_stack))
+            category_settings.append(self._get_setting(child_key, category_key, extruder_stack, profile, catalog_name, 0, children_local_stack, wanted_keys = wanted_keys))
 
         return (category_settings, category_translated)
 
-    def _get_setting(self, key: str, category_key: str, extruder_stack, profile: SettingProfile, local_catalog: i18nCatalog, child_level: int = 0, children_local_stack: bool = False, recursive = True) -> CategorySetting:
+    def _get_setting(self, key: str, category_key: str, extruder_stack, profile: SettingProfile, catalog_name: str, child_level: int = 0, children_local_stack: bool = False, recursive = True,
+                     wanted_keys: Optional[set[str]] = None) -> CategorySetting:
+        """Reads a setting from every extruder, and its children (just the ones in wanted_keys if there are some)"""
         setting = CategorySetting(key = key, child_level = child_level, extruder_count = len(extruder_stack))
         
         for i, extruder in enumerate(extruder_stack):
@@ -1179,10 +3098,11 @@ class HTMLSettingsExportReborn(Extension):
             if setting_value is None:
                 setting.css_class[i] = CssClasses.SETTING_DISABLED.full
                 continue
+            setting.raw_value[i] = setting_value
             # Add the label, if it isn't already there
             if not setting.label:
-                translation_key = key + " label"
-                setting.label = local_catalog.i18nc(translation_key, extruder.getProperty(key, "label"))
+                setting.label_source = get_source_text(catalog_name, key + " label", extruder.getProperty(key, "label"))
+                setting.label = setting.label_source.translate()
             
             setting_type = extruder.getProperty(key, "type")
             
@@ -1203,13 +3123,15 @@ class HTMLSettingsExportReborn(Extension):
 
             setting_string = ""
             setting_error: str = ""
+            setting_source: Optional[SourceText] = None  # If setting_string got translated
+            unit = str(extruder.getProperty(key, "unit")) if extruder.getProperty(key, "unit") else ""
             
             setting_type_str = str(setting_type)
             match setting_type_str:
                 case "optional_extruder":
                     # If it's not -1 it seems to be stringly typed... sometimes?
                     if setting_value == -1 or setting_value == "-1":
-                        setting_string = catalog.i18nc("@setting:unchanged", "Not overridden")
+                        setting_source = get_source_text(PLUGIN_CATALOG_NAME, "@setting:unchanged", "Not overridden", unit)
                     else:
                         setting_value = int(setting_value) + 1
                         setting_string = str(setting_value)
@@ -1222,11 +3144,11 @@ class HTMLSettingsExportReborn(Extension):
                     # Pretty sure all the extruder ones are one of the above types but just in case
                     if profile.extruder_count > 1 and "extruder_nr" in key:
                         if setting_value == -1:
-                            setting_string = catalog.i18nc("@setting:unchanged", "Not overridden")
+                            setting_source = get_source_text(PLUGIN_CATALOG_NAME, "@setting:unchanged", "Not overridden", unit)
                         else:
                             setting_value += 1
                             
-                    if setting_string == "":  # Skip all this if I set it to a string earlier
+                    if setting_source is None:  # Skip all this if it's not a number any more
                         if setting_type_str == "float":
                             setting_string = str(float(round(setting_value, 4))).rstrip("0").rstrip(".")  # Drop trailing zeroes and decimal point if it's a whole number
                         else:
@@ -1254,20 +3176,21 @@ class HTMLSettingsExportReborn(Extension):
                                 (maximum_value_warning is not None and setting_value > maximum_value_warning):
                                 setting_error = CssClasses.ERROR_WARNING.full
                         except (ValueError, TypeError) as e:
-                            Logger.log("e", f"Error trying to convert minimum/maximum value for {key}: {e}")
-                            Message(title = catalog.i18nc("@plugin_name", "HTML Settings Export Reborn"),
-                            text = catalog.i18nc("@export_exception", "Error while trying to save HTML settings. Please check log file.")).show()
-                            self._export_fail = True
+                            # Whoever asked for the capture tells the user, since they know what it was for
+                            raise ValueError(f"Error trying to convert minimum/maximum value for {key}: {e}") from e
                 case "enum":
-                    option_translation_key = key + "option" + str(setting_value)
                     options = extruder.getProperty(key, "options")
                     untranslated_option = options[str(setting_value)]
-                    setting_string = local_catalog.i18nc(option_translation_key, untranslated_option)
+                    setting_source = get_source_text(catalog_name, f"{key} option {setting_value}", untranslated_option, unit)
 
                 case _:
                     setting_string = str(setting_value).replace("\n", "<br>")
 
-            setting_string += str(extruder.getProperty(key, "unit")) if extruder.getProperty(key, "unit") else ""
+            if setting_source is not None:
+                setting.set_value_source(i, setting_source)
+                setting_string = setting_source.translate()
+            else:
+                setting_string += unit
             setting.value[i] = setting_string
             if setting_error:
                 setting.error_class[i] = setting_error
@@ -1286,12 +3209,31 @@ class HTMLSettingsExportReborn(Extension):
                             children_keys_list.append(child)
             else:
                 children_keys_list = [child_def.key for child_def in self._application.getGlobalContainerStack().getSettingDefinition(key).children]
+            if wanted_keys is not None:
+                children_keys_list = [child_key for child_key in children_keys_list if child_key in wanted_keys]
 
             for child_key in children_keys_list:
-                setting.children[child_key] = self._get_setting(child_key, category_key, extruder_stack, profile, local_catalog, child_level + 1, children_local_stack)
+                setting.children[child_key] = self._get_setting(child_key, category_key, extruder_stack, profile, catalog_name, child_level + 1, children_local_stack, wanted_keys = wanted_keys)
 
             return setting
 
+    def _get_encoded_thumbnail(self, export_timer: ExportTimer) -> Optional[str]:
+        """Base64 PNG of the thumbnail, if one can be had"""
+        encoded_snapshot: str = None
+        with export_timer.phase("thumbnail"):
+            snapshot = self._createSnapshot()
+            if snapshot:
+                from PyQt6.QtCore import QBuffer
+                thumbnail_buffer = QBuffer()
+                
+                thumbnail_buffer.open(QBuffer.OpenModeFlag.ReadWrite)
+                        
+                snapshot.save(thumbnail_buffer, "PNG")
+                encoded_snapshot = thumbnail_buffer.data().toBase64().data().decode("utf-8")
+        if encoded_snapshot:
+            export_timer.set_output_size("thumbnail", encoded_snapshot)
+        return encoded_snapshot
+
     @call_on_qt_thread  # must be called from the main thread because of OpenGL
     def _createSnapshot(self):
         backend = self._application.getBackend()
@@ -1303,6 +3245,7 @@ class HTMLSettingsExportReborn(Extension):
             Logger.log("w", "Can't create snapshot when renderer not initialized.")
             return None
         try:
+            from cura.Snapshot import Snapshot  # Drags in a good chunk of Cura's rendering
             snapshot = Snapshot.snapshot(width=300, height=300)
         except Exception as e:
             Logger.logException("w", f"Failed to create snapshot image: {e}")
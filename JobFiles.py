@@ -0,0 +1,173 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Digs the settings out of files Cura has written (G-code and 3MF projects) without opening them in Cura.
+# This bit doesn't need Cura at all, it just hands back Cura's own serialised containers.
+# Turning those into stacks that can actually be read is DetachedProfiles.make_job_stacks()'s job.
+
+import base64
+import configparser
+import gzip
+import hashlib
+import json
+import os
+import re
+import urllib.parse
+import zipfile
+from dataclasses import dataclass, field
+from enum import Enum, auto
+
+JOB_FILE_SUFFIXES: tuple[str, ...] = (".gcode", ".gcode.gz", ".3mf")
+
+# Cura puts its settings at the very end of G-code, 80 characters at a time, each line starting with this
+GCODE_SETTINGS_PREFIX: str = ";SETTING_3 "
+GCODE_UNESCAPES: dict[str, str] = {"\\\\": "\\", "\\n": "\n", "\\r": "\r"}
+
+
+class JobFileKind(Enum):
+    GCODE = auto()
+    PROJECT = auto()  # 3MF saved by Cura, with the whole stack in it
+
+@dataclass
+class StackFile:
+    """The interesting parts of a serialised global or extruder stack"""
+    name: str
+    metadata: dict[str, str]
+    container_ids: list[str]  # In stack order, top (user changes) first and the definition last
+
+@dataclass
+class JobFile:
+    """Settings out of a job file, still the way Cura serialised them"""
+    path: str
+    kind: JobFileKind
+    # G-code: the flattened user changes + custom profile container Cura adds for the global stack.
+    # Projects: the global stack file.
+    global_settings: str
+    extruder_settings: list[str]  # Same for each extruder, in position order
+    containers: dict[str, str] = field(default_factory = dict)  # Projects only: every instance container in the file by ID
+    header: dict[str, str] = field(default_factory = dict)  # G-code only: the ;KEY:value lines at the top
+    thumbnail: str = ""  # Base64 PNG, if there is one
+
+    @property
+    def job_name(self) -> str:
+        file_name = os.path.basename(self.path)
+        for suffix in JOB_FILE_SUFFIXES:
+            if file_name.lower().endswith(suffix):
+                return file_name[:-len(suffix)]
+        return file_name
+
+    def fingerprint(self) -> str:
+        """Changes when the settings in the file do (but not when something else does, like the print time)"""
+        settings = [self.kind.name, self.global_settings, self.extruder_settings, sorted(self.containers.items())]
+        return hashlib.sha256(json.dumps(settings, ensure_ascii = True, separators = (",", ":")).encode("ascii")).hexdigest()
+
+
+def is_job_file(file_name: str) -> bool:
+    return file_name.lower().endswith(JOB_FILE_SUFFIXES)
+
+def read_job_file(path: str) -> JobFile:
+    """Raises ValueError if there aren't any Cura settings in it, OSError if it can't be read"""
+    if path.lower().endswith(".3mf"):
+        return _read_project(path)
+    return _read_gcode(path)
+
+def parse_stack_file(serialised: str) -> StackFile:
+    parser = configparser.ConfigParser(interpolation = None)
+    try:
+        parser.read_string(serialised)
+    except configparser.Error as e:
+        raise ValueError(f"Stack file isn't valid: {e}") from e
+    if not parser.has_section("containers"):
+        raise ValueError("Stack file doesn't list any containers")
+    container_ids = [container_id for _, container_id in sorted(parser.items("containers"), key = lambda item: int(item[0]))]
+    metadata = dict(parser.items("metadata")) if parser.has_section("metadata") else {}
+    return StackFile(name = parser.get("general", "name", fallback = ""), metadata = metadata, container_ids = container_ids)
+
+def _read_project(path: str) -> JobFile:
+    global_settings = ""
+    extruders: list[tuple[int, str]] = []
+    containers: dict[str, str] = {}
+    thumbnail = ""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            for file_name in archive.namelist():
+                if file_name.lower() == "metadata/thumbnail.png":
+                    thumbnail = base64.b64encode(archive.read(file_name)).decode("ascii")
+                if not file_name.startswith("Cura/"):
+                    continue
+                if file_name.endswith(".global.cfg"):
+                    global_settings = archive.read(file_name).decode("utf-8")
+                elif file_name.endswith(".extruder.cfg"):
+                    extruder_settings = archive.read(file_name).decode("utf-8")
+                    extruders.append((int(parse_stack_file(extruder_settings).metadata.get("position", len(extruders))), extruder_settings))
+                elif file_name.endswith(".inst.cfg"):
+                    # Cura names them after their (quoted) IDs, which is the only place the ID is
+                    container_id = urllib.parse.unquote_plus(file_name[len("Cura/"):-len(".inst.cfg")])
+                    containers[container_id] = archive.read(file_name).decode("utf-8")
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"{path} isn't a 3MF file: {e}") from e
+    if not global_settings:
+        raise ValueError(f"{path} doesn't have any Cura settings in it (was it saved as a project?)")
+    return JobFile(path = path, kind = JobFileKind.PROJECT, global_settings = global_settings,
+                   extruder_settings = [settings for _, settings in sorted(extruders, key = lambda extruder: extruder[0])],
+                   containers = containers, thumbnail = thumbnail)
+
+def _read_gcode(path: str) -> JobFile:
+    if path.lower().endswith(".gz"):
+        # No going backwards in a gzip file without decompressing all of it anyway
+        with gzip.open(path, "rt", encoding = "utf-8", errors = "replace") as gcode:
+            header, thumbnail = _read_gcode_header(gcode)
+            settings_lines = [line for line in gcode if line.startswith(GCODE_SETTINGS_PREFIX)]
+    else:
+        with open(path, "r", encoding = "utf-8", errors = "replace") as gcode:
+            header, thumbnail = _read_gcode_header(gcode)
+        settings_lines = _read_gcode_tail(path)
+    if not settings_lines:
+        raise ValueError(f"{path} doesn't have any Cura settings in it")
+    serialised = "".join(line[len(GCODE_SETTINGS_PREFIX):].rstrip("\r\n") for line in settings_lines)
+    serialised = re.sub(r"\\\\|\\n|\\r", lambda match: GCODE_UNESCAPES[match.group(0)], serialised)
+    try:
+        settings = json.loads(serialised)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Settings at the end of {path} are incomplete: {e}") from e
+    return JobFile(path = path, kind = JobFileKind.GCODE, global_settings = settings.get("global_quality", ""),
+                   extruder_settings = list(settings.get("extruder_quality", [])), header = header, thumbnail = thumbnail)
+
+def _read_gcode_header(gcode) -> tuple[dict[str, str], str]:
+    """;KEY:value lines and the thumbnail (if a post-processing script put one in) from the comments at the top"""
+    header: dict[str, str] = {}
+    thumbnail_lines: list[str] = []
+    in_thumbnail = False
+    for line in gcode:
+        if not line.startswith(";"):
+            break
+        line = line[1:].strip()
+        if line.startswith("thumbnail begin"):
+            # Only the first one, which is usually the small one. Perfect for a report.
+            in_thumbnail = not thumbnail_lines
+        elif line.startswith("thumbnail end"):
+            in_thumbnail = False
+        elif in_thumbnail:
+            thumbnail_lines.append(line)
+        elif ":" in line:
+            key, _, value = line.partition(":")
+            header.setdefault(key.strip(), value.strip())
+    return header, "".join(thumbnail_lines)
+
+def _read_gcode_tail(path: str) -> list[str]:
+    """The settings lines from the end of the file, without reading the hundreds of MB of moves before them"""
+    size = os.path.getsize(path)
+    tail_size = 64 * 1024
+    with open(path, "rb") as gcode:
+        while True:
+            start = max(0, size - tail_size)
+            gcode.seek(start)
+            lines = gcode.read().decode("utf-8", errors = "replace").splitlines()
+            if start > 0:
+                lines = lines[1:]  # Probably only half a line
+            first = next((index for index, line in enumerate(lines) if line.startswith(GCODE_SETTINGS_PREFIX)), None)
+            if first is None:
+                return []  # Settings are always right at the end, so if they're not in the last bit they're not there
+            if first > 0 or start == 0:
+                return [line for line in lines[first:] if line.startswith(GCODE_SETTINGS_PREFIX)]
+            tail_size *= 4  # Started in the middle of them, go back further
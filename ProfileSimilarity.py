@@ -0,0 +1,149 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# "That print came out great, which archived job is it closest to?"
+# Every archived job becomes a row of numbers: number settings scaled from 0 to 1 across the archive, enums and bools
+# with a column for each value (one-hot). Then finding the nearest ones to the current settings is one go through NumPy
+# instead of comparing thousands of settings one job at a time.
+
+import math
+from dataclasses import dataclass, field
+
+import numpy  # Cura can't do anything without it, so it's always there
+
+from .HTMLSettingsExportReborn import SettingProfile
+from .SettingsArchive import ArchivedJob, SettingsArchive, value_json
+
+NUMERIC_TYPES: tuple[str, ...] = ("int", "float")
+# Picking an extruder is an enum as far as this is concerned. Text (like start G-code) isn't compared at all.
+CATEGORICAL_TYPES: tuple[str, ...] = ("bool", "enum", "extruder", "optional_extruder")
+# A different enum value is two columns apart, so this makes it count as much as a number going from one end of its range to the other
+ONE_HOT_VALUE: float = math.sqrt(0.5)
+
+
+@dataclass
+class SettingFeature:
+    """Where a setting (on one extruder) is in the matrix, and how to turn a value into its columns"""
+    key: str
+    position: int  # Extruder
+    column: int  # Number settings have just this column. Enums and bools have the ones in one_hot.
+    minimum: float = 0.0
+    scale: float = 0.0  # 1 / (max - min) in the archive, or 0 if every job's the same
+    fill: float = 0.0  # Scaled value for a job without it (the average, so it's not near or far from anything)
+    one_hot: dict[str, int] = field(default_factory = dict)  # Value (as stored in the archive): its column
+
+@dataclass
+class SimilarJob:
+    job: ArchivedJob
+    distance: float
+    similarity: float  # 1 is exactly the same, 0 is every setting as different as it can be
+
+    def description(self) -> str:
+        return f"{self.similarity:.1%} - {self.job.description()}"
+
+class SimilarityIndex:
+    """A row of numbers for each archived job, and how to make the same kind of row for any other profile"""
+
+    def __init__(self, jobs: list[ArchivedJob], features: list[SettingFeature], matrix: numpy.ndarray):
+        self.jobs = jobs
+        self.features = features
+        self.matrix = matrix  # float32, a row for each job
+        # Squared length of each row, so distances only need one matrix * vector
+        self._row_norms = numpy.einsum("ij,ij->i", matrix, matrix, dtype = numpy.float64)
+
+    @property
+    def job_ids(self) -> frozenset[int]:
+        return frozenset(job.job_id for job in self.jobs)
+
+    @classmethod
+    def build(cls, archive: SettingsArchive, jobs: list[ArchivedJob]) -> "SimilarityIndex":
+        job_ids = [job.job_id for job in jobs]
+        setting_keys = archive.setting_keys(job_ids)
+        rows: list[tuple[str, int, str, numpy.ndarray]] = []
+        for key_id, position, value_ids in archive.iter_matrix_rows(job_ids):
+            name, _, _, _, setting_type = setting_keys[key_id]
+            if setting_type in NUMERIC_TYPES or setting_type in CATEGORICAL_TYPES:
+                rows.append((name, position, setting_type, numpy.array(value_ids, dtype = numpy.int64)))
+        if not rows:
+            return cls(jobs, [], numpy.zeros((len(jobs), 0), dtype = numpy.float32))
+
+        # Every value the archive has for these jobs, and a lookup table from value ID to number (NaN for no number or no value)
+        used_value_ids = numpy.unique(numpy.concatenate([value_ids for *_, value_ids in rows]))
+        values = archive.setting_values([int(value_id) for value_id in used_value_ids if value_id != 0])
+        numbers = numpy.full(int(used_value_ids[-1]) + 1, numpy.nan)
+        for value_id, (_, _, number) in values.items():
+            if number is not None:
+                numbers[value_id] = number
+
+        features: list[SettingFeature] = []
+        blocks: list[numpy.ndarray] = []
+        column = 0
+        for name, position, setting_type, value_ids in rows:
+            if setting_type in NUMERIC_TYPES:
+                row_numbers = numbers[value_ids]
+                missing = numpy.isnan(row_numbers)
+                if missing.all():
+                    continue
+                minimum, maximum = float(row_numbers[~missing].min()), float(row_numbers[~missing].max())
+                scale = 1.0 / (maximum - minimum) if maximum > minimum else 0.0
+                scaled = (row_numbers - minimum) * scale
+                fill = float(scaled[~missing].mean())
+                scaled[missing] = fill
+                features.append(SettingFeature(key = name, position = position, column = column, minimum = minimum, scale = scale, fill = fill))
+                blocks.append(scaled[:, numpy.newaxis])
+                column += 1
+            else:
+                distinct = numpy.unique(value_ids[value_ids != 0])
+                if distinct.size == 0:
+                    continue
+                one_hot = {values[int(value_id)][0]: column + index for index, value_id in enumerate(distinct)}
+                features.append(SettingFeature(key = name, position = position, column = column, one_hot = one_hot))
+                blocks.append((value_ids[:, numpy.newaxis] == distinct[numpy.newaxis, :]) * ONE_HOT_VALUE)
+                column += distinct.size
+        return cls(jobs, features, numpy.hstack(blocks).astype(numpy.float32))
+
+    def vectorize(self, profile: SettingProfile) -> tuple[numpy.ndarray, int]:
+        """The profile as a row like the ones in the matrix. Also says how many of its enum/bool values no archived job has,
+        since those don't have a column to go in."""
+        vector = numpy.zeros(self.matrix.shape[1], dtype = numpy.float32)
+        settings = {key: setting for category_settings in profile.get_flattened_all_categories_dict().values()
+                    for key, setting in category_settings.items() if not setting.skip}
+        unknown_values = 0
+        for feature in self.features:
+            setting = settings.get(feature.key)
+            has_value = setting is not None and feature.position < len(setting.raw_value)
+            raw_value = setting.raw_value[feature.position] if has_value else None
+            if feature.one_hot:
+                if has_value:
+                    value_column = feature.one_hot.get(value_json(raw_value))
+                    if value_column is None:
+                        unknown_values += 1
+                    else:
+                        vector[value_column] = ONE_HOT_VALUE
+            elif has_value and isinstance(raw_value, (int, float)) and not isinstance(raw_value, bool):
+                if feature.scale:
+                    vector[feature.column] = min(max((raw_value - feature.minimum) * feature.scale, 0.0), 1.0)
+                else:
+                    # Everything in the archive is the same, so this is either exactly that or as different as it gets
+                    vector[feature.column] = 0.0 if raw_value == feature.minimum else 1.0
+            else:
+                vector[feature.column] = feature.fill
+        return vector, unknown_values
+
+    def nearest(self, profile: SettingProfile, count: int = 5, exclude_job_ids: frozenset[int] = frozenset()) -> list[SimilarJob]:
+        """The count archived jobs closest to profile, closest first"""
+        if not self.jobs or not self.features:
+            return []
+        vector, unknown_values = self.vectorize(profile)
+        # |row - vector|² = |row|² - 2 row.vector + |vector|², for every row at once.
+        # A value no job has is half a one-hot apart from every job (the other half's in the row).
+        distances = self._row_norms - 2.0 * (self.matrix @ vector) + float(vector @ vector) + unknown_values * ONE_HOT_VALUE ** 2
+        numpy.maximum(distances, 0.0, out = distances)  # Rounding can make a perfect match a tiny bit negative
+        for index, job in enumerate(self.jobs):
+            if job.job_id in exclude_job_ids:
+                distances[index] = numpy.inf
+        count = min(count, len(self.jobs))
+        nearest = numpy.argpartition(distances, count - 1)[:count]
+        nearest = nearest[numpy.argsort(distances[nearest], kind = "stable")]
+        return [SimilarJob(job = self.jobs[index], distance = math.sqrt(distances[index]), similarity = max(0.0, 1.0 - float(distances[index]) / len(self.features)))
+                for index in nearest if numpy.isfinite(distances[index])]
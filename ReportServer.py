@@ -0,0 +1,207 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# A little web server for reports, so looking at one doesn't mean writing a file (and another, and another...)
+# and people on other computers can look too. Pages only get made when someone asks for them, and the last few
+# get kept (gzipped as well) so asking again is instant. Browsers get an ETag, so if they've already got the
+# page they get told so instead of getting it all over again.
+# What each URL actually is gets decided by the extension. This is just the HTTP part.
+
+import gzip
+import hashlib
+import html
+import socket
+import threading
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from UM.Logger import Logger
+
+from .HTMLSettingsExportReborn import FragmentCache
+
+
+@dataclass(frozen = True)
+class ServedSource:
+    """How to make a page someone asked for"""
+    render: Callable[[], str]
+    # Of everything that goes in the page, so it can be checked against the cache (and the browser's copy) before making it.
+    # None means it gets made every time, and the ETag comes from the page itself.
+    fingerprint: Optional[str] = None
+
+@dataclass(frozen = True)
+class ServedPage:
+    etag: str
+    body: bytes
+    gzipped: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzipped)
+
+class PageCache(FragmentCache):
+    """Recently served pages. Same least-recently-used-goes-first as the category fragments, just bigger things in it."""
+
+    MAX_BYTES: int = 64 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        super().__init__(max_bytes)
+
+# Finds the page for a path and its query parameters. None for "no such page".
+# Raises KeyError for things that don't exist (like a job ID that's not in the archive) and ValueError for nonsense.
+PageFinder = Callable[[str, dict[str, str]], Optional[ServedSource]]
+
+
+def make_served_page(page: str, etag: Optional[str] = None) -> ServedPage:
+    body = page.encode("utf-8")
+    if etag is None:
+        etag = hashlib.sha256(body).hexdigest()
+    # mtime 0 so the same page always gzips to the same bytes
+    return ServedPage(etag = etag, body = body, gzipped = gzip.compress(body, compresslevel = 6, mtime = 0))
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header says the browser already has this ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]  # Weak or not, same page
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip. "gzip;q=0" is a (very polite) no."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, parameters = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            parameter_name, _, parameter_value = parameter.partition("=")
+            if parameter_name.strip().lower() == "q":
+                try:
+                    quality = float(parameter_value)
+                except ValueError:
+                    pass
+        return quality > 0
+    return False
+
+
+class ReportServer:
+    """Serves whatever find_page comes up with, on its own threads, until it's stopped"""
+
+    def __init__(self, find_page: PageFinder, host: str, port: int):
+        self.find_page = find_page
+        self.page_cache = PageCache()
+        self._http_server = ThreadingHTTPServer((host, port), _ReportRequestHandler)
+        self._http_server.daemon_threads = True  # Don't keep Cura open for someone's half finished download
+        self._http_server.report_server = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._http_server.server_address[:2]
+        if host in ("0.0.0.0", ""):
+            host = socket.gethostname()  # Listening on everything, so this is what anyone else would use
+        elif host == "127.0.0.1":
+            host = "localhost"
+        return f"http://{host}:{port}/"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target = self._http_server.serve_forever, name = "HTMLSettingsExportServer", daemon = True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Waits for it to stop listening (up to half a second), but not for anything it's in the middle of sending"""
+        if self._thread is not None:
+            self._http_server.shutdown()
+            self._thread = None
+        self._http_server.server_close()
+        self.page_cache.clear()
+
+    def get_page(self, path: str, parameters: dict[str, str], if_none_match: Optional[str]) -> tuple[HTTPStatus, Optional[ServedPage], Optional[str]]:
+        """The status, the page (if there's one to send) and the ETag (if there is one)"""
+        source = self.find_page(path, parameters)
+        if source is None:
+            return HTTPStatus.NOT_FOUND, None, None
+        if source.fingerprint is not None:
+            if etag_matches(if_none_match, source.fingerprint):
+                return HTTPStatus.NOT_MODIFIED, None, source.fingerprint  # Didn't even have to make it
+            served_page = self.page_cache.get(source.fingerprint)
+            if served_page is None:
+                served_page = make_served_page(source.render(), source.fingerprint)
+                self.page_cache.put(source.fingerprint, served_page)
+        else:
+            served_page = make_served_page(source.render())
+        if etag_matches(if_none_match, served_page.etag):
+            return HTTPStatus.NOT_MODIFIED, None, served_page.etag
+        return HTTPStatus.OK, served_page, served_page.etag
+
+
+class _ReportRequestHandler(BaseHTTPRequestHandler):
+    server_version = "HTMLSettingsExportReborn"
+
+    def do_GET(self) -> None:
+        self._respond(send_body = True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body = False)
+
+    def _respond(self, send_body: bool) -> None:
+        report_server: ReportServer = self.server.report_server
+        url = urlsplit(self.path)
+        # Only the first of each, nobody needs /compare?a=1&a=2
+        parameters = {name: values[0] for name, values in parse_qs(url.query).items()}
+        try:
+            status, served_page, etag = report_server.get_page(url.path, parameters, self.headers.get("If-None-Match"))
+        except KeyError as e:
+            self._send_error(HTTPStatus.NOT_FOUND, str(e).strip("'\""), send_body)
+            return
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e), send_body)
+            return
+        except Exception as e:
+            Logger.logException("e", f"Report server couldn't make a page for {self.path}: {e}")
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Couldn't make that page, please check the log file.", send_body)
+            return
+        if status == HTTPStatus.NOT_FOUND:
+            self._send_error(status, f"There's nothing at {url.path}", send_body)
+            return
+
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", f'"{etag}"')
+        # Check with the server every time, which is cheap thanks to the ETag
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if served_page is None:
+            self.end_headers()
+            return
+        body = served_page.body
+        if accepts_gzip(self.headers.get("Accept-Encoding")):
+            body = served_page.gzipped
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, send_body: bool) -> None:
+        body = f"<!DOCTYPE html><html><head><meta charset='UTF-8'><title>{status.value} {status.phrase}</title></head><body><p>{html.escape(message)}</p></body></html>".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # The default goes to stderr, which nobody using Cura is looking at
+        Logger.log("d", f"Report server: {self.address_string()} {format % args}")
@@ -0,0 +1,103 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Change the layer height and a few dozen other settings change with it, because their values are worked out
+# from it. In a comparison that's a few dozen "different" rows and no way to tell which one you actually changed.
+# This turns the relations in a machine's setting definitions into a graph of what depends on what (once per
+# definition, it doesn't change while Cura's running) and uses it to split the differences into the ones that
+# were changed (or at least aren't explained by anything else) and the ones that just followed along.
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Relations for these properties change a setting's value. The rest (enabled, minimum_value, etc.) don't.
+VALUE_ROLES: tuple[str, ...] = ("value", "resolve")
+
+
+@dataclass(frozen = True)
+class RootCauses:
+    """Which of the differences between two profiles are causes and which are effects"""
+    # Differences that aren't explained by another one, with the differences that follow from them (in the order they were found)
+    roots: dict[str, tuple[str, ...]] = field(default_factory = dict)
+    # Differences that follow from another one, with the roots they follow from
+    causes: dict[str, tuple[str, ...]] = field(default_factory = dict)
+    # Labels for everything in either of them, so pages can name them without looking for them again
+    labels: dict[str, str] = field(default_factory = dict)
+
+    def fingerprint_details(self, key: str) -> list[Any]:
+        """Everything about one setting's part in this that ends up in a page"""
+        return [len(self.roots.get(key, ())), self.causes.get(key, ())]
+
+    def label(self, key: str) -> str:
+        return self.labels.get(key, key)
+
+
+class DependencyGraph:
+    """What each setting's value depends on, turned around: for each setting, the settings worked out from it"""
+
+    def __init__(self, dependents: dict[str, tuple[str, ...]]):
+        self.dependents = dependents
+
+    @classmethod
+    def from_definitions(cls, definitions: Iterable) -> "DependencyGraph":
+        """Builds it from SettingDefinitions (like DefinitionContainer.findDefinitions() gives you)"""
+        from UM.Settings.SettingRelation import RelationType
+        dependents: dict[str, list[str]] = {}
+        for definition in definitions:
+            for relation in definition.relations:
+                # Every relation's there from both ends, so only look at one of them
+                if relation.type != RelationType.RequiresTarget or relation.role not in VALUE_ROLES:
+                    continue
+                target_dependents = dependents.setdefault(relation.target.key, [])
+                if definition.key not in target_dependents:
+                    target_dependents.append(definition.key)
+        return cls({key: tuple(keys) for key, keys in dependents.items()})
+
+    def _follows_from(self, key: str, differing: dict[str, None], changed_keys: set[str], known_keys: set[str]) -> list[str]:
+        """The differences downstream of a setting. Only goes through other differences (something that came out
+        the same can't pass a difference on) or settings that weren't captured (which could be either)."""
+        found: list[str] = []
+        seen = {key}
+        queue = deque([key])
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                # Something that was set by hand isn't following anything, whatever it depends on
+                if dependent in seen or dependent in changed_keys:
+                    continue
+                seen.add(dependent)
+                if dependent in differing:
+                    found.append(dependent)
+                    queue.append(dependent)
+                elif dependent not in known_keys:
+                    queue.append(dependent)
+        return found
+
+    def find_root_causes(self, differing_keys: Iterable[str], changed_keys: set[str], known_keys: set[str], labels: dict[str, str]) -> RootCauses:
+        """Splits differing_keys into roots and the effects that follow from them.
+        changed_keys were set by hand (in either profile) so they're always roots.
+        known_keys is everything that was compared, different or not."""
+        differing = dict.fromkeys(differing_keys)  # Ordered, so roots come out in page order
+        follows_from = {key: self._follows_from(key, differing, changed_keys, known_keys) for key in differing}
+        explained = {effect for effects in follows_from.values() for effect in effects}
+
+        roots: dict[str, tuple[str, ...]] = {}
+        causes: dict[str, list[str]] = {}
+
+        def add_root(root: str) -> None:
+            roots[root] = tuple(effect for effect in follows_from[root] if effect not in roots)
+            for effect in roots[root]:
+                causes.setdefault(effect, []).append(root)
+
+        for key in differing:
+            if key not in explained:
+                add_root(key)
+        # Settings that depend on each other in a circle explain each other, and then nothing explains them.
+        # The first one of each circle gets to be the root.
+        for key in differing:
+            if key not in roots and key not in causes:
+                add_root(key)
+
+        involved = set(roots) | set(causes)
+        return RootCauses(roots = roots, causes = {effect: tuple(root_keys) for effect, root_keys in causes.items()},
+                          labels = {key: labels.get(key, key) for key in involved})
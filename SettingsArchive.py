@@ -0,0 +1,449 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Optional archive of every capture in a SQLite database, so "which jobs last quarter used more than 30% infill
+# with tree supports?" is a query instead of an afternoon of opening HTML files.
+# Setting keys are just names. Where each one sat in a capture's tree and what it was called then is that capture's layout,
+# shared by every capture with exactly the same one, so old jobs still come back the way they were captured after
+# Cura's language changes or a different machine gets archived.
+
+import hashlib
+import json
+import re
+import sqlite3
+from array import array
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from .DataExport import SETTING_STATES, VALUE_STATES
+from .HTMLSettingsExportReborn import CategorySetting, CssClasses, SettingProfile, fingerprint_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS machine (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS job (
+    id INTEGER PRIMARY KEY,
+    job_name TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    machine_id INTEGER NOT NULL REFERENCES machine(id),
+    profile_name TEXT NOT NULL,
+    preset_name TEXT NOT NULL,
+    extruder_count INTEGER NOT NULL,
+    layout_id INTEGER NOT NULL REFERENCES layout(id),
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS extruder (
+    id INTEGER PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES job(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS setting_key (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS layout (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS layout_key (
+    layout_id INTEGER NOT NULL REFERENCES layout(id),
+    key_id INTEGER NOT NULL REFERENCES setting_key(id),
+    category_id INTEGER NOT NULL REFERENCES setting_key(id),
+    parent_id INTEGER REFERENCES setting_key(id),
+    position INTEGER NOT NULL,
+    child_level INTEGER NOT NULL,
+    setting_type TEXT NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (layout_id, key_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS setting_value (
+    id INTEGER PRIMARY KEY,
+    raw_json TEXT NOT NULL,
+    display TEXT NOT NULL,
+    text TEXT,
+    number REAL,
+    UNIQUE (raw_json, display)
+);
+CREATE TABLE IF NOT EXISTS setting_state (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS setting (
+    extruder_id INTEGER NOT NULL REFERENCES extruder(id) ON DELETE CASCADE,
+    key_id INTEGER NOT NULL REFERENCES setting_key(id),
+    value_id INTEGER NOT NULL REFERENCES setting_value(id),
+    state_id INTEGER NOT NULL REFERENCES setting_state(id),
+    value_state_id INTEGER REFERENCES setting_state(id)
+);
+CREATE INDEX IF NOT EXISTS job_captured_at ON job(captured_at);
+CREATE INDEX IF NOT EXISTS job_name_fingerprint ON job(job_name, fingerprint);
+CREATE INDEX IF NOT EXISTS extruder_job ON extruder(job_id);
+CREATE INDEX IF NOT EXISTS setting_key_value ON setting(key_id, value_id);
+CREATE INDEX IF NOT EXISTS setting_extruder ON setting(extruder_id);
+CREATE INDEX IF NOT EXISTS setting_value_number ON setting_value(number);
+CREATE INDEX IF NOT EXISTS setting_value_text ON setting_value(text);
+"""
+
+# What the query operators are in SQL. "~" is "contains", because nobody wants to type LIKE '%tree%'.
+QUERY_OPERATORS: dict[str, str] = {"=": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "~": "LIKE"}
+# Conditions on the job instead of a setting
+JOB_FIELDS: tuple[str, ...] = ("since", "until", "machine", "job")
+# Everything an ArchivedJob gets made from, in order
+JOB_COLUMNS: str = "job.id, job.job_name, job.captured_at, machine.name, job.profile_name, job.preset_name, job.extruder_count, job.fingerprint"
+
+# State names back into CSS classes for rebuilding profiles
+SETTING_STATE_CLASSES: dict[str, str] = {state: css_class for css_class, state in SETTING_STATES.items()}
+VALUE_STATE_CLASSES: dict[str, str] = {state: css_class for css_class, state in VALUE_STATES.items()}
+
+
+@dataclass
+class ArchivedJob:
+    """One capture in the archive"""
+    job_id: int
+    job_name: str
+    captured_at: str
+    machine_name: str
+    profile_name: str
+    preset_name: str
+    extruder_count: int
+    fingerprint: str = ""  # Of the settings (see SettingProfile.fingerprint())
+
+    def description(self) -> str:
+        return f"{self.job_name} - {self.profile_name} ({self.machine_name}, {self.captured_at.replace('T', ' ')})"
+
+@dataclass
+class ArchiveQuery:
+    """What to look for. A job matches if every condition matches on at least one of its extruders."""
+    # (setting key, operator from QUERY_OPERATORS, value)
+    conditions: list[tuple[str, str, Any]] = field(default_factory = list)
+    since: Optional[str] = None  # ISO date/time, compared as text so "2025-07" works too
+    until: Optional[str] = None
+    machine: Optional[str] = None  # Part of the name is enough
+    job: Optional[str] = None
+
+    @classmethod
+    def parse(cls, query_text: str) -> "ArchiveQuery":
+        """Turns something like "infill_sparse_density > 30, support_structure = tree, since 2025-07-01" into a query.
+        Raises ValueError if it can't make sense of it."""
+        query = cls()
+        for part in re.split(r",|\band\b", query_text):
+            part = part.strip()
+            if not part:
+                continue
+            match = re.fullmatch(r"([\w.]+)\s*(<=|>=|!=|=|<|>|~)?\s*(.*)", part)
+            if match is None or not match.group(3):
+                raise ValueError(f"Don't know what to do with \"{part}\"")
+            key, operator, value = match.group(1), match.group(2) or "=", match.group(3).strip().strip("\"'")
+            if key in JOB_FIELDS:
+                setattr(query, key, value)
+            else:
+                query.conditions.append((key, operator, parse_query_value(value)))
+        return query
+
+def parse_query_value(value: str) -> Any:
+    """Numbers become numbers and true/false become bools, so they get compared like the real values"""
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+def value_json(raw_value: Any) -> str:
+    """How a raw value is stored, so the same value always comes out as the same string"""
+    return json.dumps(raw_value, ensure_ascii = False, sort_keys = True, default = str)
+
+def _value_text_and_number(raw_value: Any) -> tuple[Optional[str], Optional[float]]:
+    """How a value gets compared: numbers (and bools) as numbers, everything else as text"""
+    if raw_value is None:
+        return None, None
+    if isinstance(raw_value, (bool, int, float)):
+        return json.dumps(raw_value), float(raw_value)
+    return str(raw_value), None
+
+def _iter_archive_settings(category_settings: list[CategorySetting], parent_key: Optional[str] = None) -> Iterator[tuple[CategorySetting, Optional[str]]]:
+    # Skipped settings don't go in the HTML or the data exports so they don't go in here either
+    for setting in category_settings:
+        if setting is None or setting.skip:
+            continue
+        yield setting, parent_key
+        yield from _iter_archive_settings(list(setting.children.values()), setting.key)
+
+
+class SettingsArchive:
+    """The archive database. Connects for each thing it does, so it doesn't matter which thread asks."""
+
+    def __init__(self, database_path: str):
+        self._database_path = database_path
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._database_path)
+        connection.execute("PRAGMA foreign_keys = ON")
+        if not self._schema_ready:
+            connection.executescript(SCHEMA)
+            self._schema_ready = True
+        return connection
+
+    def add_profile(self, profile: SettingProfile, job_name: str, captured_at: Optional[str] = None) -> int:
+        """Saves a capture (in one transaction) and returns its job ID.
+        If the last capture of this job had exactly the same settings it just gets its time updated."""
+        captured_at = captured_at or datetime.now().isoformat(timespec = "seconds")
+        fingerprint = profile.fingerprint()
+        with closing(self._connect()) as connection, connection:
+            existing_job = connection.execute("SELECT id FROM job WHERE job_name = ? AND fingerprint = ? ORDER BY captured_at DESC LIMIT 1",
+                                              (job_name, fingerprint)).fetchone()
+            if existing_job is not None:
+                connection.execute("UPDATE job SET captured_at = ? WHERE id = ?", (captured_at, existing_job[0]))
+                return existing_job[0]
+
+            connection.execute("INSERT OR IGNORE INTO machine (name) VALUES (?)", (profile.printer_name,))
+            machine_id = connection.execute("SELECT id FROM machine WHERE name = ?", (profile.printer_name,)).fetchone()[0]
+            layout_id, key_ids = self._store_layout(connection, profile)
+            job_id = connection.execute(
+                "INSERT INTO job (job_name, captured_at, machine_id, profile_name, preset_name, extruder_count, layout_id, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_name, captured_at, machine_id, profile.profile_name, profile.preset_name, profile.extruder_count, layout_id, fingerprint)).lastrowid
+            extruder_ids = [connection.execute("INSERT INTO extruder (job_id, position) VALUES (?, ?)", (job_id, position)).lastrowid
+                            for position in range(profile.extruder_count)]
+
+            state_ids: dict[str, int] = {}
+            value_ids: dict[tuple[str, str], int] = {}
+            setting_rows = []
+            for category_settings in profile.settings.values():
+                for setting, _ in _iter_archive_settings(category_settings):
+                    for position, extruder_id in enumerate(extruder_ids[:len(setting.value)]):
+                        setting_rows.append((
+                            extruder_id,
+                            key_ids[setting.key],
+                            self._value_id(connection, value_ids, setting.raw_value[position], setting.value[position]),
+                            self._state_id(connection, state_ids, SETTING_STATES.get(setting.css_class[position], "normal")),
+                            self._state_id(connection, state_ids, VALUE_STATES.get(setting.error_class[position])),
+                        ))
+            connection.executemany("INSERT INTO setting (extruder_id, key_id, value_id, state_id, value_state_id) VALUES (?, ?, ?, ?, ?)", setting_rows)
+        return job_id
+
+    @staticmethod
+    def _store_layout(connection: sqlite3.Connection, profile: SettingProfile) -> tuple[int, dict[str, int]]:
+        """Adds any keys the archive hasn't seen before, and the profile's layout unless there's one exactly the same already.
+        Returns the layout's ID and every key's ID."""
+        # (name, category, parent, child level, setting type, label) in page order. Top level settings' parent is their category.
+        key_rows = []
+        for category, category_settings in profile.settings.items():
+            key_rows.append((category, category, None, -1, "category", profile.settings_labels.get(category, category)))
+            for setting, parent_key in _iter_archive_settings(category_settings):
+                key_rows.append((setting.key, category, parent_key or category, setting.child_level, setting.setting_type, setting.label))
+        connection.executemany("INSERT OR IGNORE INTO setting_key (name) VALUES (?)", [(name,) for name, *_ in key_rows])
+        key_ids = dict(connection.execute("SELECT name, id FROM setting_key"))
+
+        layout_fingerprint = hashlib.sha256(fingerprint_json(key_rows)).hexdigest()
+        layout_row = connection.execute("SELECT id FROM layout WHERE fingerprint = ?", (layout_fingerprint,)).fetchone()
+        if layout_row is not None:
+            return layout_row[0], key_ids
+        layout_id = connection.execute("INSERT INTO layout (fingerprint) VALUES (?)", (layout_fingerprint,)).lastrowid
+        connection.executemany(
+            "INSERT INTO layout_key (layout_id, key_id, category_id, parent_id, position, child_level, setting_type, label) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(layout_id, key_ids[name], key_ids[category], key_ids.get(parent_key), position, child_level, setting_type, label)
+             for position, (name, category, parent_key, child_level, setting_type, label) in enumerate(key_rows)])
+        return layout_id, key_ids
+
+    @staticmethod
+    def _value_id(connection: sqlite3.Connection, value_ids: dict[tuple[str, str], int], raw_value: Any, display: str) -> int:
+        # The same handful of values turn up over and over so only look each one up once
+        raw_json = value_json(raw_value)
+        value_id = value_ids.get((raw_json, display))
+        if value_id is None:
+            text, number = _value_text_and_number(raw_value)
+            connection.execute("INSERT OR IGNORE INTO setting_value (raw_json, display, text, number) VALUES (?, ?, ?, ?)", (raw_json, display, text, number))
+            value_id = value_ids[(raw_json, display)] = connection.execute(
+                "SELECT id FROM setting_value WHERE raw_json = ? AND display = ?", (raw_json, display)).fetchone()[0]
+        return value_id
+
+    @staticmethod
+    def _state_id(connection: sqlite3.Connection, state_ids: dict[str, int], state: Optional[str]) -> Optional[int]:
+        if state is None:
+            return None
+        state_id = state_ids.get(state)
+        if state_id is None:
+            connection.execute("INSERT OR IGNORE INTO setting_state (name) VALUES (?)", (state,))
+            state_id = state_ids[state] = connection.execute("SELECT id FROM setting_state WHERE name = ?", (state,)).fetchone()[0]
+        return state_id
+
+    def find_jobs(self, query: ArchiveQuery, limit: Optional[int] = None) -> list[ArchivedJob]:
+        """Jobs matching the query, newest first"""
+        where: list[str] = []
+        parameters: list[Any] = []
+        if query.since:
+            where.append("job.captured_at >= ?")
+            parameters.append(query.since)
+        if query.until:
+            # Only compare as much as was given so "until 2025-09-30" includes all of that day
+            where.append("substr(job.captured_at, 1, length(?)) <= ?")
+            parameters.extend([query.until, query.until])
+        if query.machine:
+            where.append("machine.name LIKE ?")
+            parameters.append(f"%{query.machine}%")
+        if query.job:
+            where.append("job.job_name LIKE ?")
+            parameters.append(f"%{query.job}%")
+        for key, operator, value in query.conditions:
+            if operator not in QUERY_OPERATORS:
+                raise ValueError(f"Unknown operator {operator}")
+            text, number = _value_text_and_number(value)
+            if operator == "~":
+                value_condition, value_parameter = "setting_value.text LIKE ?", f"%{value}%"
+            elif number is not None:
+                value_condition, value_parameter = f"setting_value.number {QUERY_OPERATORS[operator]} ?", number
+            else:
+                value_condition, value_parameter = f"setting_value.text {QUERY_OPERATORS[operator]} ?", text
+            where.append(f"""EXISTS (
+                SELECT 1 FROM extruder
+                JOIN setting ON setting.extruder_id = extruder.id
+                JOIN setting_value ON setting_value.id = setting.value_id
+                WHERE extruder.job_id = job.id
+                AND setting.key_id = (SELECT id FROM setting_key WHERE name = ?)
+                AND {value_condition})""")
+            parameters.extend([key, value_parameter])
+        sql = f"""
+            SELECT {JOB_COLUMNS}
+            FROM job JOIN machine ON machine.id = job.machine_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY job.captured_at DESC, job.id DESC"""
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        with closing(self._connect()) as connection:
+            return [ArchivedJob(*row) for row in connection.execute(sql, parameters)]
+
+    def get_job(self, job_id: int) -> ArchivedJob:
+        """Raises KeyError if there's no such job"""
+        with closing(self._connect()) as connection:
+            job_row = connection.execute(f"SELECT {JOB_COLUMNS} FROM job JOIN machine ON machine.id = job.machine_id WHERE job.id = ?", (job_id,)).fetchone()
+        if job_row is None:
+            raise KeyError(f"No archived job with ID {job_id}")
+        return ArchivedJob(*job_row)
+
+    def iter_matrix_cells(self, job_ids: list[int]) -> Iterator[tuple[int, int, int, int]]:
+        """(key ID, extruder position, index of the job in job_ids, value ID) for every setting those jobs have.
+        Comes out one setting (and extruder) at a time in the same order as setting_keys(), so a whole row of the matrix is together."""
+        with closing(self._connect()) as connection:
+            # Temporary tables instead of a huge IN (...), and they say which column each job is and which row each key is while they're at it
+            connection.execute("CREATE TEMP TABLE matrix_job (job_id INTEGER PRIMARY KEY, job_column INTEGER NOT NULL)")
+            connection.executemany("INSERT INTO matrix_job (job_id, job_column) VALUES (?, ?)", [(job_id, column) for column, job_id in enumerate(job_ids)])
+            connection.execute("CREATE TEMP TABLE matrix_key (key_id INTEGER PRIMARY KEY, key_row INTEGER NOT NULL)")
+            connection.executemany("INSERT INTO matrix_key (key_id, key_row) VALUES (?, ?)", [(key_id, row) for row, key_id in enumerate(self._setting_keys(connection))])
+            yield from connection.execute("""
+                SELECT setting.key_id, extruder.position, matrix_job.job_column, setting.value_id
+                FROM matrix_job
+                JOIN extruder ON extruder.job_id = matrix_job.job_id
+                JOIN setting ON setting.extruder_id = extruder.id
+                JOIN matrix_key ON matrix_key.key_id = setting.key_id
+                ORDER BY matrix_key.key_row, extruder.position""")
+
+    def iter_matrix_rows(self, job_ids: list[int]) -> Iterator[tuple[int, int, array]]:
+        """(key ID, extruder position, value ID for each job in job_ids) for every setting (and extruder) those jobs have, in page order.
+        Jobs that don't have it get 0. The value IDs are the same array every time, so copy it if it needs to stick around."""
+        empty_row = array("I", [0]) * len(job_ids)
+        value_ids = array("I", empty_row)
+        current_row: Optional[tuple[int, int]] = None
+        for key_id, position, column, value_id in self.iter_matrix_cells(job_ids):
+            if (key_id, position) != current_row:
+                if current_row is not None:
+                    yield *current_row, value_ids
+                    value_ids[:] = empty_row
+                current_row = (key_id, position)
+            value_ids[column] = value_id
+        if current_row is not None:
+            yield *current_row, value_ids
+
+    def setting_keys(self, job_ids: list[int]) -> dict[int, tuple[str, str, str, int, str]]:
+        """(name, label, category, child level, setting type) of every setting key (and category) those jobs have by ID, in page order.
+        Each one is how it was in the first of the jobs that had it, and keys only later jobs have come after the first one's."""
+        with closing(self._connect()) as connection:
+            connection.execute("CREATE TEMP TABLE matrix_job (job_id INTEGER PRIMARY KEY, job_column INTEGER NOT NULL)")
+            connection.executemany("INSERT INTO matrix_job (job_id, job_column) VALUES (?, ?)", [(job_id, column) for column, job_id in enumerate(job_ids)])
+            return self._setting_keys(connection)
+
+    @staticmethod
+    def _setting_keys(connection: sqlite3.Connection) -> dict[int, tuple[str, str, str, int, str]]:
+        """setting_keys() for the jobs in the matrix_job table"""
+        setting_keys: dict[int, tuple[str, str, str, int, str]] = {}
+        # Jobs from the same machine in the same language share a layout, so there's hardly ever more than a few of these
+        layout_ids = [layout_id for layout_id, in connection.execute("""
+            SELECT job.layout_id FROM matrix_job JOIN job ON job.id = matrix_job.job_id
+            GROUP BY job.layout_id ORDER BY MIN(matrix_job.job_column)""")]
+        for layout_id in layout_ids:
+            for key_id, *setting_key in connection.execute("""
+                    SELECT layout_key.key_id, setting_key.name, layout_key.label, category.name, layout_key.child_level, layout_key.setting_type
+                    FROM layout_key
+                    JOIN setting_key ON setting_key.id = layout_key.key_id
+                    JOIN setting_key AS category ON category.id = layout_key.category_id
+                    WHERE layout_key.layout_id = ?
+                    ORDER BY layout_key.position""", (layout_id,)):
+                setting_keys.setdefault(key_id, tuple(setting_key))
+        return setting_keys
+
+    def setting_values(self, value_ids: list[int]) -> dict[int, tuple[str, str, Optional[float]]]:
+        """(raw value as JSON, display string, number if it's a number) of each value"""
+        values: dict[int, tuple[str, str, Optional[float]]] = {}
+        with closing(self._connect()) as connection:
+            # SQLite only takes so many parameters at once
+            for start in range(0, len(value_ids), 500):
+                chunk = value_ids[start:start + 500]
+                values.update((value_id, (raw_json, display, number)) for value_id, raw_json, display, number in connection.execute(
+                    f"SELECT id, raw_json, display, number FROM setting_value WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return values
+
+    def load_profile(self, job_id: int) -> SettingProfile:
+        """Rebuilds an archived capture well enough to go in a comparison"""
+        with closing(self._connect()) as connection:
+            job_row = connection.execute("""
+                SELECT job.profile_name, job.preset_name, job.extruder_count, machine.name
+                FROM job JOIN machine ON machine.id = job.machine_id WHERE job.id = ?""", (job_id,)).fetchone()
+            if job_row is None:
+                raise KeyError(f"No archived job with ID {job_id}")
+            profile_name, preset_name, extruder_count, machine_name = job_row
+            profile = SettingProfile(profile_name = profile_name, preset_name = preset_name, printer_name = machine_name, extruder_count = extruder_count)
+            # Laid out (and labelled) the way this job was, whatever's been archived since
+            setting_rows = connection.execute("""
+                SELECT setting_key.name, category.name, parent_key.name, layout_key.child_level, layout_key.setting_type, layout_key.label,
+                       extruder.position, setting_value.raw_json, setting_value.display, state.name, value_state.name
+                FROM job
+                JOIN extruder ON extruder.job_id = job.id
+                JOIN setting ON setting.extruder_id = extruder.id
+                JOIN setting_key ON setting_key.id = setting.key_id
+                JOIN layout_key ON layout_key.layout_id = job.layout_id AND layout_key.key_id = setting.key_id
+                JOIN setting_key AS category ON category.id = layout_key.category_id
+                LEFT JOIN setting_key AS parent_key ON parent_key.id = layout_key.parent_id
+                JOIN setting_value ON setting_value.id = setting.value_id
+                JOIN setting_state AS state ON state.id = setting.state_id
+                LEFT JOIN setting_state AS value_state ON value_state.id = setting.value_state_id
+                WHERE job.id = ?
+                ORDER BY layout_key.position, extruder.position""", (job_id,)).fetchall()
+            category_labels = dict(connection.execute("""
+                SELECT setting_key.name, layout_key.label
+                FROM job
+                JOIN layout_key ON layout_key.layout_id = job.layout_id
+                JOIN setting_key ON setting_key.id = layout_key.key_id
+                WHERE job.id = ? AND layout_key.setting_type = 'category'""", (job_id,)))
+
+        settings: dict[str, CategorySetting] = {}
+        for key, category, parent_key, child_level, setting_type, label, position, raw_json, display, state, value_state in setting_rows:
+            setting = settings.get(key)
+            if setting is None:
+                setting = settings[key] = CategorySetting(key = key, label = label, setting_type = setting_type, child_level = child_level, extruder_count = extruder_count)
+                parent = settings.get(parent_key)
+                if parent is not None:
+                    parent.children[key] = setting
+                elif category in profile.settings:
+                    profile.settings[category].append(setting)
+            setting.raw_value[position] = json.loads(raw_json)
+            setting.value[position] = display
+            setting.css_class[position] = SETTING_STATE_CLASSES.get(state, CssClasses.SETTING_NORMAL.full)
+            setting.error_class[position] = VALUE_STATE_CLASSES.get(value_state, "")
+        for category in profile.settings:
+            profile.settings_labels[category] = category_labels.get(category, category)
+        return profile
@@ -3,8 +3,6 @@
 #
 # Based on CuraHtmlDoc by 5axes
 
-from . import HTMLSettingsExportReborn
-
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("htmlsettingsexport")
 
@@ -12,4 +10,6 @@ def getMetaData():
     return {}
 
 def register(app):
-    return { "extension": HTMLSettingsExportReborn.HTMLSettingsExportReborn() }
+    # Not imported until Cura actually wants the extension. Just the menu, the rest waits until it's used.
+    from . import ExportMenu
+    return { "extension": ExportMenu.HTMLSettingsExportMenu() }
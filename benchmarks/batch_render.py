@@ -0,0 +1,116 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Rendering a pile of archived jobs at once with BatchRender. Makes a few dozen captures of one machine with a few
+# settings changed between each (like a real archive), packs them into snapshots, and renders them one after another
+# in this process and then across a pool of worker processes. Shows how much smaller a snapshot is to send than
+# pickling the capture itself, reports per second both ways, and checks every page the pool wrote is exactly what
+# rendering it here makes (and that snapshots of comparisons and other languages come back the same as they went in).
+# Only goes faster with more than one CPU, obviously.
+#
+# Run from the plugin folder: python benchmarks/batch_render.py [--reports 24] [--settings 1000] [--extruders 2] [--workers 4]
+
+import argparse
+import dataclasses
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+batch_render = fake_cura.load_plugin("BatchRender")
+
+
+def capture(extension, export_mode, **kwargs):
+    """A capture without the date, so pages made from it don't depend on when that was"""
+    export_context = extension._capture_export(export_mode, plugin.ExportTimer(), **kwargs)
+    if export_context.report_details is None:
+        return export_context
+    return dataclasses.replace(export_context, report_details = dataclasses.replace(export_context.report_details, date_time = ""))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Batch rendering benchmark")
+    parser.add_argument("--reports", type = int, default = 24)
+    parser.add_argument("--settings", type = int, default = 1000)
+    parser.add_argument("--extruders", type = int, default = 2)
+    parser.add_argument("--workers", type = int, default = None, help = "Worker processes (default is one per CPU)")
+    parser.add_argument("--language", default = "de_DE", help = "For checking snapshots can still be translated")
+    arguments = parser.parse_args()
+
+    application = fake_cura.make_application(arguments.settings, arguments.extruders, max_depth = 5)
+    extension = plugin.HTMLSettingsExportReborn()
+    export_contexts = []
+    for _ in range(arguments.reports):
+        application.machine.change_settings(0.01)
+        export_contexts.append(capture(extension, plugin.ExportMode.REPORT))
+
+    start = time.perf_counter()
+    snapshots = [batch_render.encode_snapshot(export_context) for export_context in export_contexts]
+    encode_time = (time.perf_counter() - start) / len(snapshots)
+    start = time.perf_counter()
+    pickles = [pickle.dumps(export_context, pickle.HIGHEST_PROTOCOL) for export_context in export_contexts]
+    pickle_time = (time.perf_counter() - start) / len(pickles)
+    start = time.perf_counter()
+    for pickled in pickles:
+        pickle.loads(pickled)
+    unpickle_time = (time.perf_counter() - start) / len(pickles)
+    start = time.perf_counter()
+    for snapshot in snapshots:
+        batch_render.decode_snapshot(snapshot)
+    decode_time = (time.perf_counter() - start) / len(snapshots)
+    snapshot_size = sum(len(snapshot) for snapshot in snapshots) / len(snapshots)
+    pickle_size = sum(len(pickled) for pickled in pickles) / len(pickles)
+    print(f"Snapshot:            {snapshot_size / 1024:8.1f} KB  ({encode_time * 1000:.1f} ms to pack, {decode_time * 1000:.1f} ms to unpack)")
+    print(f"Pickled capture:     {pickle_size / 1024:8.1f} KB  ({pickle_time * 1000:.1f} ms to pickle, {unpickle_time * 1000:.1f} ms to unpickle)")
+
+    problems = []
+    # Whatever goes in comes out: a report, a comparison with its root causes, and both of those in another language
+    compare_context = capture(extension, plugin.ExportMode.COMPARE, compare_profiles = (export_contexts[0].setting_profile, export_contexts[-1].setting_profile))
+    page_renderer = plugin.HTMLSettingsExportReborn._make_page_renderer()
+    for name, export_context in (("report", export_contexts[0]), ("comparison", compare_context)):
+        unpacked_context = batch_render.decode_snapshot(batch_render.encode_snapshot(export_context))
+        if unpacked_context.fingerprint() != export_context.fingerprint():
+            problems.append(f"{name} snapshot has a different fingerprint")
+        if page_renderer._assemble_html(unpacked_context) != page_renderer._assemble_html(export_context):
+            problems.append(f"{name} snapshot doesn't make the same page")
+        if page_renderer._assemble_html(unpacked_context.localised(arguments.language)) != page_renderer._assemble_html(export_context.localised(arguments.language)):
+            problems.append(f"{name} snapshot doesn't make the same page in {arguments.language}")
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        # One after another, the way it'd go without the pool
+        page_renderer = plugin.HTMLSettingsExportReborn._make_page_renderer()
+        expected_pages = []
+        start = time.perf_counter()
+        for i, snapshot in enumerate(snapshots):
+            expected_pages.append(page_renderer._assemble_html(batch_render.decode_snapshot(snapshot)))
+            with open(os.path.join(output_folder, f"sequential {i}.html"), "w", encoding = "utf-8") as page:
+                page.write(expected_pages[-1])
+        sequential_time = time.perf_counter() - start
+
+        output_filenames = [os.path.join(output_folder, f"job {i}.html") for i in range(len(snapshots))]
+        batch_result = batch_render.render_batch(zip(snapshots, output_filenames), workers = arguments.workers)
+        print(f"One at a time:       {len(snapshots) / sequential_time:8.1f} reports/s")
+        print(f"Batch:               {batch_result.reports_per_second:8.1f} reports/s  ({batch_result.workers} processes, {sequential_time / batch_result.seconds:.2f}x)")
+
+        problems.extend(f"{report.output_filename} failed: {report.error}" for report in batch_result.failed)
+        if [report.output_filename for report in batch_result.reports] != output_filenames:
+            problems.append("batch results aren't in the same order as the snapshots")
+        for output_filename, expected_page in zip(output_filenames, expected_pages):
+            if not os.path.exists(output_filename):
+                continue
+            with open(output_filename, "r", encoding = "utf-8") as page:
+                if page.read() != expected_page:
+                    problems.append(f"{os.path.basename(output_filename)} isn't the same as rendering it on its own")
+
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
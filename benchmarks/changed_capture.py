@@ -0,0 +1,80 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# How much quicker "Export changed settings only" captures than a full capture. Gives each stack a realistic
+# handful of user changes (the fake machine normally changes 5% of everything, which nobody actually does),
+# captures both ways, and checks every setting in the changed only capture is exactly what the full one has.
+#
+# Run from the plugin folder: python benchmarks/changed_capture.py [--settings 2000] [--extruders 4] [--changes 10] [--depth 5]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+
+
+def best_time(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def find_mismatches(partial_settings, full_settings, path: str = "") -> list[str]:
+    """Keys in the changed only capture that aren't the same (or aren't in the same place) in the full one"""
+    full_by_key = {setting.key: setting for setting in full_settings if setting is not None}
+    mismatches = []
+    for setting in partial_settings:
+        full_setting = full_by_key.get(setting.key)
+        if full_setting is None or setting.fingerprint_details() != full_setting.fingerprint_details():
+            mismatches.append(path + setting.key)
+            continue
+        mismatches.extend(find_mismatches(list(setting.children.values()), list(full_setting.children.values()), f"{path}{setting.key}/"))
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Changed settings only capture benchmark")
+    parser.add_argument("--settings", type = int, default = 2000)
+    parser.add_argument("--extruders", type = int, default = 4)
+    parser.add_argument("--changes", type = int, default = 10, help = "User changes in each stack")
+    parser.add_argument("--depth", type = int, default = 5, help = "How deep the setting tree goes (fdmprinter.def.json is about 5)")
+    parser.add_argument("--repeat", type = int, default = 3)
+    arguments = parser.parse_args()
+
+    application = fake_cura.make_application(arguments.settings, arguments.extruders, max_depth = arguments.depth)
+    machine = application.machine
+    setting_keys = [key for key, definition in machine.definitions.items() if definition.properties["type"] != "category"]
+    picker = random.Random(1)
+    for stack in [machine.global_stack] + machine.extruder_stacks:
+        stack.getTop()._keys = set(picker.sample(setting_keys, arguments.changes))
+    extension = plugin.HTMLSettingsExportReborn()
+
+    full_time = best_time(extension._get_setting_profile, arguments.repeat)
+    changed_time = best_time(lambda: extension._get_setting_profile(changed_only = True), arguments.repeat)
+    full_profile = extension._get_setting_profile()
+    changed_profile = extension._get_setting_profile(changed_only = True)
+    full_rows = sum(len(category) for category in full_profile.get_flattened_all_categories_dict().values())
+    changed_rows = sum(len(category) for category in changed_profile.get_flattened_all_categories_dict().values())
+    print(f"Full capture:          {full_time * 1000:8.1f} ms  ({full_rows} settings)")
+    print(f"Changed only capture:  {changed_time * 1000:8.1f} ms  ({changed_rows} settings in {len(changed_profile.settings)} categories)  {full_time / changed_time:.1f}x faster")
+
+    mismatches = []
+    for category, category_settings in changed_profile.settings.items():
+        mismatches.extend(find_mismatches(category_settings, full_profile.settings[category], f"{category}/"))
+    if mismatches:
+        print(f"{len(mismatches)} settings aren't the same as the full capture, like {', '.join(mismatches[:5])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Times each stage of an export against fake Cura stacks of different sizes, so "export feels slower"
+# can become "_assemble_html got 30% slower on 16 extruders".
+#
+# Run from the plugin folder:
+#   python benchmarks/export_benchmark.py                  Run and compare against the saved baseline (if there is one)
+#   python benchmarks/export_benchmark.py --save-baseline  Run and save the results as the new baseline
+#   python benchmarks/export_benchmark.py --settings 600 5000 --extruders 1 16 --repeat 5
+#
+# Also prints how big each setting row's markup is on a minified static report, normally and with compact markup.
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SETTINGS = [600, 2000, 5000]
+DEFAULT_EXTRUDERS = [1, 4, 16]
+PHASES = ["get_setting_profile", "compare_profiles", "assemble_html", "minify_css_classes", "end_to_end"]
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    """Fastest of a few runs. The slower ones are the computer doing something else, not the code."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_case(settings: int, extruders: int, repeat: int) -> dict[str, float]:
+    """Times every phase for one machine size"""
+    application = fake_cura.make_application(settings, extruders)
+    extension = plugin.HTMLSettingsExportReborn()
+    results: dict[str, float] = {}
+
+    results["get_setting_profile"] = best_time(extension._get_setting_profile, repeat)
+
+    profile_a = extension._get_setting_profile()
+    application.machine.change_settings()
+    profile_b = extension._get_setting_profile()
+    results["compare_profiles"] = best_time(lambda: plugin.CompareProfiles(profile_a, profile_b), repeat)
+
+    # Minifying gets timed on its own so leave it out of this one
+    extension._minify_output = False
+    export_context = extension._capture_export(plugin.ExportMode.REPORT, plugin.ExportTimer())
+    extension._minify_output = True
+    # From scratch every time, otherwise it's just timing the category cache (benchmarks/fragment_cache.py does that)
+    results["assemble_html"] = best_time(lambda: (extension._fragment_cache.clear(), extension._assemble_html(export_context)), repeat)
+    page = extension._assemble_html(export_context)
+    results["minify_css_classes"] = best_time(lambda: extension._minify_css_classes(page), repeat)
+
+    # Writing the same thing over and over is the point here
+    application.getPreferences().setValue(extension.PREFERENCE_SKIP_UNCHANGED, False)
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_filename = os.path.join(output_dir, "benchmark.html")
+        results["end_to_end"] = best_time(lambda: extension._write_settings_html(output_filename, plugin.ExportMode.REPORT), repeat)
+    return results
+
+
+def measure_row_markup(settings: int, extruders: int) -> dict[str, float]:
+    """Average bytes per setting row (minified, like a real export) with normal and compact markup,
+    and how much smaller the whole page got per row once compact mode's extra CSS is paid for"""
+    fake_cura.make_application(settings, extruders)
+    extension = plugin.HTMLSettingsExportReborn()
+    renderer = extension._get_row_renderer(None)
+    export_context = extension._capture_export(plugin.ExportMode.REPORT, plugin.ExportTimer())
+    setting_rows = [row for category_settings in export_context.setting_profile.settings.values()
+                    for setting in category_settings for row in renderer.make_report_rows(setting)]
+    # Minifying adds a comment with the class names to anything, rows or not
+    minify_overhead = len(extension._minify_css_classes("").encode("utf-8"))
+
+    def minified_bytes(page: str) -> int:
+        return len(extension._minify_css_classes(page).encode("utf-8")) - minify_overhead
+
+    normal_page = minified_bytes(extension._assemble_html(export_context))
+    compact_page = minified_bytes(extension._assemble_html(dataclasses.replace(export_context, compact_markup = True)))
+    return {
+        "normal": minified_bytes("\n".join(renderer.make_row_html(row, 6) for row in setting_rows)) / len(setting_rows),
+        "compact": minified_bytes("".join(renderer.make_compact_row_html(row) for row in setting_rows)) / len(setting_rows),
+        "page_saving": (normal_page - compact_page) / len(setting_rows),
+    }
+
+
+def case_name(settings: int, extruders: int) -> str:
+    return f"{settings} settings x {extruders} extruders"
+
+
+def compare_with_baseline(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> bool:
+    """Prints how each phase changed since the baseline. Returns whether anything got slower than the tolerance allows."""
+    regressed = False
+    for case, phases in results.items():
+        baseline_phases = baseline.get(case)
+        if baseline_phases is None:
+            print(f"{case}: not in baseline")
+            continue
+        print(case)
+        for phase, seconds in phases.items():
+            baseline_seconds = baseline_phases.get(phase)
+            if not baseline_seconds:
+                print(f"  {phase:<22}{seconds * 1000:10.1f} ms  (not in baseline)")
+                continue
+            change = seconds / baseline_seconds - 1
+            flag = ""
+            if change > tolerance:
+                flag = "  <-- SLOWER"
+                regressed = True
+            elif change < -tolerance:
+                flag = "  (faster)"
+            print(f"  {phase:<22}{seconds * 1000:10.1f} ms  vs {baseline_seconds * 1000:10.1f} ms  {change:+7.1%}{flag}")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Benchmark HTML Settings Export Reborn against fake Cura stacks")
+    parser.add_argument("--settings", type = int, nargs = "+", default = DEFAULT_SETTINGS, help = "Number of settings in the definition tree")
+    parser.add_argument("--extruders", type = int, nargs = "+", default = DEFAULT_EXTRUDERS, help = "Number of extruders")
+    parser.add_argument("--repeat", type = int, default = 3, help = "Runs per phase (the fastest one counts)")
+    parser.add_argument("--baseline", default = DEFAULT_BASELINE, help = "Baseline results file")
+    parser.add_argument("--save-baseline", action = "store_true", help = "Save these results as the baseline")
+    parser.add_argument("--tolerance", type = float, default = 0.25, help = "How much slower than baseline (0.25 = 25%%) counts as a regression")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for settings in args.settings:
+        for extruders in args.extruders:
+            case = case_name(settings, extruders)
+            results[case] = run_case(settings, extruders, args.repeat)
+            print(f"{case}: " + ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in results[case].items()))
+    print("Median across sizes: " + ", ".join(
+        f"{phase} {statistics.median(case[phase] for case in results.values()) * 1000:.1f} ms" for phase in PHASES))
+
+    print()
+    print("Row markup (minified static report):")
+    for settings in args.settings:
+        for extruders in args.extruders:
+            sizes = measure_row_markup(settings, extruders)
+            print(f"  {case_name(settings, extruders)}: {sizes['normal']:.0f} bytes/row normal, {sizes['compact']:.0f} compact "
+                  f"({sizes['compact'] / sizes['normal'] - 1:+.1%}), page {sizes['page_saving']:.0f} bytes/row smaller")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding = "utf-8") as baseline_file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, baseline_file, indent = 4)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} yet, run with --save-baseline to make one")
+        return 0
+    with open(args.baseline, "r", encoding = "utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    print()
+    print(f"Compared with baseline (Python {baseline.get('python')}, {baseline.get('machine')}):")
+    return 1 if compare_with_baseline(results, baseline.get("results", {}), args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Just enough of Cura, Uranium and PyQt to run the plugin outside of Cura.
+# Stacks are generated from a made up (but Cura shaped) definition tree of whatever size you like.
+
+import datetime
+import importlib
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import types
+from enum import Enum, auto
+from typing import Any, Optional
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_PACKAGE = "HTMLSettingsExportReborn"
+
+
+class FakeCatalog:
+    """Stands in for UM.i18n.i18nCatalog. Never has any translations for Cura's language, but still looks them up.
+    Any other language "translates" everything by sticking the language on the front, so you can see what got translated."""
+    def __init__(self, name: str = "", language: str = "default"):
+        self.name = name
+        self.language = language
+        self._translations: dict[str, str] = {}
+
+    def i18nc(self, context: str, text: str, *args) -> str:
+        # Same sort of lookup gettext does
+        translated = self._translations.get(f"{context}\x04{text}")
+        if translated is None:
+            translated = text if self.language == "default" else f"[{self.language}] {text}"
+        return translated
+
+    def hasTranslationLoaded(self) -> bool:
+        return False
+
+
+class FakeLogger:
+    @staticmethod
+    def log(level: str, message: str) -> None:
+        pass
+
+    @staticmethod
+    def logException(level: str, message: str) -> None:
+        pass
+
+
+class FakeMessage:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def show(self) -> None:
+        pass
+
+
+class FakeSignal:
+    def __init__(self):
+        self._callbacks = []
+
+    def connect(self, callback) -> None:
+        self._callbacks.append(callback)
+
+    def emit(self, *args) -> None:
+        for callback in self._callbacks:
+            callback(*args)
+
+
+class FakeExtension:
+    def __init__(self):
+        self.menu_items: list[tuple[str, Any]] = []
+
+    def setMenuName(self, name: str) -> None:
+        pass
+
+    def addMenuItem(self, name: str, callback) -> None:
+        self.menu_items.append((name, callback))
+
+
+class FakeRelationType(Enum):
+    """Stands in for UM.Settings.SettingRelation.RelationType"""
+    RequiresTarget = auto()
+    RequiredByTarget = auto()
+
+
+class FakeSettingRelation:
+    def __init__(self, owner: "FakeSettingDefinition", target: "FakeSettingDefinition", relation_type: FakeRelationType, role: str):
+        self.owner = owner
+        self.target = target
+        self.type = relation_type
+        self.role = role
+
+
+class FakeSettingDefinition:
+    """Stands in for UM.Settings.SettingDefinition. Properties are just a dict."""
+    def __init__(self, key: str, properties: dict[str, Any]):
+        self.key = key
+        self.properties = properties
+        self.children: list["FakeSettingDefinition"] = []
+        self.parent: Optional["FakeSettingDefinition"] = None  # None for categories, like the real thing
+        self.relations: list[FakeSettingRelation] = []
+
+
+class FakeContainer:
+    """Stands in for the containers in a stack (definition, material, quality changes, user changes)"""
+    def __init__(self, metadata: Optional[dict[str, Any]] = None, keys: Optional[set[str]] = None):
+        self._metadata = metadata or {}
+        self._keys = keys or set()
+
+    def getMetaData(self) -> dict[str, Any]:
+        return self._metadata
+
+    def getAllKeys(self) -> set[str]:
+        return set(self._keys)
+
+    def getName(self) -> str:
+        return self._metadata.get("name", "")
+
+
+class FakeDefinitionContainer(FakeContainer):
+    """Stands in for a machine's DefinitionContainer"""
+    def __init__(self, definitions: dict[str, FakeSettingDefinition], metadata: dict[str, Any]):
+        super().__init__(metadata)
+        self._definitions = definitions
+
+    def getId(self) -> str:
+        return self._metadata.get("id", "")
+
+    def findDefinitions(self) -> list[FakeSettingDefinition]:
+        return list(self._definitions.values())
+
+
+class FakeContainerStack:
+    """Stands in for a global or extruder stack. Values come from a dict, everything else from the definitions.
+    Counts getProperty() calls because that's where the real thing spends its time."""
+    def __init__(self, definitions: dict[str, FakeSettingDefinition], values: dict[str, Any], user_changes: set[str],
+                 metadata: Optional[dict[str, Any]] = None, printer_name: str = "Benchmark Printer"):
+        self._definitions = definitions
+        self.values = values
+        self.qualityChanges = FakeContainer({"name": "Benchmark profile"})
+        self.definition = FakeDefinitionContainer(definitions, {"name": printer_name, "id": printer_name.lower().replace(" ", "_")})
+        self.material = FakeContainer({"material": "PLA"})
+        self._user_changes = FakeContainer(keys = user_changes)
+        self._metadata = metadata or {}
+        self.property_calls = 0
+
+    def getProperty(self, key: str, property_name: str) -> Any:
+        self.property_calls += 1
+        if property_name == "value":
+            return self.values.get(key)
+        definition = self._definitions.get(key)
+        return None if definition is None else definition.properties.get(property_name)
+
+    def getSettingDefinition(self, key: str) -> Optional[FakeSettingDefinition]:
+        return self._definitions.get(key)
+
+    def getTop(self) -> FakeContainer:
+        return self._user_changes
+
+    def getMetaDataEntry(self, key: str, default: Any = None) -> Any:
+        return self._metadata.get(key, default)
+
+
+# Same categories (and order) as SettingProfile
+CATEGORIES = ["resolution", "shell", "top_bottom", "infill", "material",
+              "speed", "travel", "cooling", "dual", "support", "platform_adhesion",
+              "meshfix", "blackmagic", "experimental", "machine_settings"]
+# Roughly how often each setting type turns up in fdmprinter.def.json
+SETTING_TYPES = ["float"] * 10 + ["int"] * 3 + ["bool"] * 5 + ["enum"] * 4 + ["str"] + ["extruder", "optional_extruder"]
+
+
+class FakeMachine:
+    """A global stack and extruder stacks built from a generated definition tree"""
+    def __init__(self, settings: int = 600, extruders: int = 1, seed: int = 1, max_depth: Optional[int] = None):
+        self.settings = settings
+        self.extruder_count = extruders
+        # The default trees end up dozens of levels deep. Real ones are more like 5, which matters for anything that walks up them.
+        self.max_depth = max_depth
+        self._random = random.Random(seed)
+        self.definitions: dict[str, FakeSettingDefinition] = {}
+        self._build_definitions()
+        self._build_relations(random.Random(seed + 1))  # Its own random numbers so everything else comes out like it always has
+        self.extruder_stacks = [self._build_stack(position) for position in range(extruders)]
+        global_values = dict(self.extruder_stacks[0].values, machine_extruder_count = extruders)
+        self.global_stack = FakeContainerStack(self.definitions, global_values, self._pick_user_changes(global_values),
+                                               {"post_processing_scripts": r"[PauseAtHeight]\\\npause_height = 5.0\\\n"})  # Escaped like Cura does
+        # Roughly the default visibility: most things but not everything
+        self.visible_settings = {key for key in self.definitions if self._random.random() < 0.6}
+
+    def _build_definitions(self) -> None:
+        settings_per_category = max(1, self.settings // len(CATEGORIES))
+        for category in CATEGORIES:
+            category_definition = FakeSettingDefinition(category, {"type": "category", "label": category.replace("_", " ").title()})
+            self.definitions[category] = category_definition
+            # Settings hang off the category or one of the last few settings so the tree ends up a few levels deep
+            possible_parents = [category_definition]
+            depths = {category: 0}
+            for i in range(settings_per_category):
+                # The odd "extruder" in a key makes single extruder machines skip some settings like the real thing
+                key = f"{category}_extruder_nr_{i}" if i % 25 == 24 else f"{category}_setting_{i}"
+                definition = FakeSettingDefinition(key, self._make_properties(key))
+                self.definitions[key] = definition
+                parent = self._random.choice(possible_parents[-3:])
+                if self.max_depth is not None and depths[parent.key] >= self.max_depth:
+                    parent = category_definition  # Start a new branch
+                parent.children.append(definition)
+                definition.parent = parent
+                depths[key] = depths[parent.key] + 1
+                possible_parents.append(definition)
+
+    def _build_relations(self, relation_random: random.Random) -> None:
+        """Makes some settings' values depend on others, Cura style: the first setting in each category is something like
+        layer_height that lots depend on, and a few more depend on whatever came a bit before them."""
+        for category in CATEGORIES:
+            category_keys = [key for key in self.definitions if key.startswith(category + "_") and self.definitions[key].properties["type"] != "category"]
+            for i, key in enumerate(category_keys[1:], start = 1):
+                targets = set()
+                if relation_random.random() < 0.3:
+                    targets.add(category_keys[0])
+                if relation_random.random() < 0.3:
+                    targets.add(category_keys[relation_random.randrange(max(0, i - 10), i)])
+                for target in targets:
+                    owner_definition, target_definition = self.definitions[key], self.definitions[target]
+                    owner_definition.relations.append(FakeSettingRelation(owner_definition, target_definition, FakeRelationType.RequiresTarget, "value"))
+                    target_definition.relations.append(FakeSettingRelation(target_definition, owner_definition, FakeRelationType.RequiredByTarget, "value"))
+
+    def _make_properties(self, key: str) -> dict[str, Any]:
+        setting_type = "extruder" if "extruder_nr" in key else self._random.choice(SETTING_TYPES)
+        properties: dict[str, Any] = {
+            "type": setting_type,
+            "label": key.replace("_", " ").capitalize(),
+            "enabled": self._random.random() > 0.25,
+            "unit": {"float": "mm", "int": ""}.get(setting_type, ""),
+        }
+        if setting_type in ("float", "int"):
+            properties.update(minimum_value = 0, maximum_value = 500, minimum_value_warning = 1, maximum_value_warning = 300)
+        elif setting_type == "enum":
+            properties["options"] = {f"option_{i}": f"Option {i}" for i in range(4)}
+        return properties
+
+    def _make_value(self, definition: FakeSettingDefinition, position: int) -> Any:
+        match definition.properties["type"]:
+            case "float":
+                return self._random.uniform(0, 330)
+            case "int":
+                return self._random.randint(0, 330)
+            case "bool":
+                return self._random.random() > 0.5
+            case "enum":
+                return f"option_{self._random.randint(0, 3)}"
+            case "str":
+                return f"G28 ;Home\nM104 S{self._random.randint(180, 250)}"
+            case "extruder":
+                return position
+            case "optional_extruder":
+                return -1
+        return None
+
+    def _build_stack(self, position: int) -> FakeContainerStack:
+        values = {key: self._make_value(definition, position) for key, definition in self.definitions.items()
+                  if definition.properties["type"] != "category"}
+        return FakeContainerStack(self.definitions, values, self._pick_user_changes(values), {"enabled": True, "position": position})
+
+    def _pick_user_changes(self, values: dict[str, Any]) -> set[str]:
+        return {key for key in values if self._random.random() < 0.05}
+
+    def change_settings(self, fraction: float = 0.1) -> None:
+        """Changes some values (and marks them as user changes) so there's something to compare"""
+        for stack in self.extruder_stacks:
+            for key in list(stack.values):
+                if self._random.random() < fraction:
+                    stack.values[key] = self._make_value(self.definitions[key], 0)
+                    stack.getTop()._keys.add(key)
+
+    @property
+    def property_calls(self) -> int:
+        return self.global_stack.property_calls + sum(stack.property_calls for stack in self.extruder_stacks)
+
+
+class FakePreferences:
+    def __init__(self):
+        self._values: dict[str, Any] = {"cura/currency": "$"}
+
+    def addPreference(self, key: str, default_value: Any) -> None:
+        self._values.setdefault(key, default_value)
+
+    def getValue(self, key: str) -> Any:
+        return self._values.get(key)
+
+    def setValue(self, key: str, value: Any) -> None:
+        self._values[key] = value
+
+
+class FakePrintInformation:
+    def __init__(self, extruders: int):
+        self.jobName = "benchmark_job"
+        self.materialWeights = [12.345] * extruders
+        self.materialLengths = [4.5678] * extruders
+        self.materialCosts = [1.2345] * extruders
+        self.currentPrintTime = types.SimpleNamespace(getDisplayString = lambda duration_format: "1 hour 23 minutes")
+
+
+class FakeApplication:
+    """CuraApplication.getInstance() returns whatever was last set with set_instance()"""
+    _instance = None
+    isVisible = False  # No renderer, so no snapshots
+
+    def __init__(self, machine: FakeMachine):
+        self.machine = machine
+        self._preferences = FakePreferences()
+        self._print_information = FakePrintInformation(machine.extruder_count)
+        self._backend = types.SimpleNamespace(getLatestSnapshot = lambda: None, backendStateChange = FakeSignal())
+        self.engineCreatedSignal = FakeSignal()
+
+    @classmethod
+    def getInstance(cls):
+        return cls._instance
+
+    @classmethod
+    def set_instance(cls, instance) -> None:
+        cls._instance = instance
+
+    def getGlobalContainerStack(self) -> FakeContainerStack:
+        return self.machine.global_stack
+
+    def getMachineManager(self):
+        return types.SimpleNamespace(activeIntentCategory = "default")
+
+    def getExtruderManager(self):
+        return types.SimpleNamespace(getActiveExtruderStacks = lambda: self.machine.extruder_stacks)
+
+    def getPrintInformation(self) -> FakePrintInformation:
+        return self._print_information
+
+    def getPreferences(self) -> FakePreferences:
+        return self._preferences
+
+    def getBackend(self):
+        return self._backend
+
+
+class FakeResources:
+    """Stands in for UM.Resources. Anything the plugin saves for itself goes in a temporary folder."""
+    _data_storage_path: Optional[str] = None
+
+    @classmethod
+    def getDataStoragePath(cls) -> str:
+        if cls._data_storage_path is None:
+            cls._data_storage_path = tempfile.mkdtemp(prefix = "htmlsettingsexport-benchmark-")
+        return cls._data_storage_path
+
+
+class FakeQLocale:
+    """Stands in for QLocale, just enough to format the date"""
+    FormatType = types.SimpleNamespace(ShortFormat = 1)
+
+    @staticmethod
+    def system() -> "FakeQLocale":
+        return FakeQLocale()
+
+    def toString(self, date_time: datetime.datetime, format_type: int) -> str:
+        return date_time.strftime("%x %X")
+
+
+class FakeVisibilityHandler:
+    """Stands in for SettingPreferenceVisibilityHandler"""
+    def getVisible(self) -> set[str]:
+        return FakeApplication.getInstance().machine.visible_settings
+
+
+def _add_module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+def install_fake_modules() -> None:
+    """Puts fake versions of everything the plugin imports from Cura into sys.modules"""
+    _add_module("cura")
+    _add_module("cura.CuraApplication", CuraApplication = FakeApplication)
+    _add_module("cura.CuraVersion", CuraVersion = "5.x (benchmark)")
+    _add_module("cura.Snapshot", Snapshot = object)
+    _add_module("cura.Utils")
+    _add_module("cura.Utils.Threading", call_on_qt_thread = lambda function: function)
+    _add_module("PyQt6")
+    _add_module("PyQt6.QtCore", QBuffer = object, QDateTime = types.SimpleNamespace(currentDateTime = datetime.datetime.now), QLocale = FakeQLocale)
+    _add_module("PyQt6.QtWidgets", QFileDialog = object, QInputDialog = object)
+    _add_module("UM")
+    _add_module("UM.Extension", Extension = FakeExtension)
+    _add_module("UM.i18n", i18nCatalog = FakeCatalog)
+    _add_module("UM.Logger", Logger = FakeLogger)
+    _add_module("UM.Message", Message = FakeMessage)
+    _add_module("UM.Qt")
+    _add_module("UM.Qt.Duration", DurationFormat = types.SimpleNamespace(Format = types.SimpleNamespace(Long = 1)))
+    _add_module("UM.Resources", Resources = FakeResources)
+    _add_module("UM.Settings")
+    _add_module("UM.Settings.ContainerStack", ContainerStack = object)
+    _add_module("UM.Settings.InstanceContainer", InstanceContainer = object)
+    _add_module("UM.Settings.Models")
+    _add_module("UM.Settings.Models.SettingPreferenceVisibilityHandler", SettingPreferenceVisibilityHandler = FakeVisibilityHandler)
+    _add_module("UM.Settings.SettingRelation", RelationType = FakeRelationType)
+
+def load_plugin(module_name: str = PLUGIN_PACKAGE, plugin_dir: str = PLUGIN_DIR) -> types.ModuleType:
+    """Imports the plugin the way Cura does (as a package) and returns one of its modules"""
+    load_plugin_package(plugin_dir)
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{module_name}")
+
+def load_plugin_package(plugin_dir: str = PLUGIN_DIR) -> types.ModuleType:
+    """Imports just the plugin's __init__.py, like Cura does at startup"""
+    if PLUGIN_PACKAGE not in sys.modules:
+        install_fake_modules()
+        spec = importlib.util.spec_from_file_location(PLUGIN_PACKAGE, os.path.join(plugin_dir, "__init__.py"),
+                                                      submodule_search_locations = [plugin_dir])
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PLUGIN_PACKAGE] = package
+        spec.loader.exec_module(package)
+    return sys.modules[PLUGIN_PACKAGE]
+
+def make_application(settings: int = 600, extruders: int = 1, seed: int = 1, max_depth: Optional[int] = None) -> FakeApplication:
+    """Makes a fake CuraApplication with a generated machine and makes it the current instance"""
+    application = FakeApplication(FakeMachine(settings, extruders, seed, max_depth))
+    FakeApplication.set_instance(application)
+    return application
@@ -0,0 +1,95 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# How long a fleet report takes (and how much memory building its matrix needs) for a few hundred archived jobs.
+# Jobs get made from a handful of captures of a fake machine with some settings changed in each, archived under
+# different names in a random order, so there's a realistic mix of "most jobs agree" and "it's all over the place".
+# Then checks every job still comes back from the archive with the settings fingerprint it was captured with after
+# a machine with a different tree (in two languages) has been archived as well.
+#
+# Run from the plugin folder: python benchmarks/fleet_report.py [--jobs 300] [--settings 2000] [--extruders 2] [--variants 12]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+archive_module = fake_cura.load_plugin("SettingsArchive")
+fleet_report = fake_cura.load_plugin("FleetReport")
+
+
+def make_archive(database_path: str, jobs: int, settings: int, extruders: int, variants: int) -> None:
+    application = fake_cura.make_application(settings, extruders)
+    extension = plugin.HTMLSettingsExportReborn()
+    profiles = []
+    for _ in range(variants):
+        profiles.append(extension._get_setting_profile())
+        application.machine.change_settings(0.02)
+    archive = archive_module.SettingsArchive(database_path)
+    rnd = random.Random(1)
+    for job in range(jobs):
+        # Most jobs use the first couple of variants, like most jobs use the house profile
+        profile = profiles[min(int(rnd.expovariate(0.7)), variants - 1)]
+        archive.add_profile(profile, f"Job {job}", captured_at = f"2025-{1 + job // 28 % 12:02d}-{1 + job % 28:02d}T12:00:00")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Fleet report benchmark")
+    parser.add_argument("--jobs", type = int, default = 300)
+    parser.add_argument("--settings", type = int, default = 2000)
+    parser.add_argument("--extruders", type = int, default = 2)
+    parser.add_argument("--variants", type = int, default = 12, help = "Different sets of settings the jobs are made from")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        database_path = os.path.join(archive_dir, "archive.sqlite")
+        start = time.perf_counter()
+        make_archive(database_path, arguments.jobs, arguments.settings, arguments.extruders, arguments.variants)
+        print(f"Archived {arguments.jobs} jobs ({arguments.settings} settings, {arguments.extruders} extruders) in {time.perf_counter() - start:.1f} s, "
+              f"{os.path.getsize(database_path) / 1e6:.1f} MB")
+        archive = archive_module.SettingsArchive(database_path)
+        jobs = archive.find_jobs(archive_module.ArchiveQuery())
+        jobs.reverse()
+        cells = sum(job.extruder_count for job in jobs) * arguments.settings
+
+        start = time.perf_counter()
+        matrix = fleet_report.build_fleet_matrix(archive, jobs)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        rows_html = fleet_report.make_fleet_rows(matrix, 4, "Extruder")
+        render_time = time.perf_counter() - start
+
+        # Separately, since tracemalloc slows everything down a lot
+        tracemalloc.start()
+        fleet_report.build_fleet_matrix(archive, jobs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Old jobs have to come back the way they were captured, not laid out and labelled like whatever got archived last
+        fake_cura.make_application(arguments.settings, arguments.extruders, seed = 2)
+        other_machine = plugin.HTMLSettingsExportReborn()._get_setting_profile()
+        archive.add_profile(other_machine, "Other machine")
+        archive.add_profile(other_machine.localised("de_DE"), "Other machine in German")
+        # One of each different set of settings is plenty
+        archived_jobs = {job.fingerprint: job for job in archive.find_jobs(archive_module.ArchiveQuery())}
+        problems = [f"{job.job_name} doesn't come back the way it was captured" for job in archived_jobs.values()
+                    if archive.load_profile(job.job_id).fingerprint() != job.fingerprint]
+
+    print(f"Matrix: {cells} cells, {len(matrix.values)} distinct values in them, {len(matrix.rows)} rows shown, {matrix.uniform_rows} the same everywhere")
+    print(f"Build:  {build_time:.2f} s ({cells / build_time / 1e6:.2f} million cells/s), peak {peak / 1e6:.1f} MB")
+    print(f"Render: {render_time:.2f} s, {len(rows_html) / 1e6:.1f} MB of rows")
+    print(f"Reloaded {len(archived_jobs)} different jobs after archiving another machine and language")
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
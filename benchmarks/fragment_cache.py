@@ -0,0 +1,67 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# What the category fragment cache saves when you export the same job again after changing one setting.
+# Renders a report once with nothing cached, changes a single infill setting, then renders it again. Every category
+# except infill should come out of the cache (and the page should be exactly what rendering from scratch makes).
+#
+# Run from the plugin folder: python benchmarks/fragment_cache.py [--settings 2000] [--extruders 4] [--format static]
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+
+
+def render(extension, profile, page_format) -> tuple[str, float]:
+    export_context = extension._new_export_context(plugin.ExportMode.REPORT, plugin.ExportTimer(), profile,
+                                                   report_details = extension._get_report_details(plugin.ExportTimer()))
+    export_context = dataclasses.replace(export_context, page_format = page_format, report_details = dataclasses.replace(export_context.report_details, date_time = ""))
+    start = time.perf_counter()
+    page = extension._assemble_html(export_context)
+    return page, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Category fragment cache benchmark")
+    parser.add_argument("--settings", type = int, default = 2000)
+    parser.add_argument("--extruders", type = int, default = 4)
+    parser.add_argument("--format", choices = [page_format.name.lower() for page_format in plugin.PageFormat], default = "static")
+    arguments = parser.parse_args()
+    page_format = plugin.PageFormat[arguments.format.upper()]
+
+    application = fake_cura.make_application(arguments.settings, arguments.extruders)
+    extension = plugin.HTMLSettingsExportReborn()
+    fragment_cache = extension._fragment_cache
+
+    _, cold_time = render(extension, extension._get_setting_profile(), page_format)
+    print(f"Nothing cached:     {cold_time * 1000:8.1f} ms  ({fragment_cache.misses} categories rendered)")
+
+    infill_key = next(key for key in application.machine.definitions if key.startswith("infill_setting_"))
+    stack = application.machine.extruder_stacks[0]
+    stack.values[infill_key] = application.machine._make_value(application.machine.definitions[infill_key], 0)
+    stack.getTop()._keys.add(infill_key)
+    profile = extension._get_setting_profile()
+
+    hits, misses = fragment_cache.hits, fragment_cache.misses
+    cached_page, warm_time = render(extension, profile, page_format)
+    hits, misses = fragment_cache.hits - hits, fragment_cache.misses - misses
+    print(f"Changed {infill_key}: {warm_time * 1000:8.1f} ms  ({hits} categories from the cache, {misses} rendered)")
+
+    fragment_cache.clear()
+    fresh_page, _ = render(extension, profile, page_format)
+    print(f"Cache holds {len(fragment_cache)} fragments, {fragment_cache.total_bytes / 1e6:.1f} MB of {fragment_cache.max_bytes / 1e6:.1f} MB")
+    if cached_page != fresh_page:
+        print("Cached page isn't the same as one rendered from scratch!")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# How long Cura's startup waits for the plugin: importing the package and register() making the extension.
+# Each run is a fresh Python process so nothing is already imported.
+#
+# Run from the plugin folder:
+#   python benchmarks/import_time.py
+#   python benchmarks/import_time.py --plugin-dir /somewhere/with/an/older/version  (e.g. from git worktree add)
+#
+# Cura's own modules are fakes here, so this only sees what the plugin itself costs (mostly the standard
+# library modules it pulls in). In Cura a lot of the Qt side is already loaded by the time plugins are.
+
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in the fresh process. Prints how long startup took and which of these modules it loaded.
+STARTUP_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {benchmark_dir!r})
+import fake_cura
+fake_cura.install_fake_modules()
+fake_cura.make_application(10, 1)
+for module in {preloaded!r}:
+    __import__(module)
+watched = {watched!r}
+modules_before = set(sys.modules)
+start = time.perf_counter()
+package = fake_cura.load_plugin_package({plugin_dir!r})
+package.register(None)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "modules": len(set(sys.modules) - modules_before),
+                   "loaded": [module for module in watched if module in sys.modules]}}))
+"""
+
+# Cura's had these loaded for ages by the time it gets around to plugins, so they don't count
+PRELOADED_MODULES = ["dataclasses", "datetime", "html", "json", "locale"]
+
+# Modules which only exports need. Startup loading any of them is a failure, the engine most of all.
+WATCHED_MODULES = ["difflib", "configparser", "webbrowser", "subprocess", "shlex", "cProfile", "csv", "http.server",
+                   "HTMLSettingsExportReborn.HTMLSettingsExportReborn", "HTMLSettingsExportReborn.DataExport"]
+
+
+def measure(plugin_dir: str) -> dict:
+    startup_script = STARTUP_SCRIPT.format(benchmark_dir = BENCHMARK_DIR, plugin_dir = os.path.abspath(plugin_dir),
+                                            preloaded = PRELOADED_MODULES, watched = WATCHED_MODULES)
+    output = subprocess.run([sys.executable, "-c", startup_script], capture_output = True, text = True, check = True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Measure how long HTML Settings Export Reborn adds to Cura's startup")
+    parser.add_argument("--plugin-dir", default = os.path.dirname(BENCHMARK_DIR), help = "Plugin folder to measure")
+    parser.add_argument("--repeat", type = int, default = 10, help = "Fresh processes to run (the fastest one counts)")
+    args = parser.parse_args()
+
+    # Cura keeps compiled plugins in __pycache__ so compiling doesn't count either
+    compileall.compile_dir(args.plugin_dir, maxlevels = 0, quiet = 1)
+    runs = [measure(args.plugin_dir) for _ in range(args.repeat)]
+    fastest = min(runs, key = lambda run: run["seconds"])
+    print(f"{args.plugin_dir}")
+    print(f"  import + register: {fastest['seconds'] * 1000:.2f} ms (fastest of {args.repeat}), {fastest['modules']} modules imported")
+    print(f"  export-only modules loaded at startup: {', '.join(fastest['loaded']) or 'none'}")
+    return 1 if fastest["loaded"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
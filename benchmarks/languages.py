@@ -0,0 +1,82 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Making one job's report in several languages. The old way was switching Cura's language, restarting and exporting
+# again for each one. Now there's one capture, each language gets translated from it, and the pages get made one after
+# another. Shows where the time goes, and checks each language comes out exactly the same made in one export as it
+# does on its own since they share the fragment cache.
+#
+# Run from the plugin folder: python benchmarks/languages.py [--settings 2000] [--extruders 4] [--languages de_DE,fr_FR,nl_NL]
+
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+
+
+def capture(extension):
+    """A report capture, without the date (so pages made at different times can be compared)"""
+    export_context = extension._capture_export(plugin.ExportMode.REPORT, plugin.ExportTimer())
+    return dataclasses.replace(export_context, report_details = dataclasses.replace(export_context.report_details, date_time = ""))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Multi-language export benchmark")
+    parser.add_argument("--settings", type = int, default = 2000)
+    parser.add_argument("--extruders", type = int, default = 4)
+    parser.add_argument("--languages", default = "de_DE,fr_FR,nl_NL", help = "Comma separated, on top of Cura's")
+    arguments = parser.parse_args()
+    languages = [language.strip() for language in arguments.languages.split(",") if language.strip()]
+
+    application = fake_cura.make_application(arguments.settings, arguments.extruders)
+
+    # A fresh extension (and so an empty fragment cache) for each, like a restart would be
+    expected_pages = {}
+    capture_time = localise_time = render_time = 0.0
+    for language in [None] + languages:
+        extension = plugin.HTMLSettingsExportReborn()
+        start = time.perf_counter()
+        export_context = capture(extension)
+        capture_time += time.perf_counter() - start
+        if language is not None:
+            start = time.perf_counter()
+            export_context = export_context.localised(language)
+            localise_time += time.perf_counter() - start
+        start = time.perf_counter()
+        expected_pages[language] = extension._assemble_html(export_context)
+        render_time += time.perf_counter() - start
+
+    extension = plugin.HTMLSettingsExportReborn()
+    application.getPreferences().setValue(extension.PREFERENCE_LANGUAGES, ",".join(languages))
+    with tempfile.TemporaryDirectory() as output_folder:
+        output_filename = os.path.join(output_folder, "job.html")
+        start = time.perf_counter()
+        export_context = capture(extension)
+        written = extension._render_and_write(export_context, output_filename)
+        one_export = time.perf_counter() - start
+        pages = {None: output_filename}
+        pages.update({language: os.path.join(output_folder, f"job.{language}.html") for language in languages})
+        problems = [] if written else ["the export failed"]
+        for language, page_filename in pages.items():
+            with open(page_filename, "r", encoding = "utf-8") as page_file:
+                if page_file.read() != expected_pages[language]:
+                    problems.append(f"{language or 'Cura language'} page isn't the same as making it on its own")
+
+    print(f"Capture:                {capture_time / len(pages) * 1000:8.1f} ms  (once now, instead of once per language)")
+    print(f"Translating a capture:  {localise_time / len(languages) * 1000:8.1f} ms  per language")
+    print(f"Rendering a page:       {render_time / len(pages) * 1000:8.1f} ms  per language")
+    print(f"Whole export:           {one_export * 1000:8.1f} ms  for {len(pages)} languages")
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
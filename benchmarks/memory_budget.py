@@ -0,0 +1,183 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# The other half of export_benchmark.py: instead of how long things take, how much memory they need and how big
+# the pages come out. Runs capture, compare and rendering against fake Cura stacks under tracemalloc and fails
+# if anything's over the budgets in budgets.json, so "exports use twice the memory since 1.3" or "pages have
+# been getting bigger" gets caught before anyone has to notice it.
+#
+# Run from the plugin folder:
+#   python benchmarks/memory_budget.py                 Check against the budgets (exits with 1 if anything's over)
+#   python benchmarks/memory_budget.py --save-budgets  Measure and save new budgets (with some headroom) after something got bigger on purpose
+#   python benchmarks/memory_budget.py --settings 600 --extruders 1 4
+#
+# Memory depends a bit on the Python version, so budgets made on one might be a few % off on another. Sizes don't.
+
+import argparse
+import dataclasses
+import gc
+import json
+import math
+import os
+import platform
+import re
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "budgets.json")
+DEFAULT_SETTINGS = [600, 2000]
+DEFAULT_EXTRUDERS = [1, 4]
+# How much over what was measured a saved budget is. Memory moves around a bit between runs, sizes and counts don't.
+HEADROOM: dict[str, float] = {"bytes": 0.15, "size": 0.02, "count": 0.0, "ratio": 0.02}
+
+
+def metric_kind(metric: str) -> str:
+    """What sort of number a metric is, which decides how much headroom its budget gets"""
+    if metric.endswith("peak bytes"):
+        return "bytes"
+    if metric.endswith("ratio"):
+        return "ratio"
+    if metric.startswith("CategorySettings"):
+        return "count"
+    return "size"
+
+
+def count_category_settings() -> int:
+    gc.collect()
+    return sum(1 for obj in gc.get_objects() if type(obj) is plugin.CategorySetting)
+
+
+@contextmanager
+def peak_memory(results: dict[str, float], phase: str) -> Iterator[None]:
+    """Records the most memory the with block had allocated at once, on top of what was already there"""
+    gc.collect()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    yield
+    _, peak = tracemalloc.get_traced_memory()
+    results[f"{phase} peak bytes"] = peak - start
+
+
+def page_rows(page: str) -> int:
+    """Setting rows on a page, going by its search index (which has one entry per row whatever the page format)"""
+    search_index = re.search(r'<script type="application/json" id="search_index">(.*?)</script>', page, re.DOTALL)
+    return len(json.loads(search_index.group(1).replace("<\\/", "</"))) if search_index else 0
+
+
+def measure_case(settings: int, extruders: int) -> dict[str, float]:
+    application = fake_cura.make_application(settings, extruders)
+    extension = plugin.HTMLSettingsExportReborn()
+    results: dict[str, float] = {}
+
+    tracemalloc.start()
+    try:
+        with peak_memory(results, "capture"):
+            profile_a = extension._get_setting_profile()
+        results["CategorySettings per capture"] = count_category_settings()
+        application.machine.change_settings()
+        profile_b = extension._get_setting_profile()
+        with peak_memory(results, "compare"):
+            profile_compare = plugin.CompareProfiles(profile_a, profile_b)
+        # Comparing is supposed to line the two profiles up, not copy them
+        results["CategorySettings alive after compare"] = count_category_settings()
+
+        export_contexts = {
+            "report": extension._new_export_context(plugin.ExportMode.REPORT, plugin.ExportTimer(), profile_b,
+                                                    report_details = extension._get_report_details(plugin.ExportTimer())),
+            "compare": extension._new_export_context(plugin.ExportMode.COMPARE, plugin.ExportTimer(), profile_b, profile_compare = profile_compare),
+        }
+        for mode, export_context in export_contexts.items():
+            page_bytes: dict[bool, int] = {}
+            for minify in (False, True):
+                variant = f"{mode} {'minified' if minify else 'not minified'}"
+                with peak_memory(results, f"render {variant}"):
+                    page = extension._assemble_html(dataclasses.replace(export_context, minify = minify))
+                page_bytes[minify] = len(page.encode("utf-8"))
+                results[f"{variant} page bytes"] = page_bytes[minify]
+                results[f"{variant} bytes per row"] = round(page_bytes[minify] / max(page_rows(page), 1), 1)
+                del page
+            # The v1.2.0 notes say minifying makes pages ~45% smaller. That was against the old space-indented pages though,
+            # and unminified pages have had tabs since. On its own it's more like 25-30%, so that's what gets held to.
+            results[f"{mode} minified size ratio"] = round(page_bytes[True] / page_bytes[False], 4)
+
+        # Once everything's gone, so should every setting be. Anything still here is being kept by something that shouldn't.
+        del profile_a, profile_b, profile_compare, export_contexts, export_context
+        results["CategorySettings left behind"] = count_category_settings()
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def case_name(settings: int, extruders: int) -> str:
+    return f"{settings} settings x {extruders} extruders"
+
+
+def make_budgets(results: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+    budgets: dict[str, dict[str, float]] = {}
+    for case, metrics in results.items():
+        budgets[case] = {}
+        for metric, value in metrics.items():
+            kind = metric_kind(metric)
+            budgets[case][metric] = round(value * (1 + HEADROOM[kind]), 4) if kind == "ratio" else math.ceil(value * (1 + HEADROOM[kind]))
+    return budgets
+
+
+def check_budgets(results: dict[str, dict[str, float]], budgets: dict[str, dict[str, float]]) -> bool:
+    """Prints every metric against its budget. Returns whether anything was over."""
+    over_budget = False
+    for case, metrics in results.items():
+        case_budgets = budgets.get(case)
+        if case_budgets is None:
+            print(f"{case}: no budgets")
+            continue
+        print(case)
+        for metric, value in metrics.items():
+            budget = case_budgets.get(metric)
+            if budget is None:
+                print(f"  {metric:<42}{value:>14,.6g}  (no budget)")
+                continue
+            flag = ""
+            if value > budget:
+                flag = "  <-- OVER BUDGET"
+                over_budget = True
+            print(f"  {metric:<42}{value:>14,.6g}  of {budget:>14,.6g}  {value / budget if budget else 0:7.1%}{flag}")
+    return over_budget
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Check HTML Settings Export Reborn's memory use and page sizes against budgets")
+    parser.add_argument("--settings", type = int, nargs = "+", default = DEFAULT_SETTINGS, help = "Number of settings in the definition tree")
+    parser.add_argument("--extruders", type = int, nargs = "+", default = DEFAULT_EXTRUDERS, help = "Number of extruders")
+    parser.add_argument("--budgets", default = DEFAULT_BUDGETS, help = "Budgets file")
+    parser.add_argument("--save-budgets", action = "store_true", help = "Save what gets measured (plus headroom) as the new budgets")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for settings in args.settings:
+        for extruders in args.extruders:
+            results[case_name(settings, extruders)] = measure_case(settings, extruders)
+
+    if args.save_budgets:
+        with open(args.budgets, "w", encoding = "utf-8") as budgets_file:
+            json.dump({"python": platform.python_version(), "budgets": make_budgets(results)}, budgets_file, indent = 4)
+        print(f"Saved budgets to {args.budgets}")
+        return 0
+
+    if not os.path.exists(args.budgets):
+        print(f"No budgets at {args.budgets} yet, run with --save-budgets to make some")
+        return 0
+    with open(args.budgets, "r", encoding = "utf-8") as budgets_file:
+        budgets = json.load(budgets_file)
+    print(f"Budgets from Python {budgets.get('python')} (this is {platform.python_version()}):")
+    return 1 if check_budgets(results, budgets.get("budgets", {})) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
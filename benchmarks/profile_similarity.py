@@ -0,0 +1,61 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# How long it takes to turn a few hundred archived jobs into a similarity matrix, and then to find the closest
+# ones to a profile. Uses the same made up archive as benchmarks/fleet_report.py.
+#
+# Run from the plugin folder: python benchmarks/profile_similarity.py [--jobs 300] [--settings 2000] [--extruders 2] [--variants 12]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+from fleet_report import archive_module, make_archive, plugin  # noqa: E402
+
+profile_similarity = fake_cura.load_plugin("ProfileSimilarity")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Profile similarity benchmark")
+    parser.add_argument("--jobs", type = int, default = 300)
+    parser.add_argument("--settings", type = int, default = 2000)
+    parser.add_argument("--extruders", type = int, default = 2)
+    parser.add_argument("--variants", type = int, default = 12, help = "Different sets of settings the jobs are made from")
+    parser.add_argument("--queries", type = int, default = 100)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as archive_dir:
+        database_path = os.path.join(archive_dir, "archive.sqlite")
+        make_archive(database_path, arguments.jobs, arguments.settings, arguments.extruders, arguments.variants)
+        archive = archive_module.SettingsArchive(database_path)
+        jobs = archive.find_jobs(archive_module.ArchiveQuery())
+
+        start = time.perf_counter()
+        index = profile_similarity.SimilarityIndex.build(archive, jobs)
+        build_time = time.perf_counter() - start
+        # Whatever make_archive left the fake machine as, tweaked a bit more
+        fake_cura.FakeApplication.getInstance().machine.change_settings(0.01)
+        profile = plugin.HTMLSettingsExportReborn()._get_setting_profile()
+
+        start = time.perf_counter()
+        for _ in range(arguments.queries):
+            index.vectorize(profile)
+        vectorize_time = (time.perf_counter() - start) / arguments.queries
+        start = time.perf_counter()
+        for _ in range(arguments.queries):
+            nearest = index.nearest(profile, 5)
+        query_time = (time.perf_counter() - start) / arguments.queries
+
+    print(f"Matrix: {index.matrix.shape[0]} jobs * {index.matrix.shape[1]} columns ({len(index.features)} settings), {index.matrix.nbytes / 1e6:.1f} MB")
+    print(f"Build:  {build_time:.2f} s")
+    print(f"Query:  {query_time * 1000:.1f} ms for the 5 closest ({vectorize_time * 1000:.1f} ms of that is turning the profile into a vector)")
+    for similar_job in nearest:
+        print(f"  {similar_job.description()}")
+
+
+if __name__ == "__main__":
+    main()
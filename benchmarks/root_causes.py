@@ -0,0 +1,103 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Splitting a comparison's differences into root causes and the ones that follow from them. Changes a few settings
+# that lots of others depend on (like layer_height) by hand, then gives everything downstream of them a new value the
+# way Cura would when it works them out again. The roots should be exactly the settings that were changed by hand
+# and everything else should follow from one of them.
+#
+# Run from the plugin folder: python benchmarks/root_causes.py [--settings 2000] [--extruders 4] [--roots 3]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_cura  # noqa: E402
+
+plugin = fake_cura.load_plugin("HTMLSettingsExportReborn")
+
+
+def changed_value(value):
+    """Something definitely different to what it was, of the same type"""
+    if isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value + 1
+    if isinstance(value, str) and value.startswith("option_"):
+        return f"option_{(int(value[7:]) + 1) % 4}"
+    return str(value) + " "
+
+
+def change_with_dependents(machine, root_keys: list[str], changed_keys: set[str]) -> set[str]:
+    """Changes the roots by hand and everything that depends on them (unless that was set by hand too). Returns what followed."""
+    followed: set[str] = set()
+    queue = list(root_keys)
+    while queue:
+        for relation in machine.definitions[queue.pop()].relations:
+            dependent = relation.target.key
+            if relation.type != fake_cura.FakeRelationType.RequiredByTarget or dependent in followed or dependent in changed_keys or dependent in root_keys:
+                continue
+            followed.add(dependent)
+            queue.append(dependent)
+    for stack in machine.extruder_stacks:
+        for key in root_keys:
+            stack.values[key] = changed_value(stack.values[key])
+            stack.getTop()._keys.add(key)
+        for key in followed:
+            stack.values[key] = changed_value(stack.values[key])
+    return followed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description = "Root cause benchmark")
+    parser.add_argument("--settings", type = int, default = 2000)
+    parser.add_argument("--extruders", type = int, default = 4)
+    parser.add_argument("--roots", type = int, default = 3, help = "Settings to change by hand")
+    arguments = parser.parse_args()
+
+    application = fake_cura.make_application(arguments.settings, arguments.extruders, max_depth = 5)
+    machine = application.machine
+    extension = plugin.HTMLSettingsExportReborn()
+    profile_a = extension._get_setting_profile()
+
+    changed_keys = set(machine.global_stack.getTop().getAllKeys())
+    for stack in machine.extruder_stacks:
+        changed_keys.update(stack.getTop().getAllKeys())
+    root_keys = [f"{category}_setting_0" for category in fake_cura.CATEGORIES[:arguments.roots]]
+    followed = change_with_dependents(machine, root_keys, changed_keys)
+    profile_b = extension._get_setting_profile()
+    profile_compare = plugin.CompareProfiles(profile_a, profile_b)
+
+    start = time.perf_counter()
+    dependency_graph = extension._get_dependency_graph()
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    extension._get_dependency_graph()
+    cached_time = time.perf_counter() - start
+    start = time.perf_counter()
+    profile_compare.find_root_causes(dependency_graph)
+    split_time = time.perf_counter() - start
+    root_causes = profile_compare.root_causes
+
+    print(f"Building the graph:  {build_time * 1000:8.2f} ms  ({len(dependency_graph.dependents)} settings with dependents)")
+    print(f"Cached graph:        {cached_time * 1000:8.2f} ms")
+    print(f"Splitting:           {split_time * 1000:8.2f} ms  ({len(root_causes.roots)} roots, {len(root_causes.causes)} differences that follow from them)")
+
+    # Only rows that show up count, single extruder machines skip a few
+    shown_keys = set(root_causes.roots) | set(root_causes.causes)
+    problems = []
+    if set(root_causes.roots) != set(root_keys):
+        problems.append(f"roots should be {sorted(root_keys)}, not {sorted(root_causes.roots)}")
+    if set(root_causes.causes) - followed:
+        problems.append(f"these don't follow from anything: {sorted(set(root_causes.causes) - followed)[:5]}")
+    if not shown_keys:
+        problems.append("nothing's different")
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# HTML Settings Export Reborn by Slashee the Cow
+# Copyright Slashee the Cow 2025-
+#
+# Micro-benchmark for setting row rendering: how many rows a second SettingRowRenderer
+# gets through compared with the row code from before it existed (kept below for reference).
+#
+# Run from the plugin folder: python benchmarks/row_rendering.py [rows] [extruders]
+
+import html
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_cura import load_plugin  # noqa: E402
+
+plugin = load_plugin("HTMLSettingsExportReborn")
+CategorySetting = plugin.CategorySetting
+CssClasses = plugin.CssClasses
+HTMLSettingsExportReborn = plugin.HTMLSettingsExportReborn
+indent = plugin.indent
+
+STATE_CLASSES = [CssClasses.SETTING_NORMAL.full] * 6 + [CssClasses.SETTING_LOCAL.full, CssClasses.SETTING_DISABLED.full, CssClasses.SETTING_HIDDEN.full]
+ERROR_CLASSES = [""] * 18 + [CssClasses.ERROR_WARNING.full, CssClasses.ERROR_ERROR.full]
+VALUES = ["0.2mm", "True", "False", "Grid", "200°C", "60mm/s", "line one<br>line two", "Not overridden", "1", "5.5%"]
+
+
+def make_settings(count: int, extruders: int, seed: int = 1) -> list[CategorySetting]:
+    """Flat list of settings (no children) with a realistic spread of states and values"""
+    rnd = random.Random(seed)
+    settings = []
+    for i in range(count):
+        setting = CategorySetting(key = f"setting_{i}", label = f"Setting number {i} & friends", setting_type = "float",
+                                  child_level = rnd.randint(0, 4), extruder_count = extruders)
+        for extruder in range(extruders):
+            setting.value[extruder] = rnd.choice(VALUES)
+            setting.css_class[extruder] = rnd.choice(STATE_CLASSES)
+            setting.error_class[extruder] = rnd.choice(ERROR_CLASSES)
+        settings.append(setting)
+    return settings
+
+
+def legacy_report_row(setting: CategorySetting, base_indent: int = 0) -> str:
+    """HTMLSettingsExportReborn._make_category_setting_row as it was in v1.2.2"""
+    if setting.skip:
+        return ""
+    row_css_class = HTMLSettingsExportReborn.get_css_row_class(setting.css_class)
+    category_setting_html_lines: list[str] = []
+    category_setting_html_lines.append(indent(f'<tr class="{CssClasses.SETTING_ROW.full}{(" " + row_css_class) if row_css_class else ""}">', base_indent))
+    cell_tooltip = setting.internal_representation()
+    child_prefix = HTMLSettingsExportReborn.CHILD_SPACER * setting.child_level
+    category_setting_html_lines.append(indent(f'<td title="{html.escape(cell_tooltip)}" class="{CssClasses.SETTING_LABEL.full}">{child_prefix}{html.escape(setting.label)}</td>', base_indent + 1))
+    for i, value in enumerate(setting.value):
+        if setting.error_class[i]:
+            cell_class = setting.error_class[i]
+        elif setting.css_class[i]:
+            cell_class = setting.css_class[i]
+        else:
+            cell_class = ""
+        class_tooltip = HTMLSettingsExportReborn.css_class_to_human_readable(cell_class if cell_class else row_css_class)
+        display_value = html.escape(value.replace("<br>", "\n")).replace("\n", "<br>")
+        category_setting_html_lines.append(indent(f'<td class="{cell_class + (" " + CssClasses.SETTING_VALUE.full) if cell_class else CssClasses.SETTING_VALUE.full}" title="{html.escape(class_tooltip)}">{display_value}</td>', base_indent + 1))
+    category_setting_html_lines.append(indent('</tr>', base_indent))
+    return "\n".join(category_setting_html_lines)
+
+
+def time_rows_per_second(render, settings: list[CategorySetting], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for setting in settings:
+            render(setting)
+        best = min(best, time.perf_counter() - start)
+    return len(settings) / best
+
+
+def main() -> None:
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    extruders = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    settings = make_settings(row_count, extruders)
+    renderer = plugin.SettingRowRenderer()
+
+    def unified(setting: CategorySetting) -> str:
+        return "\n".join(renderer.make_row_html(row, 6) for row in renderer.make_report_rows(setting))
+
+    # Make sure they're actually doing the same job before timing them
+    for setting in settings[:200]:
+        if legacy_report_row(setting, 6) != unified(setting):
+            raise AssertionError(f"Renderers disagree on {setting.key}")
+
+    legacy = time_rows_per_second(lambda setting: legacy_report_row(setting, 6), settings, 5)
+    current = time_rows_per_second(unified, settings, 5)
+    print(f"{row_count} rows, {extruders} extruders")
+    print(f"  v1.2.2 row code:     {legacy:12,.0f} rows/s")
+    print(f"  SettingRowRenderer:  {current:12,.0f} rows/s  ({current / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()